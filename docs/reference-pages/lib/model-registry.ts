@@ -19,6 +19,7 @@ const ModelRegistryEntrySchema = z.object({
   status: ModelStatusSchema,
   registered_at: z.string().datetime(),
   path: z.string().min(1),
+  sha256: z.string().regex(/^[0-9a-f]{64}$/).optional(),
   description: z.string().optional(),
   traffic_allocation: z.number().min(0).max(100).optional(),
   metrics: ModelMetricsSchema,
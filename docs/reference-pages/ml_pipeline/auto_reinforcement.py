@@ -3,35 +3,59 @@
 Auto Reinforcement Loop - Automatic model fine-tuning based on prediction errors
 """
 
+import argparse
 import json
 import logging
 import os
-import subprocess
+import socket
 import sys
+import threading
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
+import pandas as pd
+
+from .checkpoints import CheckpointError, RunCheckpoint
 from .config import (
     DEFAULT_FINE_TUNE_EPOCHS,
     DEFAULT_LEARNING_RATE,
     DEFAULT_LOOKBACK_DAYS,
     MIN_ERROR_SAMPLES_FOR_RETRAINING,
     RETRAINED_MODELS_DIR,
+    RETRAINING_LEASE_BATCH_SIZE,
+    RETRAINING_LEASE_SECONDS,
+    RETRAINING_WORKER_POOL_SIZE,
+    PROJECT_ROOT,
+    RUN_CHECKPOINT_DIR,
     TEMP_DIR,
 )
-from .data_loader import prepare_retraining_data
+from .data_loader import (
+    EvaluationLogCache,
+    create_finetuning_dataset,
+    download_evaluation_log,
+    filter_errors_for_retraining,
+    generate_dataset_filename,
+)
+from .log_shipper import start_log_shipper
+from .model_registry import ModelCache, remember_file_sha256
+from .replay_gate import GATE_REJECT, evaluate_challenger
 from .supabase_client import (
-    get_pending_retraining_requests,
+    complete_leased_retraining_request,
     get_supabase_client,
     insert_retraining_run,
     insert_system_log,
+    lease_retraining_requests,
+    renew_retraining_leases,
     update_retraining_request,
     update_retraining_run,
     upload_file_to_storage,
+    upload_model_artifact,
 )
+from .training_supervisor import TrainingSupervisor
 
 # Configure logging
 logging.basicConfig(
@@ -46,38 +70,13 @@ class RetrainingError(Exception):
     pass
 
 
-def parse_training_output(output: str) -> Dict:
-    """
-    Parse training output to extract metrics
-    
-    Args:
-        output: Training script output
-        
-    Returns:
-        Dictionary with metrics
-    """
-    try:
-        # Try to parse JSON output from the training script
-        lines = output.strip().split("\n")
-        for line in lines:
-            if line.strip().startswith("{"):
-                try:
-                    data = json.loads(line)
-                    if "metrics" in data:
-                        return data
-                except json.JSONDecodeError:
-                    pass
-        
-        # If no JSON found, return empty metrics
-        return {"metrics": {}}
-    except Exception as e:
-        logger.warning(f"Failed to parse training output: {e}")
-        return {"metrics": {}}
-
-
 def run_training(dataset_path: str, output_dir: str, fine_tune: bool = True, epochs: int = 5) -> Optional[Dict]:
     """
-    Run the training script
+    Run the training script under the training supervisor
+    
+    Output is streamed into the log line by line; progress events from
+    the child extend its deadline and the fit is bounded separately (see
+    TrainingSupervisor).
     
     Args:
         dataset_path: Path to the fine-tuning dataset
@@ -89,13 +88,10 @@ def run_training(dataset_path: str, output_dir: str, fine_tune: bool = True, epo
         Training output parsed as dictionary or None if failed
     """
     try:
-        # Determine the script path
-        script_path = Path(__file__).parent / "train_model.py"
-        
-        # Build command
+        # Run as a module so train_model's package-relative imports resolve
         cmd = [
             sys.executable,
-            str(script_path),
+            "-m", "ml_pipeline.train_model",
             "--dataset", dataset_path,
             "--output_dir", output_dir,
             "--fine_tune", str(fine_tune),
@@ -105,30 +101,11 @@ def run_training(dataset_path: str, output_dir: str, fine_tune: bool = True, epo
         
         logger.info(f"Running training: {' '.join(cmd)}")
         
-        # Run training
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minutes timeout
-        )
-        
-        if result.returncode != 0:
-            logger.error(f"Training failed with return code {result.returncode}")
-            logger.error(f"STDOUT: {result.stdout}")
-            logger.error(f"STDERR: {result.stderr}")
-            return None
-        
-        logger.info("Training completed successfully")
-        logger.info(f"STDOUT: {result.stdout}")
-        
-        # Parse output
-        output = parse_training_output(result.stdout)
+        output = TrainingSupervisor(cmd, cwd=str(PROJECT_ROOT)).run()
+        if output is not None:
+            logger.info("Training completed successfully")
         return output
         
-    except subprocess.TimeoutExpired:
-        logger.error("Training script timed out")
-        return None
     except Exception as e:
         logger.error(f"Failed to run training: {e}")
         return None
@@ -163,49 +140,366 @@ def upload_logs_to_storage(logs_content: str, run_id: str) -> str:
         return ""
 
 
-def process_manual_requests() -> Optional[str]:
+class LeaseRenewer:
+    """Background thread that keeps extending the leases of in-progress requests"""
+    
+    def __init__(self, worker_id: str, lease_seconds: int = RETRAINING_LEASE_SECONDS):
+        """
+        Initialize the renewer
+        
+        Args:
+            worker_id: Lease owner identifier
+            lease_seconds: Lease duration; leases are renewed every third of it
+        """
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = max(lease_seconds / 3, 1.0)
+        self._request_ids: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def add(self, request_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._request_ids.update(request_ids)
+    
+    def discard(self, request_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._request_ids.difference_update(request_ids)
+    
+    def renew(self) -> List[str]:
+        """Renew every held lease once; requests whose lease was lost are dropped"""
+        with self._lock:
+            request_ids = sorted(self._request_ids)
+        if not request_ids:
+            return []
+        
+        renewed = renew_retraining_leases(self.worker_id, request_ids, self.lease_seconds)
+        lost = [request_id for request_id in request_ids if request_id not in renewed]
+        if lost:
+            logger.warning(f"Worker {self.worker_id} lost the lease on retraining requests: {lost}")
+            self.discard(lost)
+        return renewed
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.renew()
+            except Exception as e:
+                logger.warning(f"Lease renewal failed: {e}")
+    
+    def __enter__(self) -> "LeaseRenewer":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="lease-renewer", daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def default_worker_id() -> str:
+    """Lease owner identifier of this process"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def process_manual_requests(worker_id: str, lease_seconds: int = RETRAINING_LEASE_SECONDS) -> Optional[str]:
     """
-    Process manual retraining requests from the queue
+    Lease the next manual retraining request from the queue
+    
+    Args:
+        worker_id: Lease owner identifier
+        lease_seconds: Lease duration
     
     Returns:
-        Request ID if a request was processed, None otherwise
+        Request ID if a request was leased, None otherwise
     """
-    requests = get_pending_retraining_requests()
+    requests = lease_retraining_requests(worker_id, 1, lease_seconds)
     
     if not requests:
         logger.info("No pending manual retraining requests")
         return None
     
-    # Process the first high-priority request
     request = requests[0]
     request_id = request["id"]
     
     logger.info(f"Processing manual retraining request: {request_id}")
-    logger.info(f"Priority: {request['priority']}, Reason: {request.get('reason', 'No reason provided')}")
-    
-    # Update request status to processing
-    try:
-        update_retraining_request(request_id, {"status": "processing"})
-    except Exception as e:
-        logger.error(f"Failed to update request status: {e}")
-        return None
+    logger.info(f"Priority: {request.get('priority')}, Reason: {request.get('reason', 'No reason provided')}")
     
     return request_id
 
 
-def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: str = "auto_daily", request_id: Optional[str] = None) -> bool:
+def group_requests_by_data(requests: List[dict]) -> Dict[int, List[dict]]:
+    """
+    Group retraining requests that would train on identical data
+    
+    Requests that resolve to the same lookback window produce the same
+    fine-tuning dataset, so they can share one retraining run.
+    
+    Args:
+        requests: Retraining request records
+        
+    Returns:
+        Mapping of lookback days to the requests using that window
+    """
+    groups: Dict[int, List[dict]] = {}
+    for request in requests:
+        lookback_days = int(request.get("lookback_days") or DEFAULT_LOOKBACK_DAYS)
+        groups.setdefault(lookback_days, []).append(request)
+    return groups
+
+
+def complete_retraining_requests(
+    request_ids: List[str],
+    run_id: str,
+    worker_id: Optional[str] = None,
+    status: str = "completed",
+) -> None:
+    """
+    Close manual requests and link them to a run
+    
+    Args:
+        request_ids: IDs of the requests served by the run
+        run_id: Retraining run ID
+        worker_id: Lease owner; when given, requests whose lease was taken
+            over by another worker are left to that worker
+        status: Terminal request status ("rejected" when the replay gate
+            turned the retrained model down)
+    """
+    for request_id in request_ids:
+        update_data = {
+            "status": status,
+            "processed_at": datetime.now().isoformat(),
+            "retraining_run_id": run_id,
+            "lease_expires_at": None,
+        }
+        if worker_id is None:
+            update_retraining_request(request_id, update_data)
+        else:
+            complete_leased_retraining_request(request_id, worker_id, update_data)
+
+
+def run_request_workers(
+    pool_size: int = RETRAINING_WORKER_POOL_SIZE,
+    worker_id: Optional[str] = None,
+    lease_seconds: int = RETRAINING_LEASE_SECONDS,
+    eval_log_cache: Optional[EvaluationLogCache] = None,
+    model_cache: Optional[ModelCache] = None,
+) -> bool:
+    """
+    Drain the manual retraining queue with a pool of concurrent runs
+    
+    Requests are leased atomically, so several workers (or hosts) can run
+    this safely side by side. Leases are renewed while their run is in
+    progress and requests are only completed by the worker holding the
+    lease. Leased requests that would train on identical data are merged
+    into a single run; distinct datasets train concurrently.
+    
+    Args:
+        pool_size: Maximum number of concurrent retraining runs
+        worker_id: Lease owner identifier (default: hostname-pid)
+        lease_seconds: Lease duration for claimed requests
+        eval_log_cache: Optional warm evaluation log shared across runs
+        model_cache: Optional warm model cache shared across runs
+        
+    Returns:
+        True if every run succeeded, False otherwise
+    """
+    worker_id = worker_id or default_worker_id()
+    success = True
+    
+    with LeaseRenewer(worker_id, lease_seconds) as renewer, ThreadPoolExecutor(max_workers=pool_size) as pool:
+        while True:
+            requests = lease_retraining_requests(worker_id, RETRAINING_LEASE_BATCH_SIZE, lease_seconds)
+            if not requests:
+                logger.info("No pending manual retraining requests")
+                break
+            
+            futures = []
+            for lookback_days, group in group_requests_by_data(requests).items():
+                request_ids = [request["id"] for request in group]
+                logger.info(f"Merged {len(request_ids)} requests into one run (lookback {lookback_days} days): {request_ids}")
+                renewer.add(request_ids)
+                future = pool.submit(
+                    run_auto_reinforcement,
+                    lookback_days=lookback_days,
+                    source="manual",
+                    request_ids=request_ids,
+                    eval_log_cache=eval_log_cache,
+                    model_cache=model_cache,
+                    worker_id=worker_id,
+                )
+                future.add_done_callback(lambda _, ids=request_ids: renewer.discard(ids))
+                futures.append(future)
+            
+            success = all([future.result() for future in futures]) and success
+    
+    return success
+
+
+def stage_download(checkpoint: RunCheckpoint, eval_log_cache: Optional[EvaluationLogCache] = None) -> Dict:
+    """Download the evaluation log (or copy the warm cached one) into the run's working directory"""
+    eval_log_path = str(checkpoint.dir / "evaluation_log.csv")
+    if eval_log_cache is not None:
+        eval_log_cache.copy_to(eval_log_path)
+    else:
+        download_evaluation_log(eval_log_path)
+    return {"eval_log_path": eval_log_path}
+
+
+def stage_filter(
+    checkpoint: RunCheckpoint,
+    eval_log_path: str,
+    lookback_days: int,
+    eval_log_cache: Optional[EvaluationLogCache] = None,
+) -> Dict:
+    """Filter the evaluation log down to high-confidence errors"""
+    eval_log = eval_log_cache.read(eval_log_path) if eval_log_cache is not None else pd.read_csv(eval_log_path)
+    errors = filter_errors_for_retraining(eval_log, lookback_days)
+    errors_path = str(checkpoint.dir / "errors.csv")
+    errors.to_csv(errors_path, index=False)
+    return {"errors_path": errors_path, "error_count": len(errors)}
+
+
+def stage_dataset(checkpoint: RunCheckpoint, errors_path: str) -> Dict:
+    """Build the fine-tuning dataset from the filtered errors"""
+    dataset_path = create_finetuning_dataset(
+        pd.read_csv(errors_path),
+        str(checkpoint.dir / generate_dataset_filename()),
+    )
+    if dataset_path is None:
+        raise RetrainingError("Failed to create fine-tuning dataset")
+    return {"dataset_path": dataset_path}
+
+
+def stage_train(checkpoint: RunCheckpoint, dataset_path: str) -> Dict:
+    """Fine-tune the model on the dataset"""
+    output_dir = RETRAINED_MODELS_DIR / checkpoint.run_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    training_output = run_training(
+        dataset_path,
+        str(output_dir),
+        fine_tune=True,
+        epochs=DEFAULT_FINE_TUNE_EPOCHS,
+    )
+    if training_output is None:
+        raise RetrainingError("Training script failed")
+    if not training_output.get("model_path"):
+        raise RetrainingError("Training script reported no model_path")
+    if training_output.get("model_sha256"):
+        # Hashed while the child wrote it; the upload reuses it while the file is unchanged
+        remember_file_sha256(Path(training_output["model_path"]), training_output["model_sha256"])
+    
+    return {
+        "metrics": training_output.get("metrics", {}),
+        "model_path": training_output["model_path"],
+    }
+
+
+def stage_evaluate(
+    checkpoint: RunCheckpoint,
+    training: Dict,
+    dataset_size: int,
+    eval_log_path: str,
+    lookback_days: int,
+    model_cache: Optional[ModelCache] = None,
+    eval_log_cache: Optional[EvaluationLogCache] = None,
+) -> Dict:
+    """Record the trained model's metrics and run the champion/challenger replay gate"""
+    metrics = training["metrics"]
+    logger.info(f"Training metrics: {metrics}")
+    logger.info(f"Model saved to: {training['model_path']}")
+    
+    gate = evaluate_challenger(
+        training["model_path"],
+        eval_log_path,
+        lookback_days,
+        model_cache=model_cache,
+        eval_log_cache=eval_log_cache,
+    )
+    
+    insert_system_log(
+        component="auto_reinforcement",
+        status="info" if gate["decision"] != GATE_REJECT else "warning",
+        message=f"Training completed successfully, replay gate: {gate['decision']}",
+        details={
+            "run_id": checkpoint.run_id,
+            "metrics": metrics,
+            "model_path": training["model_path"],
+            "dataset_size": dataset_size,
+            "gate": gate,
+        }
+    )
+    update_retraining_run(checkpoint.run_id, {
+        "metrics": metrics,
+        "gate_decision": gate["decision"],
+        "gate_metrics": {**gate["metrics"], "reason": gate["reason"]},
+    })
+    return {"metrics": metrics, "gate": gate}
+
+
+def stage_upload(checkpoint: RunCheckpoint, model_path: str) -> Dict:
+    """Upload the gate-approved model artifact to content-addressed Storage"""
+    if not model_path or not Path(model_path).exists():
+        logger.warning("No model artifact to upload")
+        return {"model_url": ""}
+    
+    artifact = upload_model_artifact(model_path)
+    return {"model_url": artifact["model_url"], "model_sha256": artifact["model_sha256"]}
+
+
+def run_auto_reinforcement(
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    source: str = "auto_daily",
+    request_id: Optional[str] = None,
+    request_ids: Optional[List[str]] = None,
+    resume_run_id: Optional[str] = None,
+    eval_log_cache: Optional[EvaluationLogCache] = None,
+    model_cache: Optional[ModelCache] = None,
+    worker_id: Optional[str] = None,
+) -> bool:
     """
     Run the auto reinforcement loop
     
+    The run is split into checkpointed stages (download, filter, dataset,
+    train, evaluate, upload). A challenger rejected by the replay gate is
+    never uploaded; the run and its requests end as "rejected". Passing
+    ``resume_run_id`` retries a failed run
+    from its last completed stage, reusing the artifacts already produced;
+    the run's original parameters are taken from its checkpoint.
+    
     Args:
         lookback_days: Number of days to look back for errors
         source: Source of the retraining trigger
         request_id: Optional request ID if triggered by manual request
+        request_ids: Optional IDs of several manual requests merged into this run
+        resume_run_id: Optional ID of a failed run to resume
+        eval_log_cache: Optional warm evaluation log shared across runs
+        model_cache: Optional warm model cache the champion is taken from
+        worker_id: Lease owner of the manual requests; completion is
+            conditional on still holding their lease
         
     Returns:
         True if successful, False otherwise
     """
-    run_id = str(uuid.uuid4())
+    run_id = resume_run_id or str(uuid.uuid4())
+    request_ids = ([request_id] if request_id else []) + list(request_ids or [])
+    checkpoint = RunCheckpoint(run_id, RUN_CHECKPOINT_DIR)
+    
+    if resume_run_id:
+        try:
+            checkpoint.load()
+        except CheckpointError as e:
+            logger.error(f"Cannot resume run {run_id}: {e}")
+            return False
+        
+        lookback_days = checkpoint.metadata["lookback_days"]
+        source = checkpoint.metadata["source"]
+        request_ids = checkpoint.metadata.get("request_ids", [])
     
     try:
         logger.info("="*60)
@@ -219,42 +513,53 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
         insert_system_log(
             component="auto_reinforcement",
             status="info",
-            message=f"Auto reinforcement started: {source}",
+            message=f"Auto reinforcement {'resumed' if resume_run_id else 'started'}: {source}",
             details={
                 "run_id": run_id,
                 "source": source,
                 "lookback_days": lookback_days,
+                "completed_stages": checkpoint.completed_stages(),
             }
         )
         
-        # Create retraining run record
-        run_record = {
-            "id": run_id,
-            "source": source,
-            "status": "running",
-            "fine_tune_flag": True,
-            "started_at": datetime.now().isoformat(),
-            "triggered_by": None,  # Will be filled by service role
-        }
-        
-        try:
-            insert_retraining_run(run_record)
-            logger.info(f"Created retraining run record: {run_id}")
-        except Exception as e:
-            logger.error(f"Failed to create retraining run record: {e}")
-            insert_system_log(
-                component="auto_reinforcement",
-                status="error",
-                message=f"Failed to create retraining run record: {str(e)}",
-                details={"run_id": run_id, "error": str(e)}
-            )
-            return False
+        if resume_run_id:
+            logger.info(f"Resuming after stages: {checkpoint.completed_stages()}")
+            update_retraining_run(run_id, {"status": "running", "error_message": None})
+        else:
+            # Create retraining run record
+            run_record = {
+                "id": run_id,
+                "source": source,
+                "status": "running",
+                "fine_tune_flag": True,
+                "started_at": datetime.now().isoformat(),
+                "triggered_by": None,  # Will be filled by service role
+            }
+            
+            try:
+                insert_retraining_run(run_record)
+                logger.info(f"Created retraining run record: {run_id}")
+            except Exception as e:
+                logger.error(f"Failed to create retraining run record: {e}")
+                insert_system_log(
+                    component="auto_reinforcement",
+                    status="error",
+                    message=f"Failed to create retraining run record: {str(e)}",
+                    details={"run_id": run_id, "error": str(e)}
+                )
+                return False
+            
+            checkpoint.create(source=source, lookback_days=lookback_days, request_ids=request_ids)
         
         # Prepare retraining data
         logger.info("Preparing retraining data...")
-        dataset_path, error_count = prepare_retraining_data(lookback_days)
+        download = checkpoint.run_stage("download", lambda: stage_download(checkpoint, eval_log_cache))
+        filtered = checkpoint.run_stage(
+            "filter", lambda: stage_filter(checkpoint, download["eval_log_path"], lookback_days, eval_log_cache)
+        )
+        error_count = filtered["error_count"]
         
-        if dataset_path is None or error_count < MIN_ERROR_SAMPLES_FOR_RETRAINING:
+        if error_count < MIN_ERROR_SAMPLES_FOR_RETRAINING:
             logger.warning(f"Insufficient errors for retraining: {error_count} samples (min: {MIN_ERROR_SAMPLES_FOR_RETRAINING})")
             
             insert_system_log(
@@ -276,15 +581,12 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
             })
             
             # If this was a manual request, mark it as completed
-            if request_id:
-                update_retraining_request(request_id, {
-                    "status": "completed",
-                    "processed_at": datetime.now().isoformat(),
-                    "retraining_run_id": run_id,
-                })
+            complete_retraining_requests(request_ids, run_id, worker_id)
+            checkpoint.clear()
             
             return True
         
+        dataset = checkpoint.run_stage("dataset", lambda: stage_dataset(checkpoint, filtered["errors_path"]))
         logger.info(f"Prepared dataset with {error_count} error samples")
         
         # Log dataset prepared
@@ -295,65 +597,54 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
             details={
                 "run_id": run_id,
                 "dataset_size": error_count,
-                "dataset_path": dataset_path,
+                "dataset_path": dataset["dataset_path"],
             }
         )
         
         # Update run record with dataset size
         update_retraining_run(run_id, {"dataset_size": error_count})
         
-        # Create output directory
-        output_dir = str(RETRAINED_MODELS_DIR / run_id)
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-        
         # Run training
         logger.info("Running model fine-tuning...")
-        training_output = run_training(
-            dataset_path,
-            output_dir,
-            fine_tune=True,
-            epochs=DEFAULT_FINE_TUNE_EPOCHS,
-        )
-        
-        if training_output is None:
-            raise RetrainingError("Training script failed")
-        
-        logger.info(f"Training output: {training_output}")
-        
-        # Extract metrics
-        metrics = training_output.get("metrics", {})
-        model_path = training_output.get("model_path", "")
-        
-        logger.info(f"Training metrics: {metrics}")
-        logger.info(f"Model saved to: {model_path}")
+        training = checkpoint.run_stage("train", lambda: stage_train(checkpoint, dataset["dataset_path"]))
+        evaluation = checkpoint.run_stage("evaluate", lambda: stage_evaluate(
+            checkpoint,
+            training,
+            error_count,
+            download["eval_log_path"],
+            lookback_days,
+            model_cache,
+            eval_log_cache,
+        ))
+        
+        if evaluation["gate"]["decision"] == GATE_REJECT:
+            logger.warning(f"Replay gate rejected the challenger: {evaluation['gate']['reason']}")
+            update_retraining_run(run_id, {
+                "status": "rejected",
+                "metrics": evaluation["metrics"],
+                "completed_at": datetime.now().isoformat(),
+            })
+            complete_retraining_requests(request_ids, run_id, worker_id, status="rejected")
+            checkpoint.clear()
+            
+            logger.info("="*60)
+            logger.info("Auto Reinforcement Loop Finished: challenger rejected")
+            logger.info("="*60)
+            
+            return True
         
-        # Log training success
-        insert_system_log(
-            component="auto_reinforcement",
-            status="info",
-            message="Training completed successfully",
-            details={
-                "run_id": run_id,
-                "metrics": metrics,
-                "model_path": model_path,
-                "dataset_size": error_count,
-            }
-        )
+        checkpoint.run_stage("upload", lambda: stage_upload(checkpoint, training["model_path"]))
         
         # Update run record with completion
         update_retraining_run(run_id, {
             "status": "completed",
-            "metrics": metrics,
+            "metrics": evaluation["metrics"],
             "completed_at": datetime.now().isoformat(),
         })
         
         # If this was a manual request, mark it as completed
-        if request_id:
-            update_retraining_request(request_id, {
-                "status": "completed",
-                "processed_at": datetime.now().isoformat(),
-                "retraining_run_id": run_id,
-            })
+        complete_retraining_requests(request_ids, run_id, worker_id)
+        checkpoint.clear()
         
         logger.info("="*60)
         logger.info("Auto Reinforcement Loop Completed Successfully")
@@ -363,6 +654,7 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
         
     except Exception as e:
         logger.error(f"Auto reinforcement failed: {e}", exc_info=True)
+        logger.info(f"Completed stages kept for resume: {checkpoint.completed_stages()} (--resume {run_id})")
         
         # Log error with stack trace
         error_details = {
@@ -370,6 +662,7 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
             "error": str(e),
             "error_type": type(e).__name__,
             "traceback": traceback.format_exc(),
+            "completed_stages": checkpoint.completed_stages(),
         }
         
         insert_system_log(
@@ -388,31 +681,69 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
             })
             
             # If this was a manual request, mark it as completed with error
-            if request_id:
-                update_retraining_request(request_id, {
-                    "status": "completed",
-                    "processed_at": datetime.now().isoformat(),
-                    "retraining_run_id": run_id,
-                })
+            complete_retraining_requests(request_ids, run_id, worker_id)
         except Exception as update_error:
             logger.error(f"Failed to update run record with failure: {update_error}")
         
         return False
 
 
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Auto reinforcement loop")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Drain the manual request queue with this many concurrent runs (default: one-shot mode)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run as a long-lived scheduler with warm state instead of a one-shot run",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume a failed run from its last completed stage",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main entry point for auto reinforcement"""
+    args = parse_arguments()
+    start_log_shipper()
+    
     try:
+        if args.daemon:
+            # Imported here: the daemon module imports this one
+            from .reinforcement_daemon import ReinforcementDaemon
+            ReinforcementDaemon(workers=args.workers or RETRAINING_WORKER_POOL_SIZE).run()
+            sys.exit(0)
+        
+        if args.resume:
+            success = run_auto_reinforcement(resume_run_id=args.resume)
+            sys.exit(0 if success else 1)
+        
+        if args.workers > 0:
+            success = run_request_workers(pool_size=args.workers)
+            sys.exit(0 if success else 1)
+        
         # First, check if there are any manual retraining requests to process
-        manual_request_id = process_manual_requests()
+        worker_id = default_worker_id()
+        manual_request_id = process_manual_requests(worker_id)
         
         if manual_request_id:
-            # Process manual request
-            success = run_auto_reinforcement(
-                lookback_days=DEFAULT_LOOKBACK_DAYS,
-                source="manual",
-                request_id=manual_request_id,
-            )
+            # Process manual request, keeping its lease alive while training
+            with LeaseRenewer(worker_id) as renewer:
+                renewer.add([manual_request_id])
+                success = run_auto_reinforcement(
+                    lookback_days=DEFAULT_LOOKBACK_DAYS,
+                    source="manual",
+                    request_id=manual_request_id,
+                    worker_id=worker_id,
+                )
         else:
             # Run automatic daily reinforcement
             success = run_auto_reinforcement(
@@ -0,0 +1,153 @@
+"""
+Run checkpoints - durable stage results for resumable retraining runs
+
+Each retraining run gets a working directory keyed by ``run_id``. Stage
+results are recorded in ``checkpoint.json`` (written atomically) as soon as a
+stage finishes, and intermediate artifacts are kept next to it, so a retried
+run skips every stage that already completed and reuses its outputs.
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .config import RUN_CHECKPOINT_DIR
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_STAGES = ("download", "filter", "dataset", "train", "evaluate", "upload")
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint is missing or unreadable"""
+    pass
+
+
+class RunCheckpoint:
+    """Stage checkpoint store for one retraining run"""
+
+    def __init__(self, run_id: str, root: Path = RUN_CHECKPOINT_DIR):
+        """
+        Initialize the checkpoint
+
+        Args:
+            run_id: Retraining run ID
+            root: Directory holding one working directory per run
+        """
+        self.run_id = run_id
+        self.dir = Path(root) / run_id
+        self.path = self.dir / "checkpoint.json"
+        self.metadata: Dict[str, Any] = {}
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def exists(self) -> bool:
+        """Return True if a checkpoint was written for this run"""
+        return self.path.exists()
+
+    def create(self, **metadata) -> "RunCheckpoint":
+        """
+        Start a new checkpoint with the run's parameters
+
+        Args:
+            **metadata: Run parameters needed to resume (source, lookback_days, ...)
+        """
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.metadata = metadata
+        self.stages = {}
+        self._write()
+        return self
+
+    def load(self) -> "RunCheckpoint":
+        """
+        Load a previously written checkpoint
+
+        Raises:
+            CheckpointError: If the checkpoint does not exist or is corrupt
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CheckpointError(f"Cannot load checkpoint for run {self.run_id}: {e}")
+
+        self.metadata = data.get("metadata", {})
+        self.stages = data.get("stages", {})
+        return self
+
+    def is_complete(self, stage: str) -> bool:
+        """
+        Return True if a stage finished and its artifacts are still on disk
+
+        Any result key ending in ``_path`` is treated as an artifact.
+        """
+        entry = self.stages.get(stage)
+        if entry is None:
+            return False
+        return all(Path(path).exists() for path in self._artifacts(entry["result"]))
+
+    def result(self, stage: str) -> Dict[str, Any]:
+        """Return the recorded result of a completed stage"""
+        return self.stages[stage]["result"]
+
+    def completed_stages(self) -> List[str]:
+        """Return completed stages in pipeline order"""
+        return [stage for stage in PIPELINE_STAGES if self.is_complete(stage)]
+
+    def complete(self, stage: str, result: Dict[str, Any]) -> None:
+        """
+        Record a stage result and invalidate every later stage
+
+        Args:
+            stage: Stage name from PIPELINE_STAGES
+            result: JSON-serializable stage output
+        """
+        later = PIPELINE_STAGES[PIPELINE_STAGES.index(stage) + 1:]
+        for name in later:
+            self.stages.pop(name, None)
+
+        self.stages[stage] = {
+            "result": result,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write()
+
+    def run_stage(self, stage: str, func: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a stage unless it already completed, then checkpoint its result
+
+        Args:
+            stage: Stage name from PIPELINE_STAGES
+            func: Callable producing the stage result
+
+        Returns:
+            Stage result, either fresh or reused from the checkpoint
+        """
+        if self.is_complete(stage):
+            logger.info(f"Run {self.run_id}: reusing checkpointed '{stage}' stage")
+            return self.result(stage)
+
+        logger.info(f"Run {self.run_id}: running '{stage}' stage")
+        result = func()
+        self.complete(stage, result)
+        return result
+
+    def clear(self) -> None:
+        """Remove the run's working directory and checkpoint"""
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    @staticmethod
+    def _artifacts(result: Dict[str, Any]) -> List[str]:
+        return [value for key, value in result.items() if key.endswith("_path") and value]
+
+    def _write(self) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"run_id": self.run_id, "metadata": self.metadata, "stages": self.stages}, f, indent=2, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
@@ -9,10 +9,42 @@ from pathlib import Path
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
 
+# Backend Selection
+# "supabase" talks to the hosted project; "local" uses SQLite and the
+# filesystem under LOCAL_BACKEND_DIR (offline runs and benchmarks)
+ML_PIPELINE_BACKEND = os.getenv("ML_PIPELINE_BACKEND", "supabase")
+
 # Storage paths
 STORAGE_BUCKET = "model-artifacts"
 EVALUATION_LOG_PATH = "evaluation_log.csv"
 LOGS_STORAGE_PREFIX = "training-logs"
+MODEL_ARTIFACTS_PREFIX = "models"
+
+# Storage Upload Configuration
+# Supabase resumable (TUS) uploads require 6 MiB chunks
+STORAGE_UPLOAD_CHUNK_SIZE = 6 * 1024 * 1024
+STORAGE_RESUMABLE_THRESHOLD = int(os.getenv("STORAGE_RESUMABLE_THRESHOLD", str(6 * 1024 * 1024)))
+
+# HTTP Transport
+# One pooled keep-alive client is shared by PostgREST, Storage and edge functions
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "60"))
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY = 30.0
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "4"))
+HTTP_RETRY_BASE_DELAY = 0.5
+HTTP_RETRY_MAX_DELAY = 10.0
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+# Rows per keyset page (PostgREST caps responses at 1000 rows by default)
+TABLE_PAGE_SIZE = 1000
+# Rare pattern sync: patterns per gzip-compressed request, requests in flight at once
+PATTERN_SYNC_BATCH_SIZE = int(os.getenv("PATTERN_SYNC_BATCH_SIZE", "200"))
+PATTERN_SYNC_CONCURRENCY = int(os.getenv("PATTERN_SYNC_CONCURRENCY", "4"))
+# Content hashes of the last successful sync; unchanged patterns are resent
+# only when their synced expiry is less than PATTERN_SYNC_REFRESH_DAYS away
+PATTERN_SYNC_MANIFEST = os.getenv("PATTERN_SYNC_MANIFEST", "/tmp/ml_pipeline_pattern_manifest.json")
+PATTERN_SYNC_REFRESH_DAYS = 7
 
 # Training Configuration
 DEFAULT_LOOKBACK_DAYS = 7
@@ -21,16 +53,89 @@ ERROR_CONFIDENCE_THRESHOLD = 0.7
 DEFAULT_FINE_TUNE_EPOCHS = 5
 DEFAULT_LEARNING_RATE = 0.001
 
+# Training Supervision
+# The child is killed when no progress event arrives within
+# TRAINING_PROGRESS_TIMEOUT seconds, and unconditionally after TRAINING_MAX_SECONDS.
+# The model fit reports no progress while it runs, so it is bounded by
+# TRAINING_FIT_MAX_SECONDS; periodic heartbeats only signal liveness
+TRAINING_PROGRESS_TIMEOUT = int(os.getenv("TRAINING_PROGRESS_TIMEOUT", "300"))
+TRAINING_MAX_SECONDS = int(os.getenv("TRAINING_MAX_SECONDS", str(6 * 3600)))
+TRAINING_FIT_MAX_SECONDS = int(os.getenv("TRAINING_FIT_MAX_SECONDS", str(2 * 3600)))
+TRAINING_HEARTBEAT_INTERVAL = 30
+TRAINING_MEMORY_LIMIT_BYTES = int(os.getenv("TRAINING_MEMORY_LIMIT_BYTES", "0"))  # 0 = unlimited
+TRAINING_CPU_LIMIT_SECONDS = int(os.getenv("TRAINING_CPU_LIMIT_SECONDS", "0"))  # 0 = unlimited
+TRAINING_OUTPUT_TAIL_LINES = 200
+
+# Champion/Challenger Replay Gate
+REPLAY_MAX_ROWS = 20000
+REPLAY_MIN_ROWS = 100
+# Decision when fewer than REPLAY_MIN_ROWS held-out rows exist: "reject" keeps
+# the challenger out of Storage, "skipped" lets it through unverified
+REPLAY_INSUFFICIENT_ROWS_DECISION = os.getenv("REPLAY_INSUFFICIENT_ROWS_DECISION", "reject")
+REPLAY_BATCH_SIZE = 8192
+REPLAY_BOOTSTRAP_SAMPLES = 1000
+REPLAY_CONFIDENCE_LEVEL = 0.95
+# Largest accuracy drop (lower CI bound of challenger - champion) still accepted
+REPLAY_MAX_REGRESSION = float(os.getenv("REPLAY_MAX_REGRESSION", "0.01"))
+
+# Retraining Request Workers
+RETRAINING_WORKER_POOL_SIZE = int(os.getenv("RETRAINING_WORKER_POOL_SIZE", "2"))
+# Leases are renewed every third of RETRAINING_LEASE_SECONDS while their run is in progress
+RETRAINING_LEASE_SECONDS = 3600
+RETRAINING_LEASE_BATCH_SIZE = 50
+
+# Reinforcement Daemon Configuration
+DAEMON_DAILY_RUN_TIME = os.getenv("DAEMON_DAILY_RUN_TIME", "03:00")  # UTC, HH:MM
+DAEMON_POLL_INTERVAL = int(os.getenv("DAEMON_POLL_INTERVAL", "30"))
+DAEMON_REFRESH_INTERVAL = int(os.getenv("DAEMON_REFRESH_INTERVAL", "3600"))
+DAEMON_MEMORY_LIMIT_BYTES = int(os.getenv("DAEMON_MEMORY_LIMIT_BYTES", str(1024 ** 3)))
+
 # Paths
 ML_PIPELINE_DIR = Path(__file__).parent
 PROJECT_ROOT = ML_PIPELINE_DIR.parent
 MODELS_DIR = PROJECT_ROOT / "models"
 RETRAINED_MODELS_DIR = MODELS_DIR / "retrained"
+LOGS_DIR = PROJECT_ROOT / "logs"
+# Failed runs are resumed from here, so it must survive reboots and /tmp cleanup
+RUN_CHECKPOINT_DIR = Path(os.getenv("RUN_CHECKPOINT_DIR", str(PROJECT_ROOT / "retraining_runs")))
 TEMP_DIR = Path("/tmp")
 
+EVALUATION_LOG_CACHE_PATH = TEMP_DIR / "evaluation_log_cache.csv"
+UPLOAD_STATE_DIR = TEMP_DIR / "upload_state"
+LOCAL_BACKEND_DIR = Path(os.getenv("LOCAL_BACKEND_DIR", str(TEMP_DIR / "ml_pipeline_backend")))
+
+MODEL_CONFIG_PATH = PROJECT_ROOT / "model_config.yaml"
+MODEL_REGISTRY_PATH = MODELS_DIR / "model_registry.json"
+
+# Prediction Server Configuration
+PREDICTION_SERVER_HOST = os.getenv("PREDICTION_SERVER_HOST", "127.0.0.1")
+PREDICTION_SERVER_PORT = int(os.getenv("PREDICTION_SERVER_PORT", "8765"))
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "8"))
+MODEL_CACHE_MAX_BYTES = int(os.getenv("MODEL_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+# Refuse to load artifacts whose registry entry has no sha256 (otherwise a warning is logged)
+MODEL_REQUIRE_SHA256 = os.getenv("MODEL_REQUIRE_SHA256", "false").lower() == "true"
+PREDICTION_SERVER_WORKERS = int(os.getenv("PREDICTION_SERVER_WORKERS", "1"))
+MICRO_BATCH_MAX_SIZE = 64
+MICRO_BATCH_MAX_WAIT_MS = 2.0
+
+# Shadow Evaluation Configuration
+# Shadow predictions use rare-pattern log columns plus shadow_model_id (see
+# shadow_rows.py); the pattern readers drop tagged rows by default
+SHADOW_LOG_PATH = Path(os.getenv("SHADOW_LOG_PATH", str(LOGS_DIR / "shadow_evaluation_log.csv")))
+SHADOW_QUEUE_SIZE = 10000
+SHADOW_BATCH_SIZE = 256
+SHADOW_WORKERS = 2
+
+# System Log Shipping Configuration
+SYSTEM_LOG_SPOOL_PATH = Path(os.getenv("SYSTEM_LOG_SPOOL_PATH", str(TEMP_DIR / "system_logs_spool.jsonl")))
+SYSTEM_LOG_QUEUE_SIZE = 10000
+SYSTEM_LOG_BATCH_SIZE = 100
+SYSTEM_LOG_FLUSH_INTERVAL = 2.0
+
 # Create directories if they don't exist
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
 RETRAINED_MODELS_DIR.mkdir(parents=True, exist_ok=True)
+LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
 # Environment
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
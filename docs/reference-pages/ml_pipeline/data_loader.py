@@ -3,6 +3,9 @@ Data loader for ML Pipeline - handles evaluation log retrieval and dataset prepa
 """
 
 import logging
+import shutil
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Tuple
@@ -10,8 +13,10 @@ from typing import Optional, Tuple
 import pandas as pd
 
 from .config import (
+    DAEMON_REFRESH_INTERVAL,
     DEFAULT_LOOKBACK_DAYS,
     ERROR_CONFIDENCE_THRESHOLD,
+    EVALUATION_LOG_CACHE_PATH,
     EVALUATION_LOG_PATH,
     STORAGE_BUCKET,
     TEMP_DIR,
@@ -21,6 +26,92 @@ from .supabase_client import download_file_from_storage
 logger = logging.getLogger(__name__)
 
 
+def download_evaluation_log(local_path: str) -> str:
+    """
+    Download the evaluation log from Supabase Storage to a local file
+    
+    Args:
+        local_path: Destination path
+        
+    Returns:
+        Local path of the downloaded log
+    """
+    return download_file_from_storage(STORAGE_BUCKET, EVALUATION_LOG_PATH, local_path)
+
+
+class EvaluationLogCache:
+    """
+    Keeps the downloaded evaluation log and its parsed DataFrame in memory
+    
+    Used by long-running processes so consecutive runs skip the download and
+    CSV parse until the cached copy is older than ``max_age_seconds``.
+    """
+    
+    def __init__(self, path: Path = EVALUATION_LOG_CACHE_PATH, max_age_seconds: float = DAEMON_REFRESH_INTERVAL):
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        self.frame: Optional[pd.DataFrame] = None
+        self.fetched_at = 0.0
+        self._key: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _file_key(path: Path) -> Tuple[int, int]:
+        stat = Path(path).stat()
+        return stat.st_size, stat.st_mtime_ns
+    
+    def is_stale(self) -> bool:
+        """Return True if the cached log is missing or older than max_age_seconds"""
+        return self.frame is None or time.monotonic() - self.fetched_at > self.max_age_seconds
+    
+    def refresh(self, force: bool = False) -> Path:
+        """
+        Download and parse the evaluation log if stale
+        
+        Args:
+            force: Refresh even if the cached copy is still fresh
+            
+        Returns:
+            Path of the cached log file
+        """
+        with self._lock:
+            if force or self.is_stale():
+                download_evaluation_log(str(self.path))
+                self.frame = pd.read_csv(self.path)
+                self._key = self._file_key(self.path)
+                self.fetched_at = time.monotonic()
+                logger.info(f"Evaluation log cache refreshed: {len(self.frame)} records")
+            return self.path
+    
+    def copy_to(self, local_path: str) -> str:
+        """Copy the cached log file (keeping its mtime) to a run's working directory"""
+        source = self.refresh()
+        with self._lock:
+            shutil.copy2(source, local_path)
+        return local_path
+    
+    def read(self, local_path: str) -> pd.DataFrame:
+        """
+        Return the log stored at local_path, using the parsed frame when it is
+        an unchanged copy of the cached file
+        """
+        with self._lock:
+            if self.frame is not None and self._key == self._file_key(Path(local_path)):
+                return self.frame.copy()
+        return pd.read_csv(local_path)
+    
+    def memory_bytes(self) -> int:
+        """Return the memory held by the parsed frame"""
+        frame = self.frame
+        return int(frame.memory_usage(deep=True).sum()) if frame is not None else 0
+    
+    def clear(self) -> None:
+        """Drop the parsed frame; the next use downloads again"""
+        with self._lock:
+            self.frame = None
+            self._key = None
+
+
 def load_evaluation_log(lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> Optional[pd.DataFrame]:
     """
     Load evaluation log from Supabase Storage
@@ -33,7 +124,7 @@ def load_evaluation_log(lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> Optional[
     """
     try:
         temp_path = TEMP_DIR / f"evaluation_log_{datetime.now().isoformat()}.csv"
-        download_file_from_storage(STORAGE_BUCKET, EVALUATION_LOG_PATH, str(temp_path))
+        download_evaluation_log(str(temp_path))
         
         df = pd.read_csv(temp_path)
         logger.info(f"Loaded evaluation log with {len(df)} records")
@@ -135,7 +226,7 @@ def generate_dataset_filename() -> str:
     Returns:
         Filename with timestamp
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
     return f"finetune_{timestamp}.csv"
 
 
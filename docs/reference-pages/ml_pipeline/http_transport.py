@@ -0,0 +1,299 @@
+"""
+HTTP Transport - shared connection pool, retries and circuit breaker
+
+All Supabase traffic of the pipeline (PostgREST, Storage and edge functions)
+goes through one pooled keep-alive httpx.Client, so stages reuse open
+connections instead of paying a TLS handshake per call. Idempotent
+operations are retried on transient failures with jittered exponential
+backoff, and a process-wide circuit breaker opens after consecutive
+failures so an outage fails fast instead of stalling every stage.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+from .config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_MAX_RETRIES,
+    HTTP_RETRY_BASE_DELAY,
+    HTTP_RETRY_MAX_DELAY,
+    HTTP_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeouts, throttling and gateway/server errors
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+_http_client: Optional[httpx.Client] = None
+_circuit_breaker: Optional["CircuitBreaker"] = None
+_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open"""
+    pass
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by all Supabase calls"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the breaker
+
+        Args:
+            failure_threshold: Consecutive transient failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+            clock: Monotonic time source
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        Admit a call, moving an expired open circuit to half-open
+
+        Only one trial call is admitted while half-open. A trial that never
+        reports back (e.g. a cancelled coroutine) frees the slot after
+        another reset_timeout.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a trial call is in flight
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = self.clock()
+            if self.state == self.HALF_OPEN:
+                if now - self.trial_started_at < self.reset_timeout:
+                    raise CircuitOpenError("Supabase circuit half-open, trial call in progress")
+                logger.warning("Supabase circuit trial call did not report back, allowing another")
+            else:
+                remaining = self.reset_timeout - (now - self.opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(f"Supabase circuit open, retry in {remaining:.0f}s")
+                self.state = self.HALF_OPEN
+                logger.info("Supabase circuit half-open, allowing a trial call")
+            self.trial_started_at = now
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Supabase circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trial_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"Supabase circuit opened after {self.failures} consecutive failures "
+                        f"for {self.reset_timeout:.0f}s"
+                    )
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self.trial_started_at = None
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get or create the shared pooled HTTP client
+
+    Returns:
+        httpx.Client with keep-alive connection pooling
+    """
+    global _http_client
+
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=httpx.Timeout(HTTP_TIMEOUT, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+                follow_redirects=True,
+            )
+        return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections"""
+    global _http_client
+
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get or create the process-wide circuit breaker"""
+    global _circuit_breaker
+
+    with _lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker()
+        return _circuit_breaker
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Classify an exception from httpx, postgrest, storage3 or an edge function call
+
+    Returns:
+        True for connection failures, timeouts and retryable HTTP statuses
+    """
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+
+    # postgrest APIError carries the HTTP status in ``code`` for gateway
+    # errors; storage3 StorageApiError and aiohttp errors carry ``status``
+    for attribute in ("status", "status_code", "code"):
+        value = getattr(error, attribute, None)
+        try:
+            if value is not None and int(value) in TRANSIENT_STATUS_CODES:
+                return True
+        except (TypeError, ValueError):
+            continue
+    return False
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float = HTTP_RETRY_BASE_DELAY,
+    max_delay: float = HTTP_RETRY_MAX_DELAY,
+) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2^attempt)]"""
+    return random.uniform(0.0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def _after_failure(
+    error: Exception,
+    attempt: int,
+    description: str,
+    idempotent: bool,
+    max_retries: int,
+    breaker: CircuitBreaker,
+) -> Optional[float]:
+    """Record a failure and return the retry delay, or None to give up"""
+    transient = is_transient_error(error)
+    if transient:
+        breaker.record_failure()
+    else:
+        # The service answered; client errors say nothing about its health
+        breaker.record_success()
+
+    if not (transient and idempotent and attempt < max_retries):
+        return None
+
+    delay = backoff_delay(attempt)
+    logger.warning(f"{description} failed ({error}), retry {attempt + 1}/{max_retries} in {delay:.2f}s")
+    return delay
+
+
+def call_with_retry(
+    operation: Callable[[], T],
+    description: str = "Supabase call",
+    idempotent: bool = True,
+    max_retries: int = HTTP_MAX_RETRIES,
+    breaker: Optional[CircuitBreaker] = None,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> T:
+    """
+    Run a call through the circuit breaker, retrying transient failures
+
+    Args:
+        operation: Zero-argument callable performing the request
+        description: Name used in log messages
+        idempotent: Whether the call may be repeated safely; non-idempotent
+            calls are attempted once
+        max_retries: Retries after the first attempt
+        breaker: Circuit breaker (default: process-wide breaker)
+        sleep: Sleep function, replaceable in tests
+
+    Returns:
+        The operation's result
+
+    Raises:
+        CircuitOpenError: If the circuit is open
+        Exception: The last error once retries are exhausted
+    """
+    breaker = breaker if breaker is not None else get_circuit_breaker()
+    attempt = 0
+
+    while True:
+        breaker.before_call()
+        try:
+            result = operation()
+        except Exception as e:
+            delay = _after_failure(e, attempt, description, idempotent, max_retries, breaker)
+            if delay is None:
+                raise
+            sleep(delay)
+            attempt += 1
+            continue
+
+        breaker.record_success()
+        return result
+
+
+async def async_call_with_retry(
+    operation: Callable[[], Awaitable[T]],
+    description: str = "Supabase call",
+    idempotent: bool = True,
+    max_retries: int = HTTP_MAX_RETRIES,
+    breaker: Optional[CircuitBreaker] = None,
+) -> T:
+    """Coroutine variant of call_with_retry for aiohttp requests"""
+    breaker = breaker if breaker is not None else get_circuit_breaker()
+    attempt = 0
+
+    while True:
+        breaker.before_call()
+        try:
+            result = await operation()
+        except Exception as e:
+            delay = _after_failure(e, attempt, description, idempotent, max_retries, breaker)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        breaker.record_success()
+        return result
@@ -0,0 +1,315 @@
+"""
+Local Backend - SQLite and filesystem stand-in for the Supabase client
+
+Implements the subset of the supabase-py client used by supabase_client.py:
+``table(name)`` query builders (select/insert/update with eq/lt/gt filters,
+order and limit) and ``storage.from_(bucket)`` download/upload/exists/info.
+Rows are stored as JSON documents in a single SQLite file and Storage
+objects as plain files, so the whole reinforcement loop can run offline.
+Selected with ``ML_PIPELINE_BACKEND=local``.
+"""
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Column defaults of the mirrored tables (see supabase/migrations)
+TABLE_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "model_retraining_runs": {"status": "pending", "fine_tune_flag": True, "metrics": {}},
+    "model_retraining_requests": {"status": "pending", "priority": "normal"},
+    "system_logs": {"details": {}},
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    table_name TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (table_name, id)
+);
+CREATE TABLE IF NOT EXISTS storage_objects (
+    bucket TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    metadata TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (bucket, path)
+);
+"""
+
+
+def _sql_value(value: Any) -> Any:
+    """Convert a filter value to what json_extract returns for it"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+@dataclass
+class LocalResponse:
+    """Mirror of the postgrest APIResponse ``data`` attribute"""
+
+    data: List[dict] = field(default_factory=list)
+
+
+class LocalQuery:
+    """Chainable query on one table, executed against SQLite"""
+
+    def __init__(self, backend: "LocalSupabaseClient", table: str):
+        self.backend = backend
+        self.table = table
+        self.operation = "select"
+        self.payload: Union[dict, List[dict], None] = None
+        self.filters: List[Tuple[str, str, Any]] = []
+        self.orders: List[Tuple[str, bool]] = []
+        self.row_limit: Optional[int] = None
+        self.columns: Optional[List[str]] = None
+
+    def select(self, columns: str = "*") -> "LocalQuery":
+        self.operation = "select"
+        self.columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        return self
+
+    def insert(self, data: Union[dict, List[dict]]) -> "LocalQuery":
+        self.operation, self.payload = "insert", data
+        return self
+
+    def update(self, data: dict) -> "LocalQuery":
+        self.operation, self.payload = "update", data
+        return self
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        self.filters.append((column, "=", _sql_value(value)))
+        return self
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        self.filters.append((column, "<", _sql_value(value)))
+        return self
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        self.filters.append((column, ">", _sql_value(value)))
+        return self
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        # PostgREST ``is`` accepts null, true and false
+        self.filters.append((column, "IS", {"null": None, "true": 1, "false": 0}.get(str(value).lower(), value)))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "LocalQuery":
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count: int) -> "LocalQuery":
+        self.row_limit = count
+        return self
+
+    def _where(self) -> Tuple[str, List[Any]]:
+        clauses, params = ["table_name = ?"], [self.table]
+        for column, op, value in self.filters:
+            clauses.append(f"json_extract(data, ?) {op} ?")
+            params.extend([f"$.{column}", value])
+        return " AND ".join(clauses), params
+
+    def _select_sql(self) -> Tuple[str, List[Any]]:
+        where, params = self._where()
+        sql = f"SELECT data FROM records WHERE {where}"
+        if self.orders:
+            terms = []
+            for column, desc in self.orders:
+                terms.append(f"json_extract(data, ?) {'DESC' if desc else 'ASC'}")
+                params.append(f"$.{column}")
+            sql += " ORDER BY " + ", ".join(terms) + ", rowid"
+        if self.row_limit is not None:
+            sql += " LIMIT ?"
+            params.append(self.row_limit)
+        return sql, params
+
+    def execute(self) -> LocalResponse:
+        """Run the query and return the affected or selected rows"""
+        if self.operation == "insert":
+            return LocalResponse(self.backend.insert_rows(self.table, self.payload))
+        if self.operation == "update":
+            sql, params = self._select_sql()
+            return LocalResponse(self.backend.update_rows(self.table, sql, params, self.payload))
+
+        sql, params = self._select_sql()
+        rows = self.backend.fetch(sql, params)
+        if self.columns:
+            rows = [{c: row.get(c) for c in self.columns} for row in rows]
+        return LocalResponse(rows)
+
+
+class LocalStorageBucket:
+    """Storage bucket backed by a directory"""
+
+    def __init__(self, backend: "LocalSupabaseClient", bucket: str):
+        self.backend = backend
+        self.bucket = bucket
+        self.root = backend.storage_root / bucket
+
+    def _object_path(self, path: str) -> Path:
+        target = (self.root / path).resolve()
+        if self.root.resolve() not in target.parents:
+            raise ValueError(f"Invalid storage path: {path}")
+        return target
+
+    def download(self, path: str) -> bytes:
+        target = self._object_path(path)
+        if not target.exists():
+            raise FileNotFoundError(f"Object not found: {self.bucket}/{path}")
+        return target.read_bytes()
+
+    def upload(self, path: str, file: Any, file_options: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        Store an object from bytes, a path or a binary file handle
+
+        Raises:
+            FileExistsError: If the object exists and upsert is not enabled
+        """
+        options = file_options or {}
+        target = self._object_path(path)
+        if target.exists() and str(options.get("upsert", "false")).lower() != "true":
+            raise FileExistsError(f"Object already exists: {self.bucket}/{path}")
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        if isinstance(file, (bytes, bytearray)):
+            tmp_path.write_bytes(file)
+        elif isinstance(file, (str, Path)):
+            shutil.copyfile(file, tmp_path)
+        else:
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(file, f)
+        os.replace(tmp_path, target)
+
+        self.backend.put_object(self.bucket, path, target.stat().st_size, options.get("metadata") or {})
+        return {"path": path, "Key": f"{self.bucket}/{path}"}
+
+    def exists(self, path: str) -> bool:
+        return self._object_path(path).exists()
+
+    def info(self, path: str) -> Dict[str, Any]:
+        return self.backend.get_object(self.bucket, path)
+
+
+class LocalStorage:
+    """Storage namespace of the local client"""
+
+    # resumable_upload speaks TUS over HTTP and is not available locally
+    resumable = False
+
+    def __init__(self, backend: "LocalSupabaseClient"):
+        self.backend = backend
+        self.url = backend.storage_root.as_uri()
+
+    def from_(self, bucket: str) -> LocalStorageBucket:
+        return LocalStorageBucket(self.backend, bucket)
+
+
+class LocalSupabaseClient:
+    """Drop-in replacement for the supabase-py client backed by SQLite and files"""
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize the local backend
+
+        Args:
+            root: Directory holding ``backend.sqlite3`` and the ``storage`` tree
+        """
+        self.root = Path(root)
+        self.storage_root = (self.root / "storage").resolve()
+        self.storage_root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.root / "backend.sqlite3"), check_same_thread=False, isolation_level=None, timeout=30.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.storage = LocalStorage(self)
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def fetch(self, sql: str, params: List[Any]) -> List[dict]:
+        with self._lock:
+            return [json.loads(data) for (data,) in self._conn.execute(sql, params)]
+
+    def insert_rows(self, table: str, payload: Union[dict, List[dict]]) -> List[dict]:
+        """Insert rows, filling id, created_at and the table's column defaults"""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for item in payload if isinstance(payload, list) else [payload]:
+            row = {**TABLE_DEFAULTS.get(table, {}), "created_at": now, **item}
+            row["id"] = str(row.get("id") or uuid.uuid4())
+            rows.append(row)
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO records (table_name, id, data) VALUES (?, ?, ?)",
+                    [(table, row["id"], json.dumps(row, default=str)) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def update_rows(self, table: str, select_sql: str, params: List[Any], changes: dict) -> List[dict]:
+        """
+        Apply ``changes`` to the rows matched by ``select_sql`` in one transaction
+
+        The match and the write happen under a single write lock, so a
+        conditional update (e.g. ``eq("status", "pending")``) behaves like the
+        equivalent Postgres UPDATE ... WHERE.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                matched = [json.loads(data) for (data,) in self._conn.execute(select_sql, params)]
+                updated = [{**row, **changes} for row in matched]
+                self._conn.executemany(
+                    "UPDATE records SET data = ? WHERE table_name = ? AND id = ?",
+                    [(json.dumps(row, default=str), table, row["id"]) for row in updated],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return updated
+
+    def put_object(self, bucket: str, path: str, size: int, metadata: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO storage_objects (bucket, path, size, metadata, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (bucket, path, size, json.dumps(metadata), datetime.now(timezone.utc).isoformat()),
+            )
+
+    def get_object(self, bucket: str, path: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, metadata, updated_at FROM storage_objects WHERE bucket = ? AND path = ?",
+                (bucket, path),
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Object not found: {bucket}/{path}")
+        size, metadata, updated_at = row
+        return {"name": path, "size": size, "metadata": json.loads(metadata), "updated_at": updated_at}
@@ -0,0 +1,223 @@
+"""
+System Log Shipper - batches system_logs inserts off the caller's thread
+
+Once started, ``insert_system_log`` only appends the entry to a bounded queue.
+A background thread drains the queue into bulk inserts, flushing when a batch
+fills up, when the flush interval elapses and at interpreter exit. Batches that
+cannot be delivered are spooled to a local JSONL file and replayed by the next
+successful flush.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import supabase_client
+from .config import (
+    SYSTEM_LOG_BATCH_SIZE,
+    SYSTEM_LOG_FLUSH_INTERVAL,
+    SYSTEM_LOG_QUEUE_SIZE,
+    SYSTEM_LOG_SPOOL_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SystemLogShipper:
+    """Bounded background shipper for system log entries"""
+
+    def __init__(
+        self,
+        spool_path: Path = SYSTEM_LOG_SPOOL_PATH,
+        max_queue_size: int = SYSTEM_LOG_QUEUE_SIZE,
+        batch_size: int = SYSTEM_LOG_BATCH_SIZE,
+        flush_interval: float = SYSTEM_LOG_FLUSH_INTERVAL,
+    ):
+        """
+        Initialize the shipper
+
+        Args:
+            spool_path: JSONL file undeliverable entries are written to
+            max_queue_size: Pending entries kept before new ones are spooled
+            batch_size: Maximum entries per bulk insert
+            flush_interval: Seconds between flushes of a partial batch
+        """
+        self.spool_path = Path(spool_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._spool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "shipped": 0, "batches": 0, "spooled": 0, "replayed": 0}
+
+    def start(self) -> "SystemLogShipper":
+        """Start the background thread and route insert_system_log through it"""
+        if self._thread is not None:
+            return self
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="system-log-shipper", daemon=True)
+        self._thread.start()
+        supabase_client.set_log_shipper(self)
+        atexit.register(self.stop)
+        logger.debug("System log shipper started")
+        return self
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Ship everything still queued and stop the background thread"""
+        if self._thread is None:
+            return
+
+        supabase_client.set_log_shipper(None)
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        atexit.unregister(self.stop)
+
+        # Anything the thread could not reach before the timeout goes to the spool
+        leftover = self._drain(self._queue.qsize())
+        if leftover:
+            self._spool(leftover)
+
+    def submit(self, entry: Dict) -> bool:
+        """
+        Enqueue a log entry without blocking
+
+        Args:
+            entry: system_logs row
+
+        Returns:
+            True if queued, False if the queue was full and the entry was spooled
+        """
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._spool([entry])
+            return False
+
+        self._count("submitted")
+        return True
+
+    def flush(self) -> int:
+        """
+        Ship queued entries from the caller's thread
+
+        Returns:
+            Number of entries shipped
+        """
+        shipped = 0
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return shipped
+            shipped += self._ship(batch)
+
+    def stats(self) -> Dict[str, int]:
+        """Return shipping counters and current queue depth"""
+        with self._stats_lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _drain(self, limit: int) -> List[Dict]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _next_batch(self) -> List[Dict]:
+        """Wait up to the flush interval for the first entry, then fill the batch"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        batch.extend(self._drain(self.batch_size - 1))
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._ship(batch)
+            elif self._stop.is_set():
+                return
+
+    def _ship(self, batch: List[Dict]) -> int:
+        """Replay any spooled entries, then bulk insert the batch; spool on failure"""
+        if self.spool_path.exists() and not self._replay_spool():
+            self._spool(batch)
+            return 0
+
+        if not supabase_client.insert_system_logs(batch):
+            self._spool(batch)
+            return 0
+
+        self._count("batches")
+        self._count("shipped", len(batch))
+        return len(batch)
+
+    def _spool(self, entries: List[Dict]) -> None:
+        try:
+            with self._spool_lock, open(self.spool_path, "a") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, default=str) + "\n")
+            self._count("spooled", len(entries))
+        except OSError as e:
+            logger.warning(f"Failed to spool {len(entries)} system log entries: {e}")
+
+    def _replay_spool(self) -> bool:
+        """Ship spooled entries in batches; returns False if the backend is still unreachable"""
+        with self._spool_lock:
+            try:
+                with open(self.spool_path) as f:
+                    entries = [json.loads(line) for line in f if line.strip()]
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to read system log spool: {e}")
+                return False
+
+            for i in range(0, len(entries), self.batch_size):
+                if not supabase_client.insert_system_logs(entries[i:i + self.batch_size]):
+                    # Keep only what has not been delivered yet
+                    remaining = entries[i:]
+                    with open(self.spool_path, "w") as f:
+                        for entry in remaining:
+                            f.write(json.dumps(entry, default=str) + "\n")
+                    self._count("replayed", i)
+                    return False
+
+            self.spool_path.unlink()
+            self._count("replayed", len(entries))
+            logger.info(f"Replayed {len(entries)} spooled system log entries")
+            return True
+
+
+_shipper: Optional[SystemLogShipper] = None
+
+
+def start_log_shipper(**kwargs) -> SystemLogShipper:
+    """
+    Start the process-wide log shipper if it is not already running
+
+    Args:
+        **kwargs: Passed to SystemLogShipper
+
+    Returns:
+        The running shipper
+    """
+    global _shipper
+
+    if _shipper is None:
+        _shipper = SystemLogShipper(**kwargs)
+    return _shipper.start()
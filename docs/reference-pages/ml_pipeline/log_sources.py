@@ -0,0 +1,289 @@
+"""
+Log Sources - streamed evaluation-log input for rare pattern discovery.
+
+Reads evaluation logs from several files at once (explicit paths or globs
+such as ``logs/2026-*.csv.gz``), from CSV (plain or compressed), Parquet or
+Arrow IPC/Feather files, or from stdin (``-``, plain or gzip CSV). Every
+source is read in chunks, and each chunk is folded into running
+per-pattern aggregates, so a year of daily shards never has to fit in
+memory or be concatenated on disk.
+
+Parquet and Arrow input need ``pyarrow``.
+"""
+
+import glob
+import gzip
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from .rare_pattern_finder import (
+    MAX_SUPPORTING_MATCHES,
+    PATTERN_DIMENSIONS,
+    build_label,
+    build_pattern_insight,
+    encode_patterns,
+    extract_supporting_matches,
+    sort_patterns,
+)
+from .shadow_rows import SHADOW_MODEL_COLUMN, drop_shadow_predictions
+
+logger = logging.getLogger(__name__)
+
+# Rows per chunk read from each source
+STREAM_CHUNK_ROWS = 250_000
+STDIN = "-"
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+GZIP_MAGIC = b"\x1f\x8b"
+REQUIRED_COLUMNS = ("predicted_result", "actual_result", "confidence")
+# Columns pattern discovery reads; everything else is skipped at parse time
+STREAM_COLUMNS = REQUIRED_COLUMNS + tuple(spec[0] for spec in PATTERN_DIMENSIONS[1:]) + (
+    "timestamp",
+    "team_a",
+    "team_b",
+    SHADOW_MODEL_COLUMN,
+)
+
+
+def resolve_log_sources(specs: Sequence[str]) -> List[str]:
+    """
+    Expand paths and globs into the list of sources to read, in order.
+
+    :param specs: File paths, glob patterns, or ``-`` for stdin
+    :return: Sources with globs expanded and sorted
+    :raises FileNotFoundError: If a path does not exist or a glob matches nothing
+    """
+    sources = []
+    for spec in specs:
+        if spec == STDIN:
+            sources.append(STDIN)
+        elif any(char in spec for char in "*?["):
+            matches = sorted(path for path in glob.glob(spec, recursive=True) if Path(path).is_file())
+            if not matches:
+                raise FileNotFoundError(f"No evaluation logs match: {spec}")
+            sources.extend(matches)
+        elif not Path(spec).exists():
+            raise FileNotFoundError(f"Evaluation log not found: {spec}")
+        else:
+            sources.append(spec)
+    return sources
+
+
+def _require_pyarrow(source: str) -> None:
+    if pa is None:
+        raise ImportError(f"pyarrow required to read {source}. Install: pip install pyarrow")
+
+
+def _iter_csv(source: Any, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    # Pattern dimensions as text, so every chunk encodes values the same way
+    reader = pd.read_csv(
+        source,
+        chunksize=chunk_rows,
+        usecols=lambda column: column in STREAM_COLUMNS,
+        dtype={spec[0]: str for spec in PATTERN_DIMENSIONS},
+        compression="infer" if isinstance(source, str) else None,
+    )
+    with reader:
+        yield from reader
+
+
+def _iter_parquet(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    _require_pyarrow(path)
+    parquet_file = pq.ParquetFile(path)
+    columns = [name for name in parquet_file.schema_arrow.names if name in STREAM_COLUMNS]
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        yield batch.to_pandas()
+
+
+def _iter_arrow(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    _require_pyarrow(path)
+    with pa.memory_map(path) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            batches = pa.ipc.open_stream(source)
+        for batch in batches:
+            columns = [name for name in batch.schema.names if name in STREAM_COLUMNS]
+            for start in range(0, batch.num_rows, chunk_rows):
+                yield batch.slice(start, chunk_rows).to_pandas()[columns]
+
+
+def iter_log_chunks(source: str, chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Read one evaluation log source in chunks of at most ``chunk_rows`` rows.
+
+    The format comes from the file suffix: Parquet, Arrow/Feather, and
+    anything else is CSV with compression inferred from the suffix. Stdin
+    is CSV, gzip-compressed if it starts with the gzip magic bytes.
+
+    :param source: File path or ``-`` for stdin
+    :param chunk_rows: Maximum rows per chunk
+    :return: Iterator over DataFrames restricted to the columns discovery reads
+    """
+    if source == STDIN:
+        stream = sys.stdin.buffer
+        if stream.peek(2)[:2] == GZIP_MAGIC:
+            stream = gzip.GzipFile(fileobj=stream)
+        return _iter_csv(stream, chunk_rows)
+
+    suffix = Path(source).suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        return _iter_parquet(source, chunk_rows)
+    if suffix in ARROW_SUFFIXES:
+        return _iter_arrow(source, chunk_rows)
+    return _iter_csv(source, chunk_rows)
+
+
+class PatternAggregates:
+    """Running per-pattern totals and first supporting matches across chunks."""
+
+    def __init__(self):
+        self.counts: Optional[pd.DataFrame] = None
+        self.components: Dict[str, List[str]] = {}
+        self.matches: Dict[str, List[Dict[str, Any]]] = {}
+        self.rows_read = 0
+
+    @property
+    def total_predictions(self) -> int:
+        return 0 if self.counts is None else int(self.counts["total"].sum())
+
+    def add_chunk(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold one chunk into the aggregates.
+
+        Rows are numbered across all chunks and sources in reading order;
+        supporting matches use that number as ``match_id``.
+        """
+        chunk.index = pd.RangeIndex(self.rows_read, self.rows_read + len(chunk))
+        self.rows_read += len(chunk)
+        chunk = drop_shadow_predictions(chunk).dropna(subset=["actual_result"])
+        if chunk.empty:
+            return
+
+        is_correct = (chunk["predicted_result"] == chunk["actual_result"]).to_numpy()
+        packed, keys, inverse, components_of = encode_patterns(chunk)
+        names = []
+        for key in keys:
+            components = components_of(int(key))
+            name = "_".join(components)
+            self.components.setdefault(name, components)
+            names.append(name)
+
+        partial = pd.DataFrame({
+            "total": np.bincount(inverse, minlength=len(keys)),
+            "correct": np.bincount(inverse, weights=is_correct, minlength=len(keys)).astype(np.int64),
+        }, index=names)
+        self.counts = partial if self.counts is None else self.counts.add(partial, fill_value=0)
+
+        # Patterns that still lack supporting matches take them from this chunk
+        needed = {
+            int(key): name
+            for key, name in zip(keys, names)
+            if len(self.matches.get(name, ())) < MAX_SUPPORTING_MATCHES
+        }
+        found = extract_supporting_matches(
+            chunk.assign(pattern_code=packed), list(needed), key_column="pattern_code"
+        )
+        for key, name in needed.items():
+            existing = self.matches.setdefault(name, [])
+            existing.extend(found[key][:MAX_SUPPORTING_MATCHES - len(existing)])
+
+    def totals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-pattern prediction and correct counts."""
+        if self.counts is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return self.counts["total"].to_numpy(np.int64), self.counts["correct"].to_numpy(np.int64)
+
+    def rare_patterns(
+        self,
+        frequency_threshold: float,
+        accuracy_threshold: float,
+        min_sample_size: int,
+    ) -> List[Dict[str, Any]]:
+        """Filter the aggregates for rare but reliable patterns."""
+        total_predictions = self.total_predictions
+        if not total_predictions:
+            return []
+
+        counts = self.counts
+        frequency = counts["total"] / total_predictions
+        accuracy = counts["correct"] / counts["total"]
+        qualifying = counts[
+            (frequency < frequency_threshold)
+            & (accuracy >= accuracy_threshold)
+            & (counts["total"] >= min_sample_size)
+        ]
+
+        result = []
+        for pattern_key, row in qualifying.iterrows():
+            result.append(build_pattern_insight(
+                pattern_key,
+                build_label(*self.components[pattern_key]) or pattern_key,
+                frequency=float(row["total"] / total_predictions),
+                accuracy=float(row["correct"] / row["total"]),
+                sample_size=int(row["total"]),
+                supporting_matches=self.matches[pattern_key],
+            ))
+        return sort_patterns(result)
+
+
+def aggregate_log_sources(
+    sources: Sequence[str],
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> PatternAggregates:
+    """
+    Stream every source chunk by chunk into one set of pattern aggregates.
+
+    :param sources: Paths, globs or ``-`` for stdin
+    :param chunk_rows: Maximum rows per chunk
+    :return: Aggregates over all sources
+    :raises FileNotFoundError: If a source doesn't exist
+    :raises ValueError: If a source is missing required columns
+    """
+    aggregates = PatternAggregates()
+    for source in resolve_log_sources(sources):
+        for i, chunk in enumerate(iter_log_chunks(source, chunk_rows)):
+            if i == 0:
+                missing_columns = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+                if missing_columns:
+                    raise ValueError(f"{source}: Missing required columns: {missing_columns}")
+            aggregates.add_chunk(chunk)
+        logger.info(f"Read {source}: {aggregates.rows_read} rows so far")
+    return aggregates
+
+
+def find_rare_patterns_in_sources(
+    sources: Sequence[str],
+    frequency_threshold: float = 0.05,
+    accuracy_threshold: float = 0.80,
+    min_sample_size: int = 5,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> List[Dict[str, Any]]:
+    """
+    Identify rare but reliable patterns across several streamed log sources.
+
+    Gives the same result as ``find_rare_patterns`` on the concatenated logs.
+
+    :param sources: Paths, globs or ``-`` for stdin
+    :param frequency_threshold: Maximum occurrence frequency (default 5%)
+    :param accuracy_threshold: Minimum accuracy threshold (default 80%)
+    :param min_sample_size: Minimum sample size for statistical reliability
+    :param chunk_rows: Maximum rows per chunk
+    :return: List of high-value pattern dictionaries
+    """
+    aggregates = aggregate_log_sources(sources, chunk_rows)
+    return aggregates.rare_patterns(frequency_threshold, accuracy_threshold, min_sample_size)
@@ -9,12 +9,15 @@ This module provides command-line tools for:
 - Syncing patterns to database
 """
 
+import gzip
+import hashlib
 import json
+import os
 import sys
 import asyncio
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     import aiohttp
@@ -26,6 +29,189 @@ try:
 except ImportError:
     pd = None
 
+from ml_pipeline.config import (
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    PATTERN_SYNC_BATCH_SIZE,
+    PATTERN_SYNC_CONCURRENCY,
+    PATTERN_SYNC_MANIFEST,
+    PATTERN_SYNC_REFRESH_DAYS,
+)
+from ml_pipeline.http_transport import async_call_with_retry
+
+
+class PatternSyncError(Exception):
+    """Raised when the rare-pattern-sync edge function rejects a request."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Sync failed: {status} - {message}")
+        self.status = status
+
+
+# Pattern content compared between syncs: identity fields verbatim and the
+# headline metrics rounded, so the drift every new log row causes does not
+# resend the pattern. sample_size, supporting_matches and highlight_text are
+# brought up to date with the next change or expiry refresh.
+PATTERN_IDENTITY_FIELDS = ("pattern_key", "label")
+PATTERN_METRIC_PRECISION = {"accuracy_pct": 0, "frequency_pct": 1}
+MANIFEST_VERSION = 2
+DEFAULT_SYNC_SCOPE = "default"
+
+
+def pattern_content_hash(pattern: Dict[str, Any]) -> str:
+    """
+    Hash the parts of a pattern whose change warrants a resend.
+
+    :param pattern: Pattern dictionary
+    :return: Hex SHA-256 of the canonical JSON of the identity fields and
+        rounded metrics
+    """
+    content: Dict[str, Any] = {key: pattern.get(key) for key in PATTERN_IDENTITY_FIELDS}
+    for key, digits in PATTERN_METRIC_PRECISION.items():
+        value = pattern.get(key)
+        content[key] = round(float(value), digits) if value is not None else None
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO timestamp as written by the pattern finders.
+
+    :param value: ISO 8601 string (a trailing "Z" is accepted, also after
+        an explicit offset)
+    :return: Timezone-aware datetime, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    text = value[:-1] if value.endswith("Z") else value
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def manifest_entry(pattern: Dict[str, Any]) -> Dict[str, Any]:
+    """Manifest record of a synced pattern."""
+    return {
+        "hash": pattern_content_hash(pattern),
+        "expires_at": pattern.get("expires_at"),
+    }
+
+
+def _read_manifest(path: str, target: str) -> Dict[str, Dict[str, Any]]:
+    """Read every scope of a manifest written for ``target``."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION or data.get("target") != target:
+        return {}
+    return data.get("scopes", {})
+
+
+def load_sync_manifest(path: str, target: str, scope: str = DEFAULT_SYNC_SCOPE) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the per-pattern records of the last sync of ``scope`` to ``target``.
+
+    Each scope (one discovery configuration or patterns file) keeps its own
+    records, so syncing one scope never expires the patterns of another.
+    A missing or unreadable manifest, one written for another target, or
+    an unknown scope yields an empty manifest, which makes the next sync of
+    that scope a full one.
+
+    :param path: Manifest file
+    :param target: Edge function URL the manifest must belong to
+    :param scope: Sync scope
+    :return: Manifest records by pattern key
+    """
+    return _read_manifest(path, target).get(scope, {}).get("patterns", {})
+
+
+def save_sync_manifest(
+    path: str,
+    target: str,
+    patterns: Dict[str, Dict[str, Any]],
+    scope: str = DEFAULT_SYNC_SCOPE,
+) -> None:
+    """
+    Atomically replace one scope of the sync manifest.
+
+    :param path: Manifest file
+    :param target: Edge function URL the manifest belongs to
+    :param patterns: Manifest records by pattern key
+    :param scope: Sync scope the records belong to
+    """
+    scopes = _read_manifest(path, target)
+    scopes[scope] = {"synced_at": datetime.now(timezone.utc).isoformat(), "patterns": patterns}
+
+    manifest_path = Path(path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "target": target, "scopes": scopes}, f, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def plan_pattern_sync(
+    patterns: List[Dict[str, Any]],
+    manifest: Dict[str, Dict[str, Any]],
+    full: bool = False,
+    refresh_days: float = PATTERN_SYNC_REFRESH_DAYS,
+    now: Optional[datetime] = None,
+    expire: bool = True,
+) -> Dict[str, Any]:
+    """
+    Decide which patterns to send and which keys to expire.
+
+    An unchanged pattern is still refreshed when its synced expiry is less
+    than ``refresh_days`` away (so a pattern that keeps being discovered
+    never lapses) or when its new expiry is earlier than the synced one.
+
+    :param patterns: Currently discovered patterns
+    :param manifest: Records of the last sync of the same scope by pattern key
+    :param full: Send every pattern
+    :param refresh_days: Refresh unchanged patterns this close to expiry
+    :param now: Current time (default: now, UTC)
+    :param expire: Deactivate manifest keys missing from ``patterns``
+        (disable for partial discovery output)
+    :return: Dictionary with send (patterns), inserted, updated and
+        refreshed (pattern keys), expired_keys and the unchanged count
+    """
+    now = now or datetime.now(timezone.utc)
+    plan: Dict[str, Any] = {
+        "send": [], "inserted": [], "updated": [], "refreshed": [], "expired_keys": [], "unchanged": 0,
+    }
+    current = {pattern["pattern_key"]: pattern for pattern in patterns}
+
+    for key, pattern in current.items():
+        entry = manifest.get(key)
+        if entry is None:
+            reason = "inserted"
+        elif full or entry.get("hash") != pattern_content_hash(pattern):
+            reason = "updated"
+        else:
+            synced_expiry = parse_timestamp(entry.get("expires_at"))
+            new_expiry = parse_timestamp(pattern.get("expires_at"))
+            if (
+                synced_expiry is None
+                or new_expiry is None
+                or new_expiry < synced_expiry
+                or synced_expiry - now < timedelta(days=refresh_days)
+            ):
+                reason = "refreshed"
+            else:
+                plan["unchanged"] += 1
+                continue
+        plan[reason].append(key)
+        plan["send"].append(pattern)
+
+    if expire:
+        plan["expired_keys"] = sorted(key for key in manifest if key not in current)
+    return plan
+
 
 class PatternManager:
     """Manage rare patterns lifecycle and database operations."""
@@ -42,47 +228,195 @@ class PatternManager:
         self.edge_function_url = (
             f"{supabase_url}/functions/v1/rare-pattern-sync"
         )
+        self._session = None
+
+    async def __aenter__(self) -> "PatternManager":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self):
+        """
+        Return the shared keep-alive session, creating it on first use.
+
+        :return: aiohttp session reused by every sync call
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=HTTP_MAX_CONNECTIONS,
+                    keepalive_timeout=HTTP_KEEPALIVE_EXPIRY,
+                ),
+                headers={
+                    "Authorization": f"Bearer {self.service_role_key}",
+                    "Content-Type": "application/json",
+                },
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def sync_patterns(
         self,
         patterns: List[Dict[str, Any]],
+        batch_size: int = PATTERN_SYNC_BATCH_SIZE,
+        max_concurrency: int = PATTERN_SYNC_CONCURRENCY,
+        compress: bool = True,
+        expired_keys: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Sync patterns to database via edge function.
 
+        Patterns are sent in chunks of ``batch_size``, gzip-compressed, with
+        at most ``max_concurrency`` chunks in flight on the shared
+        keep-alive session. The edge function upserts by pattern key, so
+        each chunk is retried on its own after transient failures
+        (timeouts, 429 and 5xx) with jittered exponential backoff behind
+        the shared circuit breaker. A failed chunk does not stop the others.
+
         :param patterns: List of pattern dictionaries
-        :return: Response from edge function
-        :raises Exception: If sync fails
+        :param batch_size: Patterns per request
+        :param max_concurrency: Requests in flight at once
+        :param compress: Send gzip-compressed request bodies
+        :param expired_keys: Pattern keys to deactivate, sent in chunks of
+            ``batch_size`` alongside the upserts
+        :return: Aggregated result with synced, expired, chunks,
+            failed_chunks, failed_patterns, failed_keys and one error
+            message per failed chunk
+        :raises ValueError: If batch_size or max_concurrency is below 1
         """
         if not aiohttp:
             raise ImportError(
                 "aiohttp required for sync. Install: pip install aiohttp"
             )
-
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                "Authorization": f"Bearer {self.service_role_key}",
-                "Content-Type": "application/json",
-            }
-
-            payload = {"patterns": patterns}
-
-            try:
-                async with session.post(
-                    self.edge_function_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=30),
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size and max_concurrency must be at least 1")
+
+        session = self._get_session()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        expired_keys = expired_keys or []
+        # (description, first index, patterns to upsert, keys to deactivate)
+        chunks = [
+            ("Patterns", start, patterns[start:start + batch_size], [])
+            for start in range(0, len(patterns), batch_size)
+        ] + [
+            ("Expirations", start, [], expired_keys[start:start + batch_size])
+            for start in range(0, len(expired_keys), batch_size)
+        ]
+
+        def encode(chunk: List[Dict[str, Any]], expired: List[str]) -> Tuple[bytes, Dict[str, str]]:
+            payload: Dict[str, Any] = {"patterns": chunk}
+            if expired:
+                payload["expired_keys"] = expired
+            body = json.dumps(payload).encode()
+            if not compress:
+                return body, {}
+            return gzip.compress(body), {"Content-Encoding": "gzip"}
+
+        async def sync_chunk(chunk: List[Dict[str, Any]], expired: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                body, headers = encode(chunk, expired)
+
+                async def post() -> Dict[str, Any]:
+                    async with session.post(
+                        self.edge_function_url,
+                        data=body,
+                        headers=headers,
+                    ) as response:
+                        if response.status == 200:
+                            return await response.json()
                         error_text = await response.text()
-                        raise Exception(
-                            f"Sync failed: {response.status} - {error_text}"
-                        )
-            except asyncio.TimeoutError:
-                raise Exception("Pattern sync request timed out")
+                        raise PatternSyncError(response.status, error_text)
+
+                try:
+                    return await async_call_with_retry(post, "Pattern sync")
+                except asyncio.TimeoutError:
+                    raise Exception("Pattern sync request timed out")
+
+        results = await asyncio.gather(
+            *(sync_chunk(chunk, expired) for _, _, chunk, expired in chunks),
+            return_exceptions=True,
+        )
+
+        summary = {
+            "synced": 0,
+            "expired": 0,
+            "chunks": len(chunks),
+            "failed_chunks": 0,
+            "failed_patterns": 0,
+            "failed_keys": [],
+            "errors": [],
+        }
+        for (description, first, chunk, expired), result in zip(chunks, results):
+            keys = [pattern.get("pattern_key") for pattern in chunk] + expired
+            if isinstance(result, BaseException):
+                summary["failed_chunks"] += 1
+                summary["failed_patterns"] += len(keys)
+                summary["failed_keys"].extend(keys)
+                summary["errors"].append(
+                    f"{description} {first}-{first + len(keys) - 1}: {result}"
+                )
+            else:
+                summary["synced"] += result.get("synced", len(chunk))
+                summary["expired"] += len(expired)
+
+        return summary
+
+    async def sync_changed_patterns(
+        self,
+        patterns: List[Dict[str, Any]],
+        manifest_path: str = PATTERN_SYNC_MANIFEST,
+        full: bool = False,
+        scope: str = DEFAULT_SYNC_SCOPE,
+        expire: bool = True,
+        **sync_options: Any,
+    ) -> Dict[str, Any]:
+        """
+        Sync only what changed since the last successful sync.
+
+        A local manifest records the content hash and synced expiry of
+        every pattern key, per scope. New and changed patterns are upserted,
+        unchanged ones are skipped unless their synced expiry is about to
+        lapse, and keys of the same scope that are no longer discovered are
+        deactivated. The manifest is updated for every chunk that synced,
+        so a partial failure is retried on the next run.
+
+        :param patterns: Currently discovered patterns
+        :param manifest_path: Local sync manifest
+        :param full: Resend every pattern regardless of the manifest
+        :param scope: Discovery configuration or patterns file the patterns
+            come from; only keys previously synced from it can expire
+        :param expire: Deactivate keys of the scope missing from ``patterns``
+        :param sync_options: Passed on to sync_patterns
+        :return: sync_patterns result plus inserted, updated, refreshed
+            and unchanged counts
+        """
+        manifest = load_sync_manifest(manifest_path, self.edge_function_url, scope)
+        plan = plan_pattern_sync(patterns, manifest, full=full, expire=expire)
+
+        result = await self.sync_patterns(
+            plan["send"], expired_keys=plan["expired_keys"], **sync_options
+        )
+
+        failed = set(result["failed_keys"])
+        for pattern in plan["send"]:
+            key = pattern["pattern_key"]
+            if key not in failed:
+                manifest[key] = manifest_entry(pattern)
+        for key in plan["expired_keys"]:
+            if key not in failed:
+                manifest.pop(key, None)
+        save_sync_manifest(manifest_path, self.edge_function_url, manifest, scope)
+
+        result.update({name: len(plan[name]) for name in ("inserted", "updated", "refreshed")})
+        result["unchanged"] = plan["unchanged"]
+        return result
 
     def print_patterns_summary(self, patterns: List[Dict[str, Any]]) -> None:
         """Print summary of patterns."""
@@ -141,6 +475,53 @@ def main():
         "--output",
         help="Output JSON file",
     )
+    discover_parser.add_argument(
+        "--attributes",
+        help=(
+            "Comma-separated attributes to mine combinations of, e.g. "
+            "league,model_version,confidence_bucket (default: fixed "
+            "outcome/BTTS/template triple)"
+        ),
+    )
+    discover_parser.add_argument(
+        "--max-length",
+        type=int,
+        help="Maximum attributes per mined pattern (default: 3)",
+    )
+    discover_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for --attributes or --partition-by (default: all cores)",
+    )
+    discover_parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="Mining time budget in seconds (default: 300)",
+    )
+    discover_parser.add_argument(
+        "--state",
+        help=(
+            "SQLite counter store updated from rows appended since the last "
+            "run (fixed triple only)"
+        ),
+    )
+    discover_parser.add_argument(
+        "--partition-by",
+        help=(
+            "Find patterns separately per value of this column, e.g. league "
+            "or model_version (frequencies stay relative to the whole log)"
+        ),
+    )
+    discover_parser.add_argument(
+        "--decay-rate",
+        type=float,
+        help="Weigh predictions by exp(-rate * age in days) (fixed triple only)",
+    )
+    discover_parser.add_argument(
+        "--window-days",
+        type=float,
+        help="Only count predictions from the last N days (fixed triple only)",
+    )
 
     # Sync command
     sync_parser = subparsers.add_parser(
@@ -161,6 +542,45 @@ def main():
         required=True,
         help="Supabase service role key",
     )
+    sync_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=PATTERN_SYNC_BATCH_SIZE,
+        help=f"Patterns per request (default: {PATTERN_SYNC_BATCH_SIZE})",
+    )
+    sync_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=PATTERN_SYNC_CONCURRENCY,
+        help=f"Requests in flight at once (default: {PATTERN_SYNC_CONCURRENCY})",
+    )
+    sync_parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="Send uncompressed JSON request bodies",
+    )
+    sync_parser.add_argument(
+        "--manifest",
+        default=PATTERN_SYNC_MANIFEST,
+        help=f"Local manifest of the last sync (default: {PATTERN_SYNC_MANIFEST})",
+    )
+    sync_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Resend every pattern, ignoring the manifest",
+    )
+    sync_parser.add_argument(
+        "--scope",
+        help=(
+            "Manifest scope, one per discovery configuration; only patterns "
+            "previously synced under it are expired (default: the patterns file path)"
+        ),
+    )
+    sync_parser.add_argument(
+        "--no-expire",
+        action="store_true",
+        help="Do not deactivate patterns missing from this file (partial discovery output)",
+    )
 
     # Info command
     info_parser = subparsers.add_parser(
@@ -178,16 +598,68 @@ def main():
         parser.print_help()
         return 1
 
+    if args.command == "discover":
+        from ml_pipeline.rare_pattern_finder import unsupported_option_combination
+
+        conflict = unsupported_option_combination(vars(args))
+        if conflict:
+            discover_parser.error(conflict)
+
     try:
         if args.command == "discover":
-            from ml_pipeline.rare_pattern_finder import find_rare_patterns
+            if args.attributes:
+                from ml_pipeline.pattern_mining import (
+                    DEFAULT_MAX_LENGTH,
+                    DEFAULT_TIME_BUDGET_SECONDS,
+                    mine_rare_patterns,
+                )
 
-            patterns = find_rare_patterns(
-                args.log_file,
-                frequency_threshold=args.frequency_threshold,
-                accuracy_threshold=args.accuracy_threshold,
-                min_sample_size=args.min_samples,
-            )
+                patterns = mine_rare_patterns(
+                    args.log_file,
+                    attributes=args.attributes.split(","),
+                    frequency_threshold=args.frequency_threshold,
+                    accuracy_threshold=args.accuracy_threshold,
+                    min_sample_size=args.min_samples,
+                    max_length=DEFAULT_MAX_LENGTH if args.max_length is None else args.max_length,
+                    workers=args.workers,
+                    time_budget_seconds=(
+                        DEFAULT_TIME_BUDGET_SECONDS if args.time_budget is None else args.time_budget
+                    ),
+                )
+            elif args.state:
+                from ml_pipeline.pattern_store import find_rare_patterns_incremental
+
+                patterns = find_rare_patterns_incremental(
+                    args.log_file,
+                    args.state,
+                    frequency_threshold=args.frequency_threshold,
+                    accuracy_threshold=args.accuracy_threshold,
+                    min_sample_size=args.min_samples,
+                    decay_rate=args.decay_rate,
+                    window_days=args.window_days,
+                )
+            elif args.decay_rate is not None or args.window_days is not None:
+                from ml_pipeline.temporal_patterns import find_temporal_patterns
+
+                patterns = find_temporal_patterns(
+                    args.log_file,
+                    frequency_threshold=args.frequency_threshold,
+                    accuracy_threshold=args.accuracy_threshold,
+                    min_sample_size=args.min_samples,
+                    decay_rate=args.decay_rate,
+                    window_days=args.window_days,
+                )
+            else:
+                from ml_pipeline.rare_pattern_finder import find_rare_patterns
+
+                patterns = find_rare_patterns(
+                    args.log_file,
+                    frequency_threshold=args.frequency_threshold,
+                    accuracy_threshold=args.accuracy_threshold,
+                    min_sample_size=args.min_samples,
+                    partition_column=args.partition_by,
+                    workers=args.workers,
+                )
 
             output = json.dumps(patterns, indent=2)
 
@@ -208,11 +680,40 @@ def main():
 
             manager = PatternManager(args.supabase_url, args.service_role_key)
 
+            async def sync() -> Dict[str, Any]:
+                async with manager:
+                    return await manager.sync_changed_patterns(
+                        patterns,
+                        manifest_path=args.manifest,
+                        full=args.full,
+                        scope=args.scope or str(Path(args.patterns_file).resolve()),
+                        expire=not args.no_expire,
+                        batch_size=args.batch_size,
+                        max_concurrency=args.concurrency,
+                        compress=not args.no_compress,
+                    )
+
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(manager.sync_patterns(patterns))
+            result = loop.run_until_complete(sync())
 
-            print(f"✅ Sync successful: {result.get('synced', 0)} patterns")
+            if result["failed_chunks"]:
+                for error in result["errors"]:
+                    print(f"   {error}", file=sys.stderr)
+                print(
+                    f"❌ Synced {result['synced']} patterns; "
+                    f"{result['failed_chunks']} of {result['chunks']} chunks "
+                    f"({result['failed_patterns']} patterns) failed",
+                    file=sys.stderr,
+                )
+                return 1
+
+            print(
+                f"✅ Sync successful: {result['synced']} patterns "
+                f"({result['inserted']} new, {result['updated']} changed, "
+                f"{result['refreshed']} refreshed), {result['expired']} expired, "
+                f"{result['unchanged']} unchanged"
+            )
             return 0
 
         elif args.command == "info":
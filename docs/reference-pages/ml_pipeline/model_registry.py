@@ -0,0 +1,582 @@
+"""
+Model registry access and in-memory model cache for online inference
+"""
+
+import gc
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import joblib
+import yaml
+
+from .config import (
+    MODEL_CACHE_MAX_BYTES,
+    MODEL_CACHE_SIZE,
+    MODEL_CONFIG_PATH,
+    MODEL_REGISTRY_PATH,
+    MODEL_REQUIRE_SHA256,
+    MODELS_DIR,
+    PROJECT_ROOT,
+)
+
+logger = logging.getLogger(__name__)
+
+# Registry statuses that receive live traffic
+SERVING_STATUSES = ("active", "candidate")
+
+
+class ModelNotFoundError(Exception):
+    """Raised when a model cannot be resolved or its artifact is missing"""
+    pass
+
+
+class ModelIntegrityError(Exception):
+    """Raised when an artifact does not match the hash recorded in the registry"""
+    pass
+
+
+def load_model_config(config_path: Path = MODEL_CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Load model_config.yaml
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    with open(config_path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def load_model_registry(registry_path: Path = MODEL_REGISTRY_PATH) -> List[Dict[str, Any]]:
+    """
+    Load model entries from model_registry.json
+
+    Args:
+        registry_path: Path to the registry JSON file
+
+    Returns:
+        List of registry entries, empty if the registry does not exist
+    """
+    try:
+        with open(registry_path, "r") as f:
+            return json.load(f).get("models", [])
+    except FileNotFoundError:
+        logger.warning(f"Model registry not found: {registry_path}")
+        return []
+
+
+def find_registry_entry(registry: List[Dict[str, Any]], model_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a registry entry by id or name
+
+    Args:
+        registry: Registry entries
+        model_id: Model id or model name
+
+    Returns:
+        Matching entry or None
+    """
+    for entry in registry:
+        if model_id in (entry.get("id"), entry.get("name")):
+            return entry
+    return None
+
+
+def resolve_model_path(model_id: str, registry: List[Dict[str, Any]]) -> Path:
+    """
+    Resolve the artifact path for a model
+
+    Registry entries carry paths relative to the project root; models that are
+    not registered fall back to ``models/<model_id>.pkl``.
+
+    Args:
+        model_id: Model id or model name
+        registry: Registry entries
+
+    Returns:
+        Absolute path to the model artifact
+    """
+    entry = find_registry_entry(registry, model_id)
+    if entry and entry.get("path"):
+        path = Path(entry["path"])
+        return path if path.is_absolute() else PROJECT_ROOT / path
+    return MODELS_DIR / f"{model_id}.pkl"
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 hex digest of a file without reading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Upload digests by resolved path, valid while the file's (size, mtime_ns) is unchanged
+_digest_cache: Dict[str, tuple] = {}
+
+
+def _file_stamp(path: Path) -> tuple:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def remember_file_sha256(path: Path, sha256: str) -> None:
+    """Record a digest computed while the file was written, so uploads can skip re-reading it"""
+    _digest_cache[str(Path(path).resolve())] = (_file_stamp(Path(path)), sha256.lower())
+
+
+def cached_file_sha256(path: Path) -> str:
+    """
+    Return a file's SHA-256, reusing a cached digest while its size and mtime are unchanged
+
+    Only used to address uploads; ModelCache always re-hashes before loading.
+    """
+    key = str(Path(path).resolve())
+    stamp = _file_stamp(Path(path))
+    cached = _digest_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    sha256 = file_sha256(Path(path))
+    _digest_cache[key] = (stamp, sha256)
+    return sha256
+
+
+class HashingWriter:
+    """Binary file wrapper that hashes everything written through it"""
+
+    def __init__(self, f):
+        self.f = f
+        self.digest = hashlib.sha256()
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        return self.f.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.f, name)
+
+
+def register_model_artifact(
+    model_id: str,
+    artifact_path: Path,
+    registry_path: Path = MODEL_REGISTRY_PATH,
+    sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Point a registry entry at an artifact and record the artifact's hash
+
+    The registry file is replaced atomically; ModelCache verifies the
+    recorded ``sha256`` before deserializing the artifact.
+
+    Args:
+        model_id: Model id or model name of an existing registry entry
+        artifact_path: Artifact to register
+        registry_path: Path to the registry JSON file
+        sha256: Known digest of the artifact, e.g. from upload_model_artifact
+            (default: computed from the file)
+
+    Returns:
+        The updated registry entry
+
+    Raises:
+        ModelNotFoundError: If the entry or the artifact does not exist
+    """
+    artifact_path = Path(artifact_path).resolve()
+    if not artifact_path.exists():
+        raise ModelNotFoundError(f"Model artifact not found: {artifact_path}")
+
+    with open(registry_path, "r") as f:
+        registry = json.load(f)
+    entry = find_registry_entry(registry.get("models", []), model_id)
+    if entry is None:
+        raise ModelNotFoundError(f"Model not in registry: {model_id}")
+
+    try:
+        entry["path"] = str(artifact_path.relative_to(PROJECT_ROOT))
+    except ValueError:
+        entry["path"] = str(artifact_path)
+    entry["sha256"] = (sha256 or file_sha256(artifact_path)).lower()
+
+    tmp_path = Path(registry_path).with_name(Path(registry_path).name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(registry, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, registry_path)
+    logger.info(f"Registered {artifact_path} for model {model_id} (sha256 {entry['sha256']})")
+    return entry
+
+
+def load_model_artifact(path: Path, expected_sha256: Optional[str] = None) -> Any:
+    """
+    Load a serialized model from disk
+
+    Args:
+        path: Path to the model artifact
+        expected_sha256: Registry hash the artifact must match, if recorded
+
+    Returns:
+        Deserialized model
+
+    Raises:
+        ModelNotFoundError: If the artifact does not exist
+        ModelIntegrityError: If the artifact hash does not match
+    """
+    if not Path(path).exists():
+        raise ModelNotFoundError(f"Model artifact not found: {path}")
+
+    if expected_sha256:
+        actual = file_sha256(path)
+        if actual != expected_sha256.lower():
+            raise ModelIntegrityError(
+                f"Hash mismatch for {path}: expected {expected_sha256}, got {actual}"
+            )
+
+    model = joblib.load(path)
+    logger.info(f"Loaded model artifact from {path}")
+    return model
+
+
+def build_prediction(model_id: str, classes: List[Any], probabilities: Iterable[float]) -> Dict[str, Any]:
+    """
+    Format a probability row as a JSON-serializable prediction
+
+    Args:
+        model_id: Model that produced the probabilities
+        classes: Model classes in predict_proba column order
+        probabilities: Probability row
+
+    Returns:
+        Prediction with label, its probability and the full distribution
+    """
+    probabilities = [float(p) for p in probabilities]
+    best = max(range(len(probabilities)), key=probabilities.__getitem__)
+    labels = [label.item() if hasattr(label, "item") else label for label in classes]
+
+    return {
+        "model_id": model_id,
+        "prediction": labels[best],
+        "probability": probabilities[best],
+        "probabilities": {str(label): p for label, p in zip(labels, probabilities)},
+    }
+
+
+def serving_model_ids(config: Dict[str, Any], registry: List[Dict[str, Any]]) -> List[str]:
+    """
+    List the models that should be resident for serving
+
+    Args:
+        config: Parsed model_config.yaml
+        registry: Registry entries
+
+    Returns:
+        The configured active model followed by active/candidate registry models
+    """
+    model_ids = [config["inference"]["active_model_id"]]
+    for entry in registry:
+        if entry.get("status") in SERVING_STATUSES and entry["id"] not in model_ids:
+            model_ids.append(entry["id"])
+    return model_ids
+
+
+class ModelCache:
+    """
+    Thread-safe LRU cache of loaded models keyed by model id
+
+    The cache is bounded both by model count and by a memory budget. Model
+    size is estimated from the artifact size on disk. Pinned models (e.g. the
+    champion) are never evicted. Artifacts are verified against the
+    ``sha256`` of their registry entry before they are deserialized; entries
+    without one are loaded with a warning, or refused when
+    ``require_sha256`` is set.
+    """
+
+    def __init__(
+        self,
+        max_size: int = MODEL_CACHE_SIZE,
+        registry_path: Path = MODEL_REGISTRY_PATH,
+        max_bytes: int = MODEL_CACHE_MAX_BYTES,
+        require_sha256: bool = MODEL_REQUIRE_SHA256,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Maximum number of resident models
+            registry_path: Path to model_registry.json
+            max_bytes: Memory budget for resident models
+            require_sha256: Refuse artifacts without a registry hash
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.require_sha256 = require_sha256
+        self.registry_path = registry_path
+        self.registry = load_model_registry(registry_path)
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._pinned: set = set()
+        self._lock = threading.RLock()
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "load_failures": 0,
+            "integrity_failures": 0,
+            "evictions": 0,
+        }
+
+    def __contains__(self, model_id: str) -> bool:
+        with self._lock:
+            return model_id in self._models
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def cached_ids(self) -> List[str]:
+        """Return resident model ids, least recently used first"""
+        with self._lock:
+            return list(self._models)
+
+    def resident_bytes(self) -> int:
+        """Return the estimated memory held by resident models"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def metrics(self) -> Dict[str, int]:
+        """Return load/evict/hit counters and current residency"""
+        with self._lock:
+            return {
+                **self._metrics,
+                "resident_models": len(self._models),
+                "resident_bytes": sum(self._sizes.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+    def pin(self, *model_ids: str) -> None:
+        """Exempt models from eviction"""
+        with self._lock:
+            self._pinned.update(model_ids)
+
+    def unpin(self, *model_ids: str) -> None:
+        """Make models evictable again"""
+        with self._lock:
+            self._pinned.difference_update(model_ids)
+
+    def load(self, model_id: str) -> Any:
+        """Read and verify a model artifact from disk without touching the cache"""
+        entry = find_registry_entry(self.registry, model_id) or {}
+        try:
+            if not entry.get("sha256"):
+                if self.require_sha256:
+                    raise ModelIntegrityError(f"No sha256 recorded in the registry for model {model_id}")
+                logger.warning(f"No sha256 recorded in the registry for model {model_id}; loading unverified")
+            model = load_model_artifact(resolve_model_path(model_id, self.registry), entry.get("sha256"))
+        except ModelIntegrityError:
+            self._count("integrity_failures")
+            raise
+        except Exception:
+            self._count("load_failures")
+            raise
+
+        self._count("loads")
+        return model
+
+    def artifact_size(self, model_id: str) -> int:
+        """Estimate a model's resident size from its artifact on disk"""
+        try:
+            return resolve_model_path(model_id, self.registry).stat().st_size
+        except OSError:
+            return 0
+
+    def get(self, model_id: str) -> Any:
+        """
+        Get a model, loading it on a cache miss
+
+        Args:
+            model_id: Model id or model name
+
+        Returns:
+            Loaded model
+        """
+        with self._lock:
+            model = self._models.get(model_id)
+            if model is not None:
+                self._models.move_to_end(model_id)
+                self._metrics["hits"] += 1
+                return model
+            self._metrics["misses"] += 1
+
+        model = self.load(model_id)
+        self.put(model_id, model)
+        return model
+
+    def put(self, model_id: str, model: Any, size: Optional[int] = None) -> None:
+        """
+        Insert or replace a model, evicting least recently used ones
+
+        Args:
+            model_id: Model id
+            model: Loaded model
+            size: Estimated resident size (default: artifact size on disk)
+        """
+        if size is None:
+            size = self.artifact_size(model_id)
+
+        with self._lock:
+            self._models[model_id] = model
+            self._models.move_to_end(model_id)
+            self._sizes[model_id] = size
+            self._evict(keep=model_id)
+
+    def _evict(self, keep: str) -> None:
+        """Evict unpinned models, oldest first, until within count and memory limits"""
+        candidates = [m for m in self._models if m != keep and m not in self._pinned]
+        while candidates and (
+            len(self._models) > self.max_size or sum(self._sizes.values()) > self.max_bytes
+        ):
+            evicted_id = candidates.pop(0)
+            del self._models[evicted_id]
+            size = self._sizes.pop(evicted_id, 0)
+            self._metrics["evictions"] += 1
+            logger.info(f"Evicted model from cache: {evicted_id} ({size} bytes)")
+
+        if sum(self._sizes.values()) > self.max_bytes:
+            logger.warning(
+                f"Model cache over memory budget: {sum(self._sizes.values())} > {self.max_bytes} bytes"
+            )
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._metrics[key] += 1
+
+    def preload(self, model_ids: Iterable[str]) -> List[str]:
+        """
+        Load models ahead of traffic
+
+        Args:
+            model_ids: Models to load
+
+        Returns:
+            Ids of the models that were loaded successfully
+        """
+        loaded = []
+        for model_id in model_ids:
+            try:
+                self.get(model_id)
+                loaded.append(model_id)
+            except Exception as e:
+                logger.error(f"Failed to preload model {model_id}: {e}")
+        return loaded
+
+    def reload(self, model_ids: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Warm reload: re-read the registry and swap in fresh artifacts
+
+        New artifacts are loaded before they replace the resident ones, so
+        requests keep being served by the previous version until the swap.
+
+        Args:
+            model_ids: Models to reload (default: every resident model)
+
+        Returns:
+            Ids of the models that were reloaded successfully
+        """
+        self.registry = load_model_registry(self.registry_path)
+        model_ids = list(model_ids) if model_ids is not None else self.cached_ids()
+
+        reloaded = []
+        for model_id in model_ids:
+            try:
+                model = self.load(model_id)
+            except Exception as e:
+                logger.error(f"Failed to reload model {model_id}, keeping resident version: {e}")
+                continue
+            self.put(model_id, model)
+            reloaded.append(model_id)
+
+        logger.info(f"Reloaded {len(reloaded)}/{len(model_ids)} models")
+        return reloaded
+
+
+def main():
+    """CLI entry point: record an artifact and its hash for a registry model"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Register a model artifact and its sha256 in the model registry")
+    parser.add_argument("model_id", help="Model id or name of the registry entry")
+    parser.add_argument("artifact", help="Path of the model artifact")
+    parser.add_argument(
+        "--registry",
+        default=str(MODEL_REGISTRY_PATH),
+        help=f"Registry JSON file (default: {MODEL_REGISTRY_PATH})",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        entry = register_model_artifact(args.model_id, Path(args.artifact), Path(args.registry))
+    except (ModelNotFoundError, OSError, ValueError) as e:
+        logger.error(str(e))
+        return 1
+    print(json.dumps(entry, indent=2))
+    return 0
+
+
+def prefork_workers(
+    model_cache: ModelCache,
+    model_ids: Iterable[str],
+    workers: int,
+    target: Callable[..., Any],
+    *args: Any,
+) -> List[multiprocessing.Process]:
+    """
+    Load models once, then fork workers that share them copy-on-write
+
+    Resident objects are moved to the permanent GC generation before forking,
+    so collections in the children do not touch (and therefore copy) the
+    pages holding the shared models.
+
+    Args:
+        model_cache: Cache to populate in the parent process
+        model_ids: Models to load before forking
+        workers: Number of worker processes
+        target: Worker entry point, called as ``target(*args)``
+        *args: Arguments for the worker entry point
+
+    Returns:
+        Started worker processes
+    """
+    model_cache.preload(model_ids)
+
+    gc.collect()
+    gc.freeze()
+    try:
+        context = multiprocessing.get_context("fork")
+        processes = []
+        for i in range(workers):
+            process = context.Process(target=target, args=args, name=f"model-worker-{i}")
+            process.start()
+            processes.append(process)
+    finally:
+        gc.unfreeze()
+
+    logger.info(
+        f"Forked {workers} workers sharing {len(model_cache)} models "
+        f"({model_cache.resident_bytes()} bytes)"
+    )
+    return processes
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Traffic Router - deterministic in-process A/B routing over model_registry.json
+
+Every active/candidate model is loaded once. Requests are assigned by hashing
+the fixture id into a fixed-size slot table built from the registry's
+``traffic_allocation`` percentages, so routing is a single table lookup and a
+fixture always lands on the same model.
+"""
+
+import logging
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+
+from .model_registry import SERVING_STATUSES, ModelCache, build_prediction
+
+logger = logging.getLogger(__name__)
+
+# Number of routing slots; 1000 slots give 0.1% allocation granularity
+ROUTING_SLOTS = 1000
+
+# Recent latencies kept per model for percentile estimates
+LATENCY_WINDOW = 1024
+
+
+class RoutingError(Exception):
+    """Raised when the registry defines no routable models"""
+    pass
+
+
+class RouteStats:
+    """Latency and throughput counters for one routed model"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.recent: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.started_at = time.monotonic()
+
+    def record(self, latency: float, error: bool = False) -> None:
+        self.requests += 1
+        self.errors += int(error)
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.recent.append(latency)
+
+    def to_dict(self) -> Dict[str, float]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        recent = np.asarray(self.recent) * 1000.0 if self.recent else np.zeros(1)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": round(self.requests / elapsed, 3),
+            "avg_latency_ms": round(self.total_latency * 1000.0 / max(self.requests, 1), 4),
+            "p50_latency_ms": round(float(np.percentile(recent, 50)), 4),
+            "p95_latency_ms": round(float(np.percentile(recent, 95)), 4),
+            "max_latency_ms": round(self.max_latency * 1000.0, 4),
+        }
+
+
+def build_routing_table(registry: List[Dict[str, Any]], slots: int = ROUTING_SLOTS) -> List[str]:
+    """
+    Expand traffic allocations into a slot table
+
+    Allocations are treated as relative weights and apportioned with the
+    largest-remainder method, so the table always has exactly ``slots``
+    entries. If no serving model has a positive allocation, the active
+    model receives all traffic.
+
+    Args:
+        registry: Registry entries
+        slots: Table size
+
+    Returns:
+        List mapping slot index to model id
+
+    Raises:
+        RoutingError: If there is no active or candidate model
+    """
+    serving = [e for e in registry if e.get("status") in SERVING_STATUSES]
+    if not serving:
+        raise RoutingError("Model registry has no active or candidate models")
+
+    weights = [(e["id"], float(e.get("traffic_allocation") or 0)) for e in serving]
+    total = sum(weight for _, weight in weights)
+    if total <= 0:
+        champion = next((e for e in serving if e["status"] == "active"), serving[0])
+        weights, total = [(champion["id"], 1.0)], 1.0
+
+    quotas = [(model_id, weight * slots / total) for model_id, weight in weights if weight > 0]
+    counts = {model_id: int(quota) for model_id, quota in quotas}
+    remaining = slots - sum(counts.values())
+    by_remainder = sorted(quotas, key=lambda q: q[1] - int(q[1]), reverse=True)
+    for model_id, _ in by_remainder[:remaining]:
+        counts[model_id] += 1
+
+    table: List[str] = []
+    for model_id, count in counts.items():
+        table.extend([model_id] * count)
+    return table
+
+
+def fixture_slot(fixture_id: Any, slots: int = ROUTING_SLOTS, salt: str = "") -> int:
+    """Map a fixture id to a stable routing slot"""
+    return zlib.crc32(f"{salt}{fixture_id}".encode()) % slots
+
+
+class TrafficRouter:
+    """Deterministic traffic-split router over registry models"""
+
+    def __init__(
+        self,
+        model_cache: ModelCache,
+        features: Optional[List[str]] = None,
+        slots: int = ROUTING_SLOTS,
+        salt: str = "",
+    ):
+        """
+        Initialize the router
+
+        Args:
+            model_cache: Cache holding the registry and loaded models
+            features: Feature order for in-process predictions
+            slots: Routing table size
+            salt: Experiment salt; changing it reshuffles assignments
+        """
+        self.model_cache = model_cache
+        self.features = list(features or [])
+        self.slots = slots
+        self.salt = salt
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Rebuild the routing table from the cache's current registry
+
+        If models were loaded, the direct references are rebuilt for the new
+        table from the cache, so reloaded artifacts are picked up and models
+        that are no longer routed are released.
+        """
+        table = build_routing_table(self.model_cache.registry, self.slots)
+        models = self._resolve_models(sorted(set(table))) if self._models else {}
+        with self._lock:
+            self._table = table
+            self._models = models
+            for model_id in set(table):
+                self._stats.setdefault(model_id, RouteStats())
+        logger.info(f"Routing table built: {self.allocation()}")
+
+    def _resolve_models(self, model_ids: List[str]) -> Dict[str, Any]:
+        loaded = self.model_cache.preload(model_ids)
+        return {model_id: self.model_cache.get(model_id) for model_id in loaded}
+
+    def load_models(self) -> List[str]:
+        """Load every routed model once and keep direct references for the hot path"""
+        models = self._resolve_models(sorted(set(self._table)))
+        with self._lock:
+            self._models = models
+        return list(models)
+
+    def allocation(self) -> Dict[str, float]:
+        """Return the effective traffic share per model in percent"""
+        counts: Dict[str, int] = {}
+        for model_id in self._table:
+            counts[model_id] = counts.get(model_id, 0) + 1
+        return {model_id: 100.0 * count / self.slots for model_id, count in counts.items()}
+
+    def assign(self, fixture_id: Any) -> str:
+        """Return the model id serving a fixture"""
+        return self._table[fixture_slot(fixture_id, self.slots, self.salt)]
+
+    def record(self, model_id: str, latency: float, error: bool = False) -> None:
+        """Record one request's latency against a model"""
+        with self._lock:
+            self._stats.setdefault(model_id, RouteStats()).record(latency, error)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return latency and throughput counters per model"""
+        with self._lock:
+            return {model_id: stats.to_dict() for model_id, stats in self._stats.items()}
+
+    def predict(self, fixture_id: Any, feature_values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Route a fixture and score it in-process
+
+        Args:
+            fixture_id: Fixture identifier used for assignment
+            feature_values: Mapping of feature name to value
+
+        Returns:
+            Prediction from the assigned model
+        """
+        model_id = self.assign(fixture_id)
+        model = self._models.get(model_id) or self.model_cache.get(model_id)
+
+        start = time.perf_counter()
+        try:
+            X = np.array([[feature_values[f] for f in self.features]], dtype=np.float64)
+            probabilities = np.asarray(model.predict_proba(X))[0]
+        except KeyError as e:
+            self.record(model_id, time.perf_counter() - start, error=True)
+            raise ValueError(f"Missing value for feature: {e.args[0]}")
+        except Exception:
+            self.record(model_id, time.perf_counter() - start, error=True)
+            raise
+        self.record(model_id, time.perf_counter() - start)
+
+        result = build_prediction(model_id, list(model.classes_), probabilities)
+        result["fixture_id"] = fixture_id
+        return result
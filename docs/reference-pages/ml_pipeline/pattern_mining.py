@@ -0,0 +1,376 @@
+"""
+Pattern Mining - multi-dimensional rare-pattern discovery.
+
+Generalizes find_rare_patterns from the fixed (predicted_result,
+btts_prediction, template_name) triple to itemsets over any configured
+attributes, e.g. model version, league, confidence bucket, home/away and
+template. Attributes are integer-coded once; itemsets are counted level by
+level as packed keys over attribute combinations, with Apriori support
+pruning: a row only counts towards a k-itemset if every (k-1)-subset of it
+reached the minimum sample size. Combinations of one level are counted in
+parallel worker processes, and mining stops at a wall-clock budget.
+
+Rare, high-accuracy itemsets are returned in the find_rare_patterns output
+schema.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .rare_pattern_finder import (
+    build_pattern_insight,
+    encode_dimension,
+    extract_supporting_matches,
+    load_evaluation_log,
+    pack_codes,
+    sort_patterns,
+    unpack_code,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LENGTH = 3
+DEFAULT_TIME_BUDGET_SECONDS = 300.0
+CONFIDENCE_BUCKETS = (0.0, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+# Key spaces up to this size are counted with dense bincount/lookup tables
+DENSE_KEY_SPACE = 1 << 24
+
+
+@dataclass(frozen=True)
+class MiningAttribute:
+    """One dimension of the itemset search space."""
+
+    name: str
+    column: str
+    bins: Optional[Tuple[float, ...]] = None
+    fill_na: Optional[str] = None
+
+
+DEFAULT_MINING_ATTRIBUTES = (
+    MiningAttribute("predicted_result", "predicted_result"),
+    MiningAttribute("btts_prediction", "btts_prediction"),
+    MiningAttribute("template_name", "template_name", fill_na="NONE"),
+    MiningAttribute("model_version", "model_version"),
+    MiningAttribute("league", "league"),
+    MiningAttribute("home_away", "home_away"),
+    MiningAttribute("confidence_bucket", "confidence", bins=CONFIDENCE_BUCKETS),
+)
+
+
+def resolve_attributes(names: Optional[Sequence[str]] = None) -> List[MiningAttribute]:
+    """
+    Map attribute names to mining attributes.
+
+    :param names: Attribute names; names without a default definition are
+        used as plain categorical columns (None = all defaults)
+    :return: Mining attributes
+    """
+    if names is None:
+        return list(DEFAULT_MINING_ATTRIBUTES)
+    defaults = {attribute.name: attribute for attribute in DEFAULT_MINING_ATTRIBUTES}
+    return [defaults.get(name, MiningAttribute(name, name)) for name in names]
+
+
+def encode_attribute(df: pd.DataFrame, attribute: MiningAttribute) -> Tuple[np.ndarray, List[str]]:
+    """
+    Integer-code one attribute, binning numeric attributes into buckets.
+
+    :param df: Evaluation log
+    :param attribute: Attribute definition
+    :return: Per-row codes and the display string of each code
+    """
+    if attribute.bins is None:
+        return encode_dimension(df, attribute.column, "NA", attribute.fill_na)
+
+    bins = attribute.bins
+    buckets = pd.cut(pd.to_numeric(df[attribute.column], errors="coerce"), bins=bins, include_lowest=True)
+    codes = buckets.cat.codes.to_numpy().astype(np.int64)
+    values = [f"{low:.2f}-{high:.2f}" for low, high in zip(bins[:-1], bins[1:])]
+    # Values outside the bins or missing get their own code
+    codes[codes < 0] = len(values)
+    return codes, values + ["nan"]
+
+
+def itemset_label(items: List[Tuple[str, str]]) -> str:
+    """
+    Build a human-readable label for an itemset.
+
+    :param items: (attribute name, value) pairs
+    :return: Label such as "Home Win + BTTS League: EPL"
+    """
+    parts = []
+    for name, value in items:
+        if name == "predicted_result":
+            parts.append(value.replace("_", " ").title())
+        elif name == "btts_prediction":
+            parts.append("+ BTTS" if value.lower() in ["true", "1"] else "- No BTTS")
+        elif name == "template_name":
+            parts.append("No Template" if value == "NONE" else value.replace("_", " ").title())
+        else:
+            parts.append(f"{name.replace('_', ' ').title()}: {value}")
+    return " ".join(parts)
+
+
+# Per-process state of counting workers, set once by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(codes: np.ndarray, is_correct: np.ndarray, cardinalities: List[int]) -> None:
+    _worker_state.update(codes=codes, is_correct=is_correct, cardinalities=cardinalities)
+
+
+def _subset_keys(subset: Tuple[int, ...]) -> Tuple[np.ndarray, int]:
+    codes, cardinalities = _worker_state["codes"], _worker_state["cardinalities"]
+    subset_cardinalities = [cardinalities[j] for j in subset]
+    return (
+        pack_codes([codes[:, j] for j in subset], subset_cardinalities),
+        int(np.prod(subset_cardinalities, dtype=float)),
+    )
+
+
+def _in_keys(packed: np.ndarray, keys: np.ndarray, space: int) -> np.ndarray:
+    """Per-row membership of packed keys in a key set."""
+    if space <= DENSE_KEY_SPACE:
+        table = np.zeros(space, dtype=bool)
+        table[keys] = True
+        return table[packed]
+    return np.isin(packed, keys)
+
+
+def count_itemsets(
+    subset: Tuple[int, ...],
+    frequent_parents: Dict[Tuple[int, ...], np.ndarray],
+    min_support: int,
+) -> Tuple[Tuple[int, ...], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count the itemsets of one attribute combination above minimum support.
+
+    Rows are only counted if each of their (k-1)-sub-itemsets is frequent,
+    which is the Apriori property: no superset of an infrequent itemset can
+    be frequent.
+
+    :param subset: Attribute indices of the combination
+    :param frequent_parents: Frequent packed keys of each (k-1)-combination
+    :param min_support: Minimum matching predictions
+    :return: Subset, frequent packed keys, their counts and correct counts
+    """
+    is_correct = _worker_state["is_correct"]
+    mask = None
+    for j in subset:
+        parent = tuple(a for a in subset if a != j)
+        if parent:
+            parent_keys, parent_space = _subset_keys(parent)
+            in_frequent = _in_keys(parent_keys, frequent_parents[parent], parent_space)
+            mask = in_frequent if mask is None else mask & in_frequent
+
+    packed, space = _subset_keys(subset)
+    if mask is not None:
+        packed, is_correct = packed[mask], is_correct[mask]
+
+    if space <= DENSE_KEY_SPACE:
+        counts = np.bincount(packed, minlength=space)
+        correct = np.bincount(packed, weights=is_correct, minlength=space)
+        keys = np.arange(space)
+    else:
+        keys, inverse = np.unique(packed, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(keys))
+        correct = np.bincount(inverse, weights=is_correct, minlength=len(keys))
+    keep = counts >= max(min_support, 1)
+    return subset, keys[keep], counts[keep], correct[keep]
+
+
+def mine_itemsets(
+    codes: np.ndarray,
+    is_correct: np.ndarray,
+    cardinalities: List[int],
+    min_support: int,
+    max_length: int = DEFAULT_MAX_LENGTH,
+    workers: Optional[int] = None,
+    time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+) -> Tuple[Dict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray, np.ndarray]], bool]:
+    """
+    Level-wise frequent itemset counting over integer-coded attributes.
+
+    :param codes: (rows, attributes) code matrix
+    :param is_correct: Per-row correctness
+    :param cardinalities: Number of distinct codes of each attribute
+    :param min_support: Minimum matching predictions per itemset
+    :param max_length: Largest itemset size
+    :param workers: Counting processes (None = all cores, 1 = in-process)
+    :param time_budget_seconds: Wall-clock budget; mining stops when exceeded
+    :return: Frequent (keys, counts, correct counts) per attribute
+        combination, and whether the budget cut mining short
+    """
+    workers = workers or os.cpu_count() or 1
+    deadline = time.monotonic() + time_budget_seconds
+    frequent: Dict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+    truncated = False
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(codes, is_correct, cardinalities),
+        )
+    else:
+        _init_worker(codes, is_correct, cardinalities)
+
+    try:
+        for length in range(1, max_length + 1):
+            # Apriori candidates: every (k-1)-combination has frequent itemsets
+            candidates = [
+                subset
+                for subset in combinations(range(len(cardinalities)), length)
+                if all(
+                    parent in frequent and len(frequent[parent][0])
+                    for parent in combinations(subset, length - 1)
+                    if parent
+                )
+            ]
+            if not candidates:
+                break
+
+            jobs = [
+                (subset, {parent: frequent[parent][0] for parent in combinations(subset, length - 1) if parent})
+                for subset in candidates
+            ]
+            results, truncated = _count_level(executor, jobs, min_support, deadline)
+            for subset, keys, counts, correct in results:
+                frequent[subset] = (keys, counts, correct)
+
+            if truncated:
+                logger.warning(
+                    f"Pattern mining stopped at itemset length {length}: "
+                    f"time budget of {time_budget_seconds:.0f}s exceeded"
+                )
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        _worker_state.clear()
+
+    return frequent, truncated
+
+
+def _count_level(
+    executor: Optional[ProcessPoolExecutor],
+    jobs: List[Tuple[Tuple[int, ...], Dict[Tuple[int, ...], np.ndarray]]],
+    min_support: int,
+    deadline: float,
+) -> Tuple[List[Tuple[Tuple[int, ...], np.ndarray, np.ndarray, np.ndarray]], bool]:
+    """Count one level's combinations, returning finished results and a timeout flag."""
+    results = []
+    if executor is None:
+        for subset, parents in jobs:
+            if time.monotonic() >= deadline:
+                return results, True
+            results.append(count_itemsets(subset, parents, min_support))
+        return results, False
+
+    pending = {executor.submit(count_itemsets, subset, parents, min_support) for subset, parents in jobs}
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            for future in pending:
+                future.cancel()
+            return results, True
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        results.extend(future.result() for future in done)
+    return results, False
+
+
+def mine_rare_patterns(
+    evaluation_log_path: str,
+    attributes: Optional[Sequence[str]] = None,
+    frequency_threshold: float = 0.05,
+    accuracy_threshold: float = 0.80,
+    min_sample_size: int = 5,
+    max_length: int = DEFAULT_MAX_LENGTH,
+    workers: Optional[int] = None,
+    time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+) -> List[Dict[str, Any]]:
+    """
+    Discover rare but reliable itemsets over configurable attributes.
+
+    :param evaluation_log_path: Path to evaluation log CSV file
+    :param attributes: Attribute names to combine (None = every default
+        attribute present in the log)
+    :param frequency_threshold: Maximum occurrence frequency (default 5%)
+    :param accuracy_threshold: Minimum accuracy threshold (default 80%)
+    :param min_sample_size: Minimum sample size, also the pruning support
+    :param max_length: Largest number of attributes combined in one pattern
+    :param workers: Counting processes (None = all cores)
+    :param time_budget_seconds: Wall-clock budget for counting
+    :return: List of high-value pattern dictionaries, keyed
+        "attribute=value|attribute=value"
+    :raises FileNotFoundError: If evaluation log file doesn't exist
+    :raises ValueError: If data is invalid or missing required columns
+    """
+    df = load_evaluation_log(evaluation_log_path)
+    if len(df) == 0:
+        return []
+
+    # Only attributes present in the log that can split it
+    encoded = []
+    for attribute in resolve_attributes(attributes):
+        if attribute.column not in df.columns:
+            continue
+        attribute_codes, values = encode_attribute(df, attribute)
+        if len(values) > 1:
+            encoded.append((attribute, attribute_codes, values))
+    if not encoded:
+        return []
+
+    codes = np.column_stack([attribute_codes for _, attribute_codes, _ in encoded])
+    cardinalities = [len(values) for _, _, values in encoded]
+    is_correct = (df["predicted_result"] == df["actual_result"]).to_numpy()
+
+    frequent, truncated = mine_itemsets(
+        codes,
+        is_correct,
+        cardinalities,
+        min_support=min_sample_size,
+        max_length=max_length,
+        workers=workers,
+        time_budget_seconds=time_budget_seconds,
+    )
+
+    total_predictions = len(df)
+    result = []
+    for subset, (keys, counts, correct) in frequent.items():
+        accuracy = correct / counts
+        frequency = counts / total_predictions
+        qualifying = np.flatnonzero((frequency < frequency_threshold) & (accuracy >= accuracy_threshold))
+        if len(qualifying) == 0:
+            continue
+
+        subset_cardinalities = [cardinalities[j] for j in subset]
+        df["_itemset_key"] = pack_codes([codes[:, j] for j in subset], subset_cardinalities)
+        supporting = extract_supporting_matches(df, keys[qualifying].tolist(), key_column="_itemset_key")
+
+        for i in qualifying:
+            items = [
+                (encoded[j][0].name, encoded[j][2][code])
+                for j, code in zip(subset, unpack_code(int(keys[i]), subset_cardinalities))
+            ]
+            result.append(build_pattern_insight(
+                "|".join(f"{name}={value}" for name, value in items),
+                itemset_label(items),
+                frequency=float(frequency[i]),
+                accuracy=float(accuracy[i]),
+                sample_size=int(counts[i]),
+                supporting_matches=supporting[int(keys[i])],
+            ))
+
+    if truncated:
+        logger.warning(f"Returning {len(result)} patterns from a partial search")
+    return sort_patterns(result)
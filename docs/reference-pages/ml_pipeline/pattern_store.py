@@ -0,0 +1,531 @@
+"""
+Pattern Store - incremental per-pattern statistics for rare pattern discovery.
+
+Keeps running counters (correct, total, confidence sum, first/last seen) per
+pattern key in a SQLite file next to the evaluation log. Each update parses
+only the bytes appended to the log since the previous run, so discovery
+becomes a filter over current counters instead of a full re-scan.
+
+Rows are identified by their ``prediction_id``/``id`` column when present,
+otherwise by their position in the log. A row re-appended with a known id
+(e.g. a corrected or newly settled ``actual_result``) replaces the earlier
+row's contribution. If the already-processed part of the log was rewritten
+in place, the counters are rebuilt from scratch.
+
+Counts are also kept per hour, so time-decayed and sliding-window
+statistics (see ``temporal_patterns``) come from the same incremental
+update instead of a re-scan of the log.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .rare_pattern_finder import (
+    MAX_SUPPORTING_MATCHES,
+    PATTERN_DIMENSIONS,
+    build_label,
+    build_pattern_insight,
+    encode_patterns,
+    sort_patterns,
+)
+from .shadow_rows import is_shadow_prediction
+from .temporal_patterns import SECONDS_PER_DAY, epoch_seconds, temporal_statistics, validate_temporal_mode
+
+logger = logging.getLogger(__name__)
+
+# Rows parsed per batch when applying appended data
+UPDATE_CHUNK_ROWS = 200_000
+# Columns identifying a prediction across appends, in order of preference
+ROW_ID_COLUMNS = ("prediction_id", "id")
+# Bytes hashed at the start of the log and before the processed offset
+FINGERPRINT_BYTES = 64 * 1024
+REQUIRED_COLUMNS = ("predicted_result", "actual_result", "confidence")
+# Granularity of the time buckets behind decayed and windowed statistics
+BUCKET_SECONDS = 3600
+# Bumped whenever the tables change; older stores are rebuilt from the log
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    columns TEXT NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    rows_applied INTEGER NOT NULL,
+    head_sha256 TEXT NOT NULL,
+    tail_sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pattern_counters (
+    pattern_key TEXT PRIMARY KEY,
+    predicted_outcome TEXT NOT NULL,
+    btts_flag TEXT NOT NULL,
+    template_name TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    first_seen TEXT,
+    last_seen TEXT
+);
+CREATE TABLE IF NOT EXISTS pattern_rows (
+    row_id TEXT PRIMARY KEY,
+    row_index INTEGER NOT NULL,
+    pattern_key TEXT NOT NULL,
+    counted INTEGER NOT NULL,
+    is_correct INTEGER NOT NULL,
+    confidence REAL NOT NULL,
+    date TEXT NOT NULL,
+    teams TEXT NOT NULL,
+    bucket INTEGER
+);
+CREATE INDEX IF NOT EXISTS pattern_rows_by_pattern ON pattern_rows (pattern_key, row_index);
+CREATE TABLE IF NOT EXISTS pattern_buckets (
+    pattern_key TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (pattern_key, bucket)
+);
+"""
+
+
+def _sha256_range(path: Path, start: int, end: int) -> str:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(max(0, end - start))).hexdigest()
+
+
+def _complete_lines_end(path: Path, offset: int) -> Tuple[int, int]:
+    """
+    Find the end of the last complete line after ``offset``.
+
+    :return: Byte position after the last newline and the number of lines
+        between ``offset`` and it
+    """
+    end, lines = offset, 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        position = offset
+        while True:
+            block = f.read(1024 * 1024)
+            if not block:
+                break
+            count = block.count(b"\n")
+            if count:
+                lines += count
+                end = position + block.rindex(b"\n") + 1
+            position += len(block)
+    return end, lines
+
+
+def row_contributions(chunk: pd.DataFrame, id_column: Optional[str], first_index: int) -> pd.DataFrame:
+    """
+    Compute each row's pattern key and counter contribution.
+
+    Pattern keys are built once per distinct pattern in the chunk from
+    integer codes, not per row.
+
+    :param chunk: Parsed evaluation log rows
+    :param id_column: Column identifying predictions (None = row position)
+    :param first_index: Log position of the chunk's first row
+    :return: One row per input row with key, components and contribution
+    """
+    n = len(chunk)
+    _, keys, inverse, components_of = encode_patterns(chunk)
+    components = [components_of(int(key)) for key in keys]
+    names = np.array(["_".join(parts) for parts in components], dtype=object)
+    row_index = np.arange(first_index, first_index + n)
+
+    # Shadow-model rows are kept as rows but never counted, like unsettled ones
+    settled = chunk["actual_result"].notna().to_numpy() & ~is_shadow_prediction(chunk)
+    out = pd.DataFrame({
+        "row_id": (chunk[id_column].astype(str).to_numpy() if id_column else row_index.astype(str)),
+        "row_index": row_index,
+        "pattern_key": names[inverse],
+        "predicted_outcome": np.array([c[0] for c in components], dtype=object)[inverse],
+        "btts_flag": np.array([c[1] for c in components], dtype=object)[inverse],
+        "template_name": np.array([c[2] for c in components], dtype=object)[inverse],
+        "counted": settled.astype(int),
+        "is_correct": ((chunk["predicted_result"] == chunk["actual_result"]).to_numpy() & settled).astype(int),
+        "confidence": pd.to_numeric(chunk["confidence"], errors="coerce").fillna(0.0).to_numpy(),
+        "seen": chunk["timestamp"].astype(str).to_numpy() if "timestamp" in chunk.columns else None,
+        "bucket": (
+            np.floor(epoch_seconds(chunk["timestamp"]) / BUCKET_SECONDS) * BUCKET_SECONDS
+            if "timestamp" in chunk.columns
+            else np.nan
+        ),
+        "date": chunk["timestamp"].astype(str).to_numpy() if "timestamp" in chunk.columns else "N/A",
+        "teams": (
+            (chunk["team_a"].astype(str) + " vs " + chunk["team_b"].astype(str)).to_numpy()
+            if "team_a" in chunk.columns and "team_b" in chunk.columns
+            else "N/A"
+        ),
+    })
+    # A prediction appended twice in one chunk: the later row wins
+    return out.drop_duplicates("row_id", keep="last")
+
+
+class PatternCounterStore:
+    """Persistent per-pattern counters maintained from an append-only log."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a counter store.
+
+        :param path: SQLite file holding the counters
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            for table in ("log_state", "pattern_counters", "pattern_rows", "pattern_buckets"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "PatternCounterStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _state(self) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT columns, byte_offset, rows_applied, head_sha256, tail_sha256 FROM log_state"
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("columns", "byte_offset", "rows_applied", "head_sha256", "tail_sha256"), row))
+
+    def _fingerprint(self, log_path: Path, offset: int) -> Tuple[str, str]:
+        return (
+            _sha256_range(log_path, 0, min(offset, FINGERPRINT_BYTES)),
+            _sha256_range(log_path, max(0, offset - FINGERPRINT_BYTES), offset),
+        )
+
+    def _reset(self) -> None:
+        with self.conn:
+            for table in ("log_state", "pattern_counters", "pattern_rows", "pattern_buckets"):
+                self.conn.execute(f"DELETE FROM {table}")
+
+    def update(self, evaluation_log_path: str, chunk_rows: int = UPDATE_CHUNK_ROWS) -> Dict[str, Any]:
+        """
+        Apply rows appended to the evaluation log since the last update.
+
+        :param evaluation_log_path: Path to evaluation log CSV file
+        :param chunk_rows: Rows parsed per batch
+        :return: Dictionary with rows_applied, corrections and rebuilt
+        :raises FileNotFoundError: If evaluation log file doesn't exist
+        :raises ValueError: If the log is missing required columns
+        """
+        log_path = Path(evaluation_log_path)
+        if not log_path.exists():
+            raise FileNotFoundError(f"Evaluation log not found: {evaluation_log_path}")
+
+        columns = list(pd.read_csv(log_path, nrows=0).columns)
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        state = self._state()
+        size = log_path.stat().st_size
+        rebuilt = state is None or (
+            state["columns"] != ",".join(columns)
+            or size < state["byte_offset"]
+            or self._fingerprint(log_path, state["byte_offset"]) != (state["head_sha256"], state["tail_sha256"])
+        )
+        if rebuilt:
+            if state is not None:
+                logger.warning(f"{log_path} was rewritten, rebuilding pattern counters")
+            self._reset()
+            state = {"byte_offset": 0, "rows_applied": 0}
+
+        offset, rows_applied = state["byte_offset"], state["rows_applied"]
+        end, lines = _complete_lines_end(log_path, offset)
+        data_lines = lines - 1 if offset == 0 else lines
+        id_column = next((c for c in ROW_ID_COLUMNS if c in columns), None)
+        dimension_dtypes = {column: str for column, _, _ in PATTERN_DIMENSIONS if column in columns}
+
+        stats = {"rows_applied": 0, "corrections": 0, "rebuilt": rebuilt}
+        if data_lines > 0:
+            with open(log_path, "rb") as f:
+                f.seek(offset)
+                reader = pd.read_csv(
+                    f,
+                    header=0 if offset == 0 else None,
+                    names=None if offset == 0 else columns,
+                    nrows=data_lines,
+                    chunksize=chunk_rows,
+                    dtype=dimension_dtypes,
+                )
+                for chunk in reader:
+                    contributions = row_contributions(chunk, id_column, rows_applied)
+                    stats["corrections"] += self._apply(contributions)
+                    rows_applied += len(chunk)
+                    stats["rows_applied"] += len(chunk)
+
+        head, tail = self._fingerprint(log_path, end)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO log_state VALUES (1, ?, ?, ?, ?, ?)",
+                (",".join(columns), end, rows_applied, head, tail),
+            )
+
+        logger.info(
+            f"Pattern counters updated: {stats['rows_applied']} rows applied, "
+            f"{stats['corrections']} corrections{' (rebuilt)' if rebuilt else ''}"
+        )
+        return stats
+
+    def _apply(self, rows: pd.DataFrame) -> int:
+        """Replace earlier contributions of known rows and add the new ones."""
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (row_id TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM incoming")
+            self.conn.executemany("INSERT INTO incoming VALUES (?)", ((r,) for r in rows["row_id"]))
+            previous = pd.read_sql_query(
+                "SELECT p.row_id, p.row_index, p.pattern_key, p.counted, p.is_correct, p.confidence, p.bucket "
+                "FROM pattern_rows p JOIN incoming USING (row_id)",
+                self.conn,
+            )
+
+            if len(previous):
+                removed = previous[previous["counted"] == 1].groupby("pattern_key").agg(
+                    correct=("is_correct", "sum"), total=("counted", "sum"), confidence_sum=("confidence", "sum")
+                )
+                self.conn.executemany(
+                    "UPDATE pattern_counters SET correct = correct - ?, total = total - ?, "
+                    "confidence_sum = confidence_sum - ? WHERE pattern_key = ?",
+                    [
+                        (int(r.correct), int(r.total), float(r.confidence_sum), key)
+                        for key, r in removed.iterrows()
+                    ],
+                )
+                self._add_buckets(previous, sign=-1)
+                # Corrected rows keep their original position in the log
+                original_index = dict(zip(previous["row_id"], previous["row_index"]))
+                rows = rows.assign(row_index=[original_index.get(r, i) for r, i in zip(rows["row_id"], rows["row_index"])])
+
+            counted = rows[rows["counted"] == 1]
+            added = counted.groupby(["pattern_key", "predicted_outcome", "btts_flag", "template_name"]).agg(
+                correct=("is_correct", "sum"),
+                total=("counted", "sum"),
+                confidence_sum=("confidence", "sum"),
+                first_seen=("seen", "min"),
+                last_seen=("seen", "max"),
+            ).reset_index()
+            self.conn.executemany(
+                """
+                INSERT INTO pattern_counters VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (pattern_key) DO UPDATE SET
+                    correct = correct + excluded.correct,
+                    total = total + excluded.total,
+                    confidence_sum = confidence_sum + excluded.confidence_sum,
+                    first_seen = CASE WHEN first_seen IS NULL OR excluded.first_seen < first_seen
+                        THEN excluded.first_seen ELSE first_seen END,
+                    last_seen = CASE WHEN last_seen IS NULL OR excluded.last_seen > last_seen
+                        THEN excluded.last_seen ELSE last_seen END
+                """,
+                [
+                    (
+                        r.pattern_key, r.predicted_outcome, r.btts_flag, r.template_name,
+                        int(r.correct), int(r.total), float(r.confidence_sum),
+                        None if pd.isna(r.first_seen) else r.first_seen,
+                        None if pd.isna(r.last_seen) else r.last_seen,
+                    )
+                    for r in added.itertuples(index=False)
+                ],
+            )
+            self._add_buckets(rows, sign=1)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pattern_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (*values, None if pd.isna(bucket) else int(bucket))
+                    for *values, bucket in rows[[
+                        "row_id", "row_index", "pattern_key", "counted", "is_correct", "confidence",
+                        "date", "teams", "bucket",
+                    ]].itertuples(index=False, name=None)
+                ),
+            )
+        return len(previous)
+
+    def _add_buckets(self, rows: pd.DataFrame, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) rows' counts in their time buckets."""
+        timed = rows[(rows["counted"] == 1) & rows["bucket"].notna()]
+        buckets = timed.groupby(["pattern_key", "bucket"]).agg(
+            correct=("is_correct", "sum"), total=("counted", "sum")
+        )
+        self.conn.executemany(
+            """
+            INSERT INTO pattern_buckets VALUES (?, ?, ?, ?)
+            ON CONFLICT (pattern_key, bucket) DO UPDATE SET
+                correct = correct + excluded.correct,
+                total = total + excluded.total
+            """,
+            [
+                (key, int(bucket), sign * int(r.correct), sign * int(r.total))
+                for (key, bucket), r in buckets.iterrows()
+            ],
+        )
+        if sign < 0:
+            self.conn.execute("DELETE FROM pattern_buckets WHERE total <= 0")
+
+    def counters(self) -> pd.DataFrame:
+        """Return the current counters of every pattern seen."""
+        return pd.read_sql_query("SELECT * FROM pattern_counters WHERE total > 0", self.conn)
+
+    def find_rare_patterns(
+        self,
+        frequency_threshold: float = 0.05,
+        accuracy_threshold: float = 0.80,
+        min_sample_size: int = 5,
+        decay_rate: Optional[float] = None,
+        window_days: Optional[float] = None,
+        now: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Filter the current counters for rare but reliable patterns.
+
+        With ``decay_rate`` or ``window_days`` the statistics are weighted by
+        age from the hourly buckets (see ``find_temporal_patterns``) and each
+        pattern's expiry is derived from its data.
+
+        :param frequency_threshold: Maximum occurrence frequency (default 5%)
+        :param accuracy_threshold: Minimum accuracy threshold (default 80%)
+        :param min_sample_size: Minimum sample size for statistical reliability
+        :param decay_rate: Exponential decay per day
+        :param window_days: Sliding window length in days
+        :param now: Evaluation time for decay/window (default: current UTC time)
+        :return: List of high-value pattern dictionaries
+        """
+        if decay_rate is None and window_days is None:
+            qualifying = self._qualifying_counters(frequency_threshold, accuracy_threshold, min_sample_size)
+            cutoff = None
+        else:
+            validate_temporal_mode(decay_rate, window_days)
+            now = now or datetime.now(timezone.utc)
+            cutoff = (
+                int(now.timestamp() - window_days * SECONDS_PER_DAY) // BUCKET_SECONDS * BUCKET_SECONDS
+                if window_days is not None
+                else None
+            )
+            qualifying = self._qualifying_buckets(
+                frequency_threshold, accuracy_threshold, min_sample_size, decay_rate, window_days, now, cutoff
+            )
+
+        result = []
+        for pattern_key, frequency, accuracy, sample_size, expires_at in qualifying:
+            predicted_outcome, btts_flag, template_name = self.conn.execute(
+                "SELECT predicted_outcome, btts_flag, template_name FROM pattern_counters WHERE pattern_key = ?",
+                (pattern_key,),
+            ).fetchone()
+            matches = self.conn.execute(
+                "SELECT row_index, date, teams FROM pattern_rows "
+                "WHERE pattern_key = ? AND counted = 1 AND (? IS NULL OR bucket >= ?) "
+                "ORDER BY row_index LIMIT ?",
+                (pattern_key, cutoff, cutoff, MAX_SUPPORTING_MATCHES),
+            ).fetchall()
+            result.append(build_pattern_insight(
+                pattern_key,
+                build_label(predicted_outcome, btts_flag, template_name) or pattern_key,
+                frequency=frequency,
+                accuracy=accuracy,
+                sample_size=sample_size,
+                supporting_matches=[
+                    {"match_id": int(row_index), "date": date, "teams": teams}
+                    for row_index, date, teams in matches
+                ],
+                expires_at=expires_at,
+            ))
+
+        return sort_patterns(result)
+
+    def _qualifying_counters(
+        self, frequency_threshold: float, accuracy_threshold: float, min_sample_size: int
+    ) -> List[Tuple[str, float, float, int, None]]:
+        (total_predictions,) = self.conn.execute(
+            "SELECT COALESCE(SUM(total), 0) FROM pattern_counters"
+        ).fetchone()
+        if not total_predictions:
+            return []
+
+        rows = self.conn.execute(
+            """
+            SELECT pattern_key, correct, total
+            FROM pattern_counters
+            WHERE total >= ? AND total > 0
+              AND CAST(total AS REAL) / ? < ?
+              AND CAST(correct AS REAL) / total >= ?
+            """,
+            (max(min_sample_size, 1), total_predictions, frequency_threshold, accuracy_threshold),
+        ).fetchall()
+        return [
+            (pattern_key, total / total_predictions, correct / total, int(total), None)
+            for pattern_key, correct, total in rows
+        ]
+
+    def _qualifying_buckets(
+        self,
+        frequency_threshold: float,
+        accuracy_threshold: float,
+        min_sample_size: int,
+        decay_rate: Optional[float],
+        window_days: Optional[float],
+        now: datetime,
+        cutoff: Optional[int],
+    ) -> List[Tuple[str, float, float, int, datetime]]:
+        buckets = pd.read_sql_query(
+            "SELECT pattern_key, bucket, correct, total FROM pattern_buckets WHERE ? IS NULL OR bucket >= ?",
+            self.conn,
+            params=(cutoff, cutoff),
+        )
+        if buckets.empty:
+            return []
+
+        groups, pattern_keys = pd.factorize(buckets["pattern_key"])
+        stats, _ = temporal_statistics(
+            groups, len(pattern_keys), buckets["bucket"].to_numpy(dtype=float),
+            buckets["total"].to_numpy(dtype=float), buckets["correct"].to_numpy(dtype=float), now,
+            frequency_threshold, accuracy_threshold, min_sample_size, decay_rate, window_days,
+        )
+        return [
+            (pattern_keys[i], float(row.frequency), float(row.accuracy), int(row.sample_size), row.expires_at)
+            for i, row in zip(stats.index, stats.itertuples())
+        ]
+
+
+def find_rare_patterns_incremental(
+    evaluation_log_path: str,
+    state_path: str,
+    frequency_threshold: float = 0.05,
+    accuracy_threshold: float = 0.80,
+    min_sample_size: int = 5,
+    decay_rate: Optional[float] = None,
+    window_days: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Update the counter store from the log's appended rows, then filter it.
+
+    :param evaluation_log_path: Path to evaluation log CSV file
+    :param state_path: SQLite counter store
+    :param frequency_threshold: Maximum occurrence frequency (default 5%)
+    :param accuracy_threshold: Minimum accuracy threshold (default 80%)
+    :param min_sample_size: Minimum sample size for statistical reliability
+    :param decay_rate: Exponential decay per day
+    :param window_days: Sliding window length in days
+    :return: List of high-value pattern dictionaries
+    """
+    with PatternCounterStore(state_path) as store:
+        store.update(evaluation_log_path)
+        return store.find_rare_patterns(
+            frequency_threshold, accuracy_threshold, min_sample_size, decay_rate, window_days
+        )
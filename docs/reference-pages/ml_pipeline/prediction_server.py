@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Prediction Server - resident inference service with micro-batching
+
+Models named in model_config.yaml and model_registry.json are loaded once and
+kept in a bounded LRU cache. Concurrent requests for the same model are
+coalesced into a single predict_proba call. The server speaks a minimal
+HTTP/1.1 JSON protocol over TCP or a Unix socket:
+
+- POST /predict  {"features": {...}, "model_id": optional, "fixture_id": optional}
+- POST /reload   warm reload of configuration, registry and models
+- GET  /health   resident models and active model id
+- GET  /stats    per-model routing counters and shadow evaluation counters
+
+Requests that carry a ``fixture_id`` but no explicit ``model_id`` are assigned
+by the registry traffic split (see model_router.py). Every answered request is
+also handed to the shadow evaluator (see shadow_evaluator.py), which scores
+shadow models in the background without delaying the response.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    MICRO_BATCH_MAX_SIZE,
+    MICRO_BATCH_MAX_WAIT_MS,
+    MODEL_CACHE_MAX_BYTES,
+    MODEL_CACHE_SIZE,
+    MODEL_CONFIG_PATH,
+    MODEL_REGISTRY_PATH,
+    PREDICTION_SERVER_HOST,
+    PREDICTION_SERVER_PORT,
+    PREDICTION_SERVER_WORKERS,
+)
+from .model_registry import (
+    ModelCache,
+    ModelNotFoundError,
+    build_prediction,
+    load_model_config,
+    prefork_workers,
+    serving_model_ids,
+)
+from .model_router import RoutingError, TrafficRouter
+from .shadow_evaluator import ShadowEvaluator, shadow_model_ids
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+# A prediction request is one feature row; anything far larger is malformed
+MAX_REQUEST_BODY_BYTES = 1024 * 1024
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests for one model into one predict_proba call"""
+
+    def __init__(
+        self,
+        model_cache: ModelCache,
+        model_id: str,
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+        max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            model_cache: Cache the model is resolved from on every batch
+            model_id: Model served by this batcher
+            max_batch_size: Maximum rows per predict_proba call
+            max_wait_ms: Maximum time the first request waits for companions
+        """
+        self.model_cache = model_cache
+        self.model_id = model_id
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, vector: np.ndarray) -> Tuple[List[Any], np.ndarray]:
+        """
+        Queue a feature vector and wait for its batch to be scored
+
+        Args:
+            vector: 1-D feature vector in model order
+
+        Returns:
+            Tuple of (model classes, probability row)
+        """
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((vector, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for one request, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    def _score(self, X: np.ndarray) -> Tuple[List[Any], np.ndarray]:
+        model = self.model_cache.get(self.model_id)
+        return list(model.classes_), np.asarray(model.predict_proba(X))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            X = np.vstack([vector for vector, _ in batch])
+
+            try:
+                classes, probabilities = await loop.run_in_executor(None, self._score, X)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for row, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result((classes, probabilities[row]))
+
+    def close(self) -> None:
+        """Stop the background worker"""
+        if self._worker is not None:
+            self._worker.cancel()
+
+
+class PredictionServer:
+    """Long-running inference service backed by a resident model cache"""
+
+    def __init__(
+        self,
+        config_path: Path = MODEL_CONFIG_PATH,
+        registry_path: Path = MODEL_REGISTRY_PATH,
+        cache_size: int = MODEL_CACHE_SIZE,
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+        max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+        cache_max_bytes: int = MODEL_CACHE_MAX_BYTES,
+    ):
+        """
+        Initialize the server
+
+        Args:
+            config_path: Path to model_config.yaml
+            registry_path: Path to model_registry.json
+            cache_size: Maximum number of resident models
+            max_batch_size: Maximum rows per predict_proba call
+            max_wait_ms: Micro-batching wait window in milliseconds
+            cache_max_bytes: Memory budget for resident models
+        """
+        self.config_path = config_path
+        self.model_cache = ModelCache(
+            max_size=cache_size,
+            registry_path=registry_path,
+            max_bytes=cache_max_bytes,
+        )
+        self.active_model_id: Optional[str] = None
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self.reload_config()
+        self.router: Optional[TrafficRouter] = None
+        self.refresh_router()
+        self.shadow = ShadowEvaluator(self.model_cache)
+
+    def reload_config(self) -> None:
+        """Re-read model_config.yaml and the feature order it defines"""
+        self.config = load_model_config(self.config_path)
+        inference = self.config["inference"]
+        if self.active_model_id is not None:
+            self.model_cache.unpin(self.active_model_id)
+        self.active_model_id = inference["active_model_id"]
+        self.model_cache.pin(self.active_model_id)
+        self.features = list(inference["input_features"])
+
+    def refresh_router(self) -> None:
+        """Rebuild the traffic split from the current registry"""
+        try:
+            if self.router is None:
+                self.router = TrafficRouter(self.model_cache, self.features)
+            else:
+                self.router.features = self.features
+                self.router.refresh()
+        except RoutingError as e:
+            logger.warning(f"Traffic routing disabled: {e}")
+            self.router = None
+
+    def resident_model_ids(self) -> List[str]:
+        """Return the serving and shadow models that should stay loaded"""
+        return serving_model_ids(self.config, self.model_cache.registry) + self.shadow.model_ids
+
+    def preload(self) -> List[str]:
+        """Load every serving model before accepting traffic"""
+        model_ids = self.resident_model_ids()
+        loaded = self.model_cache.preload(model_ids)
+        logger.info(f"Preloaded {len(loaded)}/{len(model_ids)} models: {loaded}")
+        return loaded
+
+    async def reload(self) -> List[str]:
+        """Warm reload configuration, registry and models without dropping requests"""
+        def _reload() -> List[str]:
+            self.reload_config()
+            model_ids = serving_model_ids(self.config, self.model_cache.registry)
+            model_ids += [m for m in self.model_cache.cached_ids() if m not in model_ids]
+            reloaded = self.model_cache.reload(model_ids)
+            self.refresh_router()
+            self.shadow.model_ids = shadow_model_ids(self.model_cache.registry)
+            return reloaded
+
+        return await asyncio.get_running_loop().run_in_executor(None, _reload)
+
+    def vectorize(self, feature_values: Dict[str, Any]) -> np.ndarray:
+        """
+        Build a feature vector in configured order
+
+        Raises:
+            ValueError: If a feature is missing or not numeric
+        """
+        vector = np.empty(len(self.features), dtype=np.float64)
+        for idx, feature in enumerate(self.features):
+            if feature not in feature_values:
+                raise ValueError(f"Missing value for feature: {feature}")
+            vector[idx] = feature_values[feature]
+        return vector
+
+    async def predict(
+        self,
+        feature_values: Dict[str, Any],
+        model_id: Optional[str] = None,
+        fixture_id: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Score a single fixture
+
+        Args:
+            feature_values: Mapping of feature name to value
+            model_id: Model to use (default: traffic split, then active_model_id)
+            fixture_id: Fixture identifier used for traffic assignment
+
+        Returns:
+            Prediction with label, its probability and the full distribution
+        """
+        router = self.router if model_id is None and fixture_id is not None else None
+        if router is not None:
+            model_id = router.assign(fixture_id)
+        model_id = model_id or self.active_model_id
+        vector = self.vectorize(feature_values)
+
+        batcher = self._batchers.get(model_id)
+        if batcher is None:
+            batcher = MicroBatcher(self.model_cache, model_id, self.max_batch_size, self.max_wait_ms)
+            self._batchers[model_id] = batcher
+
+        start = time.perf_counter()
+        try:
+            classes, probabilities = await batcher.submit(vector)
+        except Exception:
+            if router is not None:
+                router.record(model_id, time.perf_counter() - start, error=True)
+            raise
+        if router is not None:
+            router.record(model_id, time.perf_counter() - start)
+
+        result = build_prediction(model_id, classes, probabilities)
+        if fixture_id is not None:
+            result["fixture_id"] = fixture_id
+
+        self.shadow.submit(vector, result, fixture_id)
+        return result
+
+    async def handle_request(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """
+        Route a request
+
+        Returns:
+            Tuple of (HTTP status, JSON payload)
+        """
+        try:
+            if method == "GET" and path == "/health":
+                return 200, {
+                    "status": "ok",
+                    "active_model_id": self.active_model_id,
+                    "models": self.model_cache.cached_ids(),
+                }
+
+            if method == "POST" and path == "/predict":
+                payload = json.loads(body or b"{}")
+                if not isinstance(payload, dict):
+                    raise ValueError("Request body must be a JSON object")
+                result = await self.predict(
+                    payload.get("features", {}),
+                    model_id=payload.get("model_id"),
+                    fixture_id=payload.get("fixture_id"),
+                )
+                return 200, result
+
+            if method == "GET" and path == "/stats":
+                return 200, {
+                    "models": self.router.stats() if self.router else {},
+                    "shadow": self.shadow.stats(),
+                    "cache": self.model_cache.metrics(),
+                }
+
+            if method == "POST" and path == "/reload":
+                return 200, {"status": "reloaded", "models": await self.reload()}
+
+            return 404, {"error": f"Unknown endpoint: {method} {path}"}
+
+        except ModelNotFoundError as e:
+            return 404, {"error": str(e)}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Request failed: {e}", exc_info=True)
+            return 500, {"error": str(e)}
+
+    @staticmethod
+    async def _write_response(
+        writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool
+    ) -> None:
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+            + data
+        )
+        await writer.drain()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on a keep-alive connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                content_length = headers.get("content-length", "0")
+                if not content_length.isdigit() or int(content_length) > MAX_REQUEST_BODY_BYTES:
+                    # The body can't be delimited, so the connection can't be reused
+                    await self._write_response(
+                        writer, 400, {"error": f"Invalid Content-Length: {content_length!r}"}, False
+                    )
+                    break
+
+                body = await reader.readexactly(int(content_length))
+                status, payload = await self.handle_request(method, path, body)
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._write_response(writer, status, payload, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        host: str = PREDICTION_SERVER_HOST,
+        port: int = PREDICTION_SERVER_PORT,
+        unix_socket: Optional[str] = None,
+        sock: Optional[socket.socket] = None,
+    ) -> None:
+        """
+        Accept connections until cancelled
+
+        Args:
+            host: TCP host to bind
+            port: TCP port to bind
+            unix_socket: Bind a Unix socket at this path instead of TCP
+            sock: Already-listening socket shared with sibling worker processes
+        """
+        if sock is not None and sock.family == socket.AF_UNIX:
+            server = await asyncio.start_unix_server(self._handle_connection, sock=sock)
+            logger.info(f"Prediction worker listening on unix:{sock.getsockname()}")
+        elif sock is not None:
+            server = await asyncio.start_server(self._handle_connection, sock=sock)
+            logger.info(f"Prediction worker listening on {sock.getsockname()}")
+        elif unix_socket:
+            server = await asyncio.start_unix_server(self._handle_connection, path=unix_socket)
+            logger.info(f"Prediction server listening on unix:{unix_socket}")
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port)
+            logger.info(f"Prediction server listening on http://{host}:{port}")
+
+        self.shadow.start()
+
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, lambda: loop.create_task(self.reload()))
+        except (NotImplementedError, AttributeError):
+            pass
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for batcher in self._batchers.values():
+                batcher.close()
+            self.shadow.stop()
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Resident prediction server")
+    parser.add_argument("--config", type=str, default=str(MODEL_CONFIG_PATH), help="Path to model_config.yaml")
+    parser.add_argument("--registry", type=str, default=str(MODEL_REGISTRY_PATH), help="Path to model_registry.json")
+    parser.add_argument("--host", type=str, default=PREDICTION_SERVER_HOST, help="TCP host to bind")
+    parser.add_argument("--port", type=int, default=PREDICTION_SERVER_PORT, help="TCP port to bind")
+    parser.add_argument("--unix-socket", type=str, default=None, help="Serve on a Unix socket instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=MODEL_CACHE_SIZE, help="Maximum resident models")
+    parser.add_argument("--max-batch-size", type=int, default=MICRO_BATCH_MAX_SIZE, help="Maximum rows per batch")
+    parser.add_argument("--max-wait-ms", type=float, default=MICRO_BATCH_MAX_WAIT_MS, help="Micro-batching window")
+    parser.add_argument("--cache-max-bytes", type=int, default=MODEL_CACHE_MAX_BYTES, help="Model cache memory budget")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=PREDICTION_SERVER_WORKERS,
+        help="Worker processes forked after models are loaded",
+    )
+    return parser.parse_args()
+
+
+def bind_socket(host: str, port: int, unix_socket: Optional[str] = None) -> socket.socket:
+    """Create the listening socket shared by pre-forked workers"""
+    if unix_socket:
+        Path(unix_socket).unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(unix_socket)
+        sock.listen(1024)
+        return sock
+    return socket.create_server((host, port), backlog=1024)
+
+
+def _serve_worker(server: PredictionServer, sock: socket.socket) -> None:
+    """Entry point of a pre-forked worker process"""
+    try:
+        asyncio.run(server.serve(sock=sock))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    """Main entry point for the prediction server"""
+    args = parse_arguments()
+
+    try:
+        server = PredictionServer(
+            config_path=Path(args.config),
+            registry_path=Path(args.registry),
+            cache_size=args.cache_size,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms,
+            cache_max_bytes=args.cache_max_bytes,
+        )
+
+        if args.workers <= 1:
+            server.preload()
+            asyncio.run(server.serve(args.host, args.port, args.unix_socket))
+            return 0
+
+        # Load models once in the parent so forked workers share them copy-on-write
+        sock = bind_socket(args.host, args.port, args.unix_socket)
+        processes = prefork_workers(
+            server.model_cache,
+            server.resident_model_ids(),
+            args.workers,
+            _serve_worker,
+            server,
+            sock,
+        )
+        logger.info(f"Cache after preload: {server.model_cache.metrics()}")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+        return 0
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        logger.error(f"Prediction server failed: {e}", exc_info=True)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,32 +15,212 @@ Key Responsibilities:
 """
 
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 
 try:
+    import numpy as np
     import pandas as pd
 except ImportError:
     print("ERROR: pandas is required. Install via: pip install pandas")
     sys.exit(1)
 
+from ml_pipeline.shadow_rows import SHADOW_MODEL_COLUMN, drop_shadow_predictions, is_shadow_prediction
+
+# Supporting matches attached to each pattern
+MAX_SUPPORTING_MATCHES = 10
+
+# Discovery options the CLIs cannot honour together (each mode takes its own path)
+INCOMPATIBLE_DISCOVER_OPTIONS = (
+    ("attributes", "state"),
+    ("attributes", "decay_rate"),
+    ("attributes", "window_days"),
+    ("attributes", "partition_by"),
+    ("state", "partition_by"),
+    ("decay_rate", "partition_by"),
+    ("window_days", "partition_by"),
+    ("sweep", "attributes"),
+    ("sweep", "state"),
+    ("sweep", "partition_by"),
+    ("sweep", "decay_rate"),
+    ("sweep", "window_days"),
+)
+# Discovery options that only apply together with another option
+DISCOVER_OPTION_REQUIREMENTS = (
+    ("max_length", "attributes"),
+    ("time_budget", "attributes"),
+)
+
+# Pattern dimensions: (column, value when the column is absent, fill for nulls)
+PATTERN_DIMENSIONS = (
+    ("predicted_result", "unknown", None),
+    ("btts_prediction", "NA", None),
+    ("template_name", "NONE", "NONE"),
+)
+
+
+def encode_dimension(
+    df: "pd.DataFrame",
+    column: str,
+    missing: str,
+    fill_na: Optional[str] = None,
+) -> Tuple["np.ndarray", List[str]]:
+    """
+    Factorize one pattern dimension into integer codes.
 
-def find_rare_patterns(
-    evaluation_log_path: str,
-    frequency_threshold: float = 0.05,
-    accuracy_threshold: float = 0.80,
-    min_sample_size: int = 5,
-) -> List[Dict[str, Any]]:
+    :param df: Evaluation log
+    :param column: Column holding the dimension
+    :param missing: Single value used when the column is absent
+    :param fill_na: Replacement for nulls (None keeps them as "nan")
+    :return: Per-row codes and the display string of each code
     """
-    Identify rare but reliable patterns from prediction evaluation logs.
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=np.int64), [missing]
+
+    values = df[column] if fill_na is None else df[column].fillna(fill_na)
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return codes.astype(np.int64), [str(value) for value in uniques]
+
+
+def pack_codes(codes: List["np.ndarray"], cardinalities: List[int]) -> "np.ndarray":
+    """
+    Combine per-dimension codes into one mixed-radix int64 key.
+
+    :param codes: Per-row codes of each dimension
+    :param cardinalities: Number of distinct values of each dimension
+    :return: Packed per-row keys
+    :raises ValueError: If the key space does not fit in int64
+    """
+    if np.prod(cardinalities, dtype=float) >= 2 ** 63:
+        raise ValueError(f"Pattern key space too large: {cardinalities}")
+
+    packed = np.zeros(len(codes[0]) if codes else 0, dtype=np.int64)
+    for dimension_codes, cardinality in zip(codes, cardinalities):
+        packed = packed * cardinality + dimension_codes
+    return packed
+
+
+def unpack_code(key: int, cardinalities: List[int]) -> List[int]:
+    """Split a packed key back into its per-dimension codes."""
+    codes = []
+    for cardinality in reversed(cardinalities):
+        key, code = divmod(key, cardinality)
+        codes.append(code)
+    return codes[::-1]
+
+
+def encode_patterns(df: "pd.DataFrame") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", Callable[[int], List[str]]]:
+    """
+    Pack each row's pattern dimensions into one integer key.
+
+    :param df: Evaluation log rows
+    :return: Per-row packed keys, distinct keys, each row's index into the
+        distinct keys, and a function mapping a packed key to its
+        (outcome, BTTS flag, template) values
+    """
+    dimensions = [encode_dimension(df, *spec) for spec in PATTERN_DIMENSIONS]
+    cardinalities = [len(values) for _, values in dimensions]
+    packed = pack_codes([codes for codes, _ in dimensions], cardinalities)
+    keys, inverse = np.unique(packed, return_inverse=True)
+
+    def components_of(key: int) -> List[str]:
+        return [values[code] for (_, values), code in zip(dimensions, unpack_code(key, cardinalities))]
+
+    return packed, keys, inverse, components_of
+
+
+def build_label(predicted_outcome: str, btts_flag: str, template_name: str) -> str:
+    """
+    Build the human-readable label of a pattern from its components.
+
+    :param predicted_outcome: Predicted result, e.g. "home_win"
+    :param btts_flag: BTTS prediction ("True"/"False"/"NA")
+    :param template_name: Template name ("NONE" if absent)
+    :return: Label such as "Home Win + BTTS Late Goals"
+    """
+    label_parts = []
+    if predicted_outcome == "home_win":
+        label_parts.append("Home Win")
+    elif predicted_outcome == "away_win":
+        label_parts.append("Away Win")
+    else:
+        label_parts.append(predicted_outcome.replace("_", " ").title())
+
+    if btts_flag != "NA":
+        btts_text = (
+            "+ BTTS"
+            if btts_flag.lower() in ["true", "1"]
+            else "- No BTTS"
+        )
+        label_parts.append(btts_text)
+
+    if template_name != "NONE":
+        label_parts.append(template_name.replace("_", " ").title())
+
+    return " ".join(label_parts)
+
+
+def extract_supporting_matches(
+    df: "pd.DataFrame",
+    pattern_keys: List[Any],
+    limit: int = MAX_SUPPORTING_MATCHES,
+    key_column: str = "pattern_key",
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    Collect the first ``limit`` log rows of each pattern in one grouped pass.
+
+    Rows of the requested patterns are selected once, cut to the first
+    ``limit`` per key in log order and stably sorted by key, so each
+    pattern's matches are a contiguous run. Records are then built from
+    whole columns instead of per-row Series.
+
+    :param df: Evaluation log with a pattern key column
+    :param pattern_keys: Patterns to collect matches for
+    :param limit: Maximum matches per pattern
+    :param key_column: Column holding each row's pattern key
+    :return: Mapping of pattern key to its supporting match entries
+    """
+    matches: Dict[Any, List[Dict[str, Any]]] = {key: [] for key in pattern_keys}
+    if not pattern_keys:
+        return matches
+
+    head = (
+        df[df[key_column].isin(pattern_keys)]
+        .groupby(key_column, sort=False)
+        .head(limit)
+        .sort_values(key_column, kind="stable")
+    )
+
+    n = len(head)
+    match_ids = head.index.astype(int).tolist()
+    dates = (
+        head["timestamp"].astype(str).tolist()
+        if "timestamp" in head.columns
+        else ["N/A"] * n
+    )
+    teams = (
+        (head["team_a"].astype(str) + " vs " + head["team_b"].astype(str)).tolist()
+        if "team_a" in head.columns and "team_b" in head.columns
+        else ["N/A"] * n
+    )
+
+    for key, match_id, date, team in zip(head[key_column].tolist(), match_ids, dates, teams):
+        matches[key].append({"match_id": match_id, "date": date, "teams": team})
+
+    return matches
+
+
+def load_evaluation_log(evaluation_log_path: str, include_shadow: bool = False) -> "pd.DataFrame":
+    """
+    Read and validate an evaluation log, keeping only settled predictions.
 
     :param evaluation_log_path: Path to evaluation log CSV file
-    :param frequency_threshold: Maximum occurrence frequency (default 5%)
-    :param accuracy_threshold: Minimum accuracy threshold (default 80%)
-    :param min_sample_size: Minimum sample size for statistical reliability
-    :return: List of high-value pattern dictionaries
+    :param include_shadow: Keep rows tagged with a shadow model id
+    :return: Evaluation log rows with an actual result
     :raises FileNotFoundError: If evaluation log file doesn't exist
     :raises ValueError: If data is invalid or missing required columns
     """
@@ -62,154 +242,243 @@ def find_rare_patterns(
         raise ValueError(f"Missing required columns: {missing_columns}")
 
     # Handle null values - filter out predictions without actual results
-    df = df.dropna(subset=["actual_result"])
+    return drop_shadow_predictions(df, include_shadow).dropna(subset=["actual_result"])
+
+
+def find_rare_patterns(
+    evaluation_log_path: str,
+    frequency_threshold: float = 0.05,
+    accuracy_threshold: float = 0.80,
+    min_sample_size: int = 5,
+    partition_column: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Identify rare but reliable patterns from prediction evaluation logs.
+
+    :param evaluation_log_path: Path to evaluation log CSV file
+    :param frequency_threshold: Maximum occurrence frequency (default 5%)
+    :param accuracy_threshold: Minimum accuracy threshold (default 80%)
+    :param min_sample_size: Minimum sample size for statistical reliability
+    :param partition_column: Find patterns separately within each value of
+        this column (e.g. league or model_version); frequencies stay relative
+        to the whole log
+    :param workers: Processes mining partitions (None = all cores, 1 = in-process)
+    :return: List of high-value pattern dictionaries
+    :raises FileNotFoundError: If evaluation log file doesn't exist
+    :raises ValueError: If data is invalid or missing required columns
+    """
+    df = load_evaluation_log(evaluation_log_path)
 
     if len(df) == 0:
         return []
 
-    # Create is_correct column
-    df["is_correct"] = df["predicted_result"] == df["actual_result"]
+    thresholds = (frequency_threshold, accuracy_threshold, min_sample_size)
+    if partition_column is not None:
+        return sort_patterns(find_partitioned_patterns(df, partition_column, thresholds, workers))
 
-    # Optional columns with defaults
-    btts_col = "btts_prediction" if "btts_prediction" in df.columns else None
-    template_col = "template_name" if "template_name" in df.columns else None
-    outcome_col = "predicted_result"  # Always present
+    return sort_patterns(rare_patterns_in_frame(df, len(df), *thresholds))
 
-    # Build pattern signature combining predicted outcome, BTTS, and template
-    pattern_parts = [df[outcome_col].astype(str)]
 
-    if btts_col:
-        pattern_parts.append(df[btts_col].astype(str))
-    else:
-        pattern_parts.append(pd.Series(["NA"] * len(df)))
+def rare_patterns_in_frame(
+    df: "pd.DataFrame",
+    total_predictions: int,
+    frequency_threshold: float,
+    accuracy_threshold: float,
+    min_sample_size: int,
+    key_prefix: str = "",
+    label_suffix: str = "",
+) -> List[Dict[str, Any]]:
+    """
+    Find qualifying patterns among evaluated predictions.
 
-    if template_col:
-        pattern_parts.append(df[template_col].fillna("NONE").astype(str))
-    else:
-        pattern_parts.append(pd.Series(["NONE"] * len(df)))
+    :param df: Evaluated predictions
+    :param total_predictions: Predictions frequencies are relative to
+    :param frequency_threshold: Maximum occurrence frequency
+    :param accuracy_threshold: Minimum accuracy threshold
+    :param min_sample_size: Minimum sample size for statistical reliability
+    :param key_prefix: Prepended to every pattern key
+    :param label_suffix: Appended to every label
+    :return: Unsorted list of pattern dictionaries
+    """
+    is_correct = (df["predicted_result"] == df["actual_result"]).to_numpy()
+
+    packed, keys, inverse, components_of = encode_patterns(df)
 
-    df["pattern_key"] = (
-        pattern_parts[0] + "_" + pattern_parts[1] + "_" + pattern_parts[2]
+    # Aggregate statistics by packed key
+    total_count = np.bincount(inverse, minlength=len(keys))
+    correct_count = np.bincount(inverse, weights=is_correct, minlength=len(keys))
+    accuracy = correct_count / total_count
+    frequency = total_count / total_predictions
+
+    # Apply filters
+    qualifying = np.flatnonzero(
+        (frequency < frequency_threshold)
+        & (accuracy >= accuracy_threshold)
+        & (total_count >= min_sample_size)
     )
 
-    total_predictions = len(df)
+    # Get supporting matches for all qualifying patterns in one pass
+    df = df.assign(pattern_code=packed)
+    supporting = extract_supporting_matches(
+        df, keys[qualifying].tolist(), key_column="pattern_code"
+    )
 
-    # Aggregate statistics by pattern
-    pattern_stats = (
-        df.groupby("pattern_key")
-        .agg(
-            {
-                "is_correct": ["sum", "count", "mean"],
-                "confidence": "mean",
-            }
-        )
-        .reset_index()
+    # Build keys, labels and output only for qualifying patterns
+    result = []
+    for i in qualifying:
+        components = components_of(int(keys[i]))
+        pattern_key = "_".join(components)
+        label = build_label(*components) or pattern_key
+
+        result.append(build_pattern_insight(
+            key_prefix + pattern_key,
+            label + label_suffix,
+            frequency=float(frequency[i]),
+            accuracy=float(accuracy[i]),
+            sample_size=int(total_count[i]),
+            supporting_matches=supporting[int(keys[i])],
+        ))
+
+    return result
+
+
+def _mine_partition(job: Tuple[str, str, "pd.DataFrame", int, Tuple[float, float, int]]) -> List[Dict[str, Any]]:
+    """Find the patterns of one partition (runs in a worker process)."""
+    column, value, frame, total_predictions, thresholds = job
+    return rare_patterns_in_frame(
+        frame,
+        total_predictions,
+        *thresholds,
+        key_prefix=f"{column}={value}|",
+        label_suffix=f" {column.replace('_', ' ').title()}: {value}",
     )
 
-    pattern_stats.columns = [
-        "pattern_key",
-        "correct_count",
-        "total_count",
-        "accuracy",
-        "avg_confidence",
+
+def find_partitioned_patterns(
+    df: "pd.DataFrame",
+    partition_column: str,
+    thresholds: Tuple[float, float, int],
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Find patterns within each partition of the log in a process pool.
+
+    Pattern keys are prefixed with ``column=value|``. Frequencies are
+    normalized by the size of the whole log, so a threshold means the same
+    in a large league as in a small one; accuracy and sample size are
+    per partition.
+
+    :param df: Evaluated predictions
+    :param partition_column: Column to split the log by
+    :param thresholds: Frequency, accuracy and minimum sample thresholds
+    :param workers: Processes mining partitions (None = all cores, 1 = in-process)
+    :return: Unsorted list of pattern dictionaries from all partitions
+    :raises ValueError: If the partition column is missing
+    """
+    if partition_column not in df.columns:
+        raise ValueError(f"Partition column not found: {partition_column}")
+
+    # Ship workers only the columns pattern discovery reads
+    columns = [
+        column
+        for column in ("predicted_result", "actual_result", "timestamp", "team_a", "team_b")
+        + tuple(spec[0] for spec in PATTERN_DIMENSIONS)
+        if column in df.columns
     ]
+    partitions = df[partition_column].fillna("NA").astype(str)
+    jobs = [
+        (partition_column, value, frame, len(df), thresholds)
+        for value, frame in df[list(dict.fromkeys(columns))].groupby(partitions, sort=False)
+    ]
+    # Largest partitions first so they do not finish last
+    jobs.sort(key=lambda job: len(job[2]), reverse=True)
 
-    # Calculate frequency percentage
-    pattern_stats["frequency"] = pattern_stats["total_count"] / total_predictions
-    pattern_stats["frequency_pct"] = pattern_stats["frequency"] * 100
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        results = [_mine_partition(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_mine_partition, jobs))
 
-    # Apply filters
-    rare_patterns_df = pattern_stats[
-        (pattern_stats["frequency"] < frequency_threshold)
-        & (pattern_stats["accuracy"] >= accuracy_threshold)
-        & (pattern_stats["total_count"] >= min_sample_size)
-    ]
+    return [pattern for patterns in results for pattern in patterns]
 
-    # Build output list with additional context
-    result = []
-    for _, row in rare_patterns_df.iterrows():
-        pattern_key = row["pattern_key"]
-
-        # Get supporting matches for this pattern
-        pattern_matches = df[df["pattern_key"] == pattern_key]
-        supporting_matches = []
-
-        for _, match_row in pattern_matches.iterrows():
-            match_entry = {
-                "match_id": int(match_row.name) if hasattr(match_row, "name") else None,
-                "date": (
-                    str(match_row.get("timestamp", "N/A"))
-                    if "timestamp" in match_row.index
-                    else "N/A"
-                ),
-                "teams": (
-                    f"{match_row.get('team_a', 'Team A')} vs {match_row.get('team_b', 'Team B')}"
-                    if "team_a" in match_row.index and "team_b" in match_row.index
-                    else "N/A"
-                ),
-            }
-            supporting_matches.append(match_entry)
-
-        # Parse pattern key components
-        key_parts = pattern_key.split("_")
-        predicted_outcome = key_parts[0] if len(key_parts) > 0 else "unknown"
-        btts_flag = key_parts[1] if len(key_parts) > 1 else "NA"
-        template_name = "_".join(key_parts[2:]) if len(key_parts) > 2 else "NONE"
-
-        # Build human-readable label
-        label_parts = []
-        if predicted_outcome == "home_win":
-            label_parts.append("Home Win")
-        elif predicted_outcome == "away_win":
-            label_parts.append("Away Win")
-        else:
-            label_parts.append(predicted_outcome.replace("_", " ").title())
 
-        if btts_flag != "NA":
-            btts_text = (
-                "+ BTTS"
-                if btts_flag.lower() in ["true", "1"]
-                else "- No BTTS"
-            )
-            label_parts.append(btts_text)
+def build_pattern_insight(
+    pattern_key: str,
+    label: str,
+    frequency: float,
+    accuracy: float,
+    sample_size: int,
+    supporting_matches: List[Dict[str, Any]],
+    expires_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Build the output record of one qualifying pattern.
+
+    :param pattern_key: Stable pattern identifier
+    :param label: Human-readable label
+    :param frequency: Share of predictions matching the pattern (0-1)
+    :param accuracy: Share of matching predictions that were correct (0-1)
+    :param sample_size: Number of matching predictions
+    :param supporting_matches: Example matches
+    :param expires_at: Expiry time (default: 30 days from now)
+    :return: Pattern dictionary ready for database insertion
+    """
+    # Create highlight text
+    accuracy_pct = accuracy * 100
+    freq_pct = frequency * 100
+    highlight_text = (
+        f"Rare but reliable: {label} pattern found in only {freq_pct:.1f}% "
+        f"of predictions with {accuracy_pct:.1f}% accuracy"
+    )
 
-        if template_name != "NONE":
-            label_parts.append(template_name.replace("_", " ").title())
+    # Calculate expiry (30 days from now unless derived from the data)
+    discovered_at = datetime.now(timezone.utc)
+    if expires_at is None:
+        expires_at = discovered_at + timedelta(days=30)
 
-        label = " ".join(label_parts) if label_parts else pattern_key
+    return {
+        "pattern_key": pattern_key,
+        "label": label,
+        "frequency_pct": round(freq_pct, 2),
+        "accuracy_pct": round(accuracy_pct, 2),
+        "sample_size": sample_size,
+        "supporting_matches": supporting_matches,
+        "discovered_at": discovered_at.isoformat() + "Z",
+        "expires_at": expires_at.isoformat() + "Z",
+        "highlight_text": highlight_text,
+    }
 
-        # Create highlight text
-        accuracy_pct = row["accuracy"] * 100
-        freq_pct = row["frequency_pct"]
-        highlight_text = (
-            f"Rare but reliable: {label} pattern found in only {freq_pct:.1f}% "
-            f"of predictions with {accuracy_pct:.1f}% accuracy"
-        )
 
-        # Calculate expiry (30 days from now)
-        discovered_at = datetime.now(timezone.utc)
-        expires_at = discovered_at + timedelta(days=30)
+def sort_patterns(patterns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort by accuracy descending, then by sample size descending; ties keep key order."""
+    patterns.sort(key=lambda p: p["pattern_key"])
+    patterns.sort(key=lambda p: (p["accuracy_pct"], p["sample_size"]), reverse=True)
+    return patterns
 
-        pattern_insight = {
-            "pattern_key": pattern_key,
-            "label": label,
-            "frequency_pct": round(freq_pct, 2),
-            "accuracy_pct": round(accuracy_pct, 2),
-            "sample_size": int(row["total_count"]),
-            "supporting_matches": supporting_matches[
-                :10
-            ],  # Limit to first 10 matches
-            "discovered_at": discovered_at.isoformat() + "Z",
-            "expires_at": expires_at.isoformat() + "Z",
-            "highlight_text": highlight_text,
-        }
-
-        result.append(pattern_insight)
-
-    # Sort by accuracy descending, then by sample size descending
-    result.sort(key=lambda p: (p["accuracy_pct"], p["sample_size"]), reverse=True)
 
-    return result
+def unsupported_option_combination(options: Dict[str, Any]) -> Optional[str]:
+    """
+    Find discovery options that were given together but cannot be combined.
+
+    :param options: Parsed CLI arguments, e.g. vars(args)
+    :return: Error message naming the first conflicting pair, or None
+    """
+    def given(name: str) -> bool:
+        value = options.get(name)
+        return value is not None and value is not False
+
+    def flag(name: str) -> str:
+        return f"--{name.replace('_', '-')}"
+
+    for first, second in INCOMPATIBLE_DISCOVER_OPTIONS:
+        if given(first) and given(second):
+            return f"{flag(first)} cannot be combined with {flag(second)}"
+    for option, required in DISCOVER_OPTION_REQUIREMENTS:
+        if given(option) and not given(required):
+            return f"{flag(option)} requires {flag(required)}"
+    return None
 
 
 def main():
@@ -221,7 +490,11 @@ def main():
     )
     parser.add_argument(
         "log_file",
-        help="Path to evaluation log CSV file",
+        nargs="+",
+        help=(
+            "Evaluation log(s): CSV (optionally compressed, e.g. .csv.gz), "
+            "Parquet or Arrow files, globs such as 'logs/*.csv.gz', or - for stdin"
+        ),
     )
     parser.add_argument(
         "--frequency-threshold",
@@ -245,16 +518,184 @@ def main():
         "--output",
         help="Output JSON file (default: stdout)",
     )
+    parser.add_argument(
+        "--attributes",
+        help=(
+            "Comma-separated attributes to mine combinations of, e.g. "
+            "league,model_version,confidence_bucket (default: fixed "
+            "outcome/BTTS/template triple)"
+        ),
+    )
+    parser.add_argument(
+        "--max-length",
+        type=int,
+        help="Maximum attributes per mined pattern (default: 3)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for --attributes or --partition-by (default: all cores)",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="Mining time budget in seconds (default: 300)",
+    )
+    parser.add_argument(
+        "--state",
+        help=(
+            "SQLite counter store updated from rows appended since the last "
+            "run (fixed triple only)"
+        ),
+    )
+    parser.add_argument(
+        "--partition-by",
+        help=(
+            "Find patterns separately per value of this column, e.g. league "
+            "or model_version (frequencies stay relative to the whole log)"
+        ),
+    )
+    parser.add_argument(
+        "--decay-rate",
+        type=float,
+        help="Weigh predictions by exp(-rate * age in days) (fixed triple only)",
+    )
+    parser.add_argument(
+        "--window-days",
+        type=float,
+        help="Only count predictions from the last N days (fixed triple only)",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help=(
+            "Report pattern count, coverage and stability for every combination "
+            "of the threshold grids instead of listing patterns (fixed triple "
+            "over the whole log only)"
+        ),
+    )
+    parser.add_argument(
+        "--frequency-grid",
+        default="0.01:0.10:0.01",
+        help="Sweep frequency thresholds, start:stop:step or a comma list (default: 0.01:0.10:0.01)",
+    )
+    parser.add_argument(
+        "--accuracy-grid",
+        default="0.60:0.95:0.05",
+        help="Sweep accuracy thresholds (default: 0.60:0.95:0.05)",
+    )
+    parser.add_argument(
+        "--min-samples-grid",
+        default="3,5,10,20,50",
+        help="Sweep minimum sample sizes (default: 3,5,10,20,50)",
+    )
 
     args = parser.parse_args()
 
-    try:
-        patterns = find_rare_patterns(
-            args.log_file,
-            frequency_threshold=args.frequency_threshold,
-            accuracy_threshold=args.accuracy_threshold,
-            min_sample_size=args.min_samples,
+    conflict = unsupported_option_combination(vars(args))
+    if conflict:
+        parser.error(conflict)
+
+    # One plain CSV supports every mode; other inputs are streamed in chunks
+    log_files = args.log_file
+    streamed = (
+        len(log_files) > 1
+        or log_files[0] == "-"
+        or any(char in log_files[0] for char in "*?[")
+        or Path(log_files[0]).suffix.lower() != ".csv"
+    )
+    if streamed and (
+        args.attributes or args.state or args.partition_by
+        or args.decay_rate is not None or args.window_days is not None
+    ):
+        parser.error(
+            "--attributes, --state, --partition-by, --decay-rate and --window-days "
+            "need a single CSV log"
         )
+    args.log_file = log_files[0]
+
+    try:
+        if args.sweep:
+            from ml_pipeline.log_sources import aggregate_log_sources
+            from ml_pipeline.threshold_sweep import parse_grid, sweep_thresholds
+
+            grid = sweep_thresholds(
+                *aggregate_log_sources(log_files).totals(),
+                frequency_grid=parse_grid(args.frequency_grid),
+                accuracy_grid=parse_grid(args.accuracy_grid),
+                min_samples_grid=parse_grid(args.min_samples_grid, cast=int),
+            ).to_dict(orient="records")
+            output = json.dumps(grid, indent=2)
+
+            if args.output:
+                with open(args.output, "w") as f:
+                    f.write(output)
+                print(f"✅ Evaluated {len(grid)} threshold combinations. Output: {args.output}")
+            else:
+                print(output)
+
+            return 0
+
+        if streamed:
+            from ml_pipeline.log_sources import find_rare_patterns_in_sources
+
+            patterns = find_rare_patterns_in_sources(
+                log_files,
+                frequency_threshold=args.frequency_threshold,
+                accuracy_threshold=args.accuracy_threshold,
+                min_sample_size=args.min_samples,
+            )
+        elif args.attributes:
+            from ml_pipeline.pattern_mining import (
+                DEFAULT_MAX_LENGTH,
+                DEFAULT_TIME_BUDGET_SECONDS,
+                mine_rare_patterns,
+            )
+
+            patterns = mine_rare_patterns(
+                args.log_file,
+                attributes=args.attributes.split(","),
+                frequency_threshold=args.frequency_threshold,
+                accuracy_threshold=args.accuracy_threshold,
+                min_sample_size=args.min_samples,
+                max_length=DEFAULT_MAX_LENGTH if args.max_length is None else args.max_length,
+                workers=args.workers,
+                time_budget_seconds=(
+                    DEFAULT_TIME_BUDGET_SECONDS if args.time_budget is None else args.time_budget
+                ),
+            )
+        elif args.state:
+            from ml_pipeline.pattern_store import find_rare_patterns_incremental
+
+            patterns = find_rare_patterns_incremental(
+                args.log_file,
+                args.state,
+                frequency_threshold=args.frequency_threshold,
+                accuracy_threshold=args.accuracy_threshold,
+                min_sample_size=args.min_samples,
+                decay_rate=args.decay_rate,
+                window_days=args.window_days,
+            )
+        elif args.decay_rate is not None or args.window_days is not None:
+            from ml_pipeline.temporal_patterns import find_temporal_patterns
+
+            patterns = find_temporal_patterns(
+                args.log_file,
+                frequency_threshold=args.frequency_threshold,
+                accuracy_threshold=args.accuracy_threshold,
+                min_sample_size=args.min_samples,
+                decay_rate=args.decay_rate,
+                window_days=args.window_days,
+            )
+        else:
+            patterns = find_rare_patterns(
+                args.log_file,
+                frequency_threshold=args.frequency_threshold,
+                accuracy_threshold=args.accuracy_threshold,
+                min_sample_size=args.min_samples,
+                partition_column=args.partition_by,
+                workers=args.workers,
+            )
 
         output = json.dumps(patterns, indent=2)
 
@@ -0,0 +1,260 @@
+"""
+Reinforcement Daemon - long-running scheduler for the auto reinforcement loop
+
+Instead of cold-starting a process per trigger, the daemon keeps the Supabase
+client, the parsed evaluation log and the serving models in memory. It runs
+the daily retraining at a fixed UTC time, polls the manual request queue
+between runs, refreshes its warm state periodically and drops it when the
+process grows beyond its memory cap.
+
+Freed memory is not always returned to the OS, so after a reset the warm
+state is only reloaded once RSS is back under the cap and a backoff of
+``refresh_interval`` (doubling with every consecutive reset) has passed.
+Until then runs are handed no caches and work cold, downloading and loading
+what they need into memory that is released when they finish.
+"""
+
+import gc
+import logging
+import resource
+import signal
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from .auto_reinforcement import run_auto_reinforcement, run_request_workers
+from .config import (
+    DAEMON_DAILY_RUN_TIME,
+    DAEMON_MEMORY_LIMIT_BYTES,
+    DAEMON_POLL_INTERVAL,
+    DAEMON_REFRESH_INTERVAL,
+    DEFAULT_LOOKBACK_DAYS,
+    RETRAINING_WORKER_POOL_SIZE,
+)
+from .data_loader import EvaluationLogCache
+from .model_registry import SERVING_STATUSES, ModelCache
+from .supabase_client import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+# Cap on the reload backoff after repeated memory resets, in refresh intervals
+MAX_RELOAD_BACKOFF_INTERVALS = 8
+
+
+def parse_daily_time(value: str) -> Dict[str, int]:
+    """
+    Parse an HH:MM run time
+
+    Raises:
+        ValueError: If the value is not a valid time of day
+    """
+    parsed = datetime.strptime(value, "%H:%M")
+    return {"hour": parsed.hour, "minute": parsed.minute}
+
+
+def next_daily_run(now: datetime, daily_run_time: str = DAEMON_DAILY_RUN_TIME) -> datetime:
+    """Return the first scheduled daily run strictly after ``now``"""
+    scheduled = now.replace(second=0, microsecond=0, **parse_daily_time(daily_run_time))
+    return scheduled if scheduled > now else scheduled + timedelta(days=1)
+
+
+def current_rss_bytes() -> int:
+    """Return the process's resident set size"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        # Peak RSS (kilobytes on Linux) where /proc is unavailable
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ReinforcementDaemon:
+    """Scheduler that runs retraining in a warm, long-lived process"""
+
+    def __init__(
+        self,
+        workers: int = RETRAINING_WORKER_POOL_SIZE,
+        daily_run_time: str = DAEMON_DAILY_RUN_TIME,
+        poll_interval: float = DAEMON_POLL_INTERVAL,
+        refresh_interval: float = DAEMON_REFRESH_INTERVAL,
+        memory_limit_bytes: int = DAEMON_MEMORY_LIMIT_BYTES,
+        eval_log_cache: Optional[EvaluationLogCache] = None,
+        model_cache: Optional[ModelCache] = None,
+    ):
+        """
+        Initialize the daemon
+
+        Args:
+            workers: Concurrent runs used to drain manual requests
+            daily_run_time: UTC time of day (HH:MM) of the automatic run
+            poll_interval: Seconds between manual request polls
+            refresh_interval: Seconds between warm state refreshes
+            memory_limit_bytes: RSS above which warm state is dropped
+            eval_log_cache: Warm evaluation log (default: new cache)
+            model_cache: Warm serving models (default: new cache)
+        """
+        parse_daily_time(daily_run_time)
+        self.workers = workers
+        self.daily_run_time = daily_run_time
+        self.poll_interval = poll_interval
+        self.refresh_interval = refresh_interval
+        self.memory_limit_bytes = memory_limit_bytes
+        self.eval_log_cache = eval_log_cache or EvaluationLogCache(max_age_seconds=refresh_interval)
+        # ModelCache defines __len__, so an empty cache is falsy
+        self.model_cache = model_cache if model_cache is not None else ModelCache()
+        self.next_daily_run = next_daily_run(datetime.now(timezone.utc), daily_run_time)
+        self.last_refresh: Optional[float] = None
+        # Set while warm state is dropped: no reload before this monotonic time
+        self.reload_not_before: Optional[float] = None
+        self.consecutive_memory_resets = 0
+        self._stop = threading.Event()
+        self.stats = {"daily_runs": 0, "manual_polls": 0, "failed_runs": 0, "refreshes": 0, "memory_resets": 0}
+
+    def serving_model_ids(self) -> List[str]:
+        """Return the registry models kept warm"""
+        return [e["id"] for e in self.model_cache.registry if e.get("status") in SERVING_STATUSES]
+
+    @property
+    def warm(self) -> bool:
+        """Whether runs may use (and fill) the warm caches"""
+        return self.reload_not_before is None
+
+    def refresh_due(self) -> bool:
+        """
+        Decide whether warm state should be (re)loaded now
+
+        Returns:
+            True on first start, when the refresh interval has elapsed, or
+            after a memory reset once the backoff has passed and RSS is back
+            under the cap
+        """
+        now = time.monotonic()
+        if self.last_refresh is not None:
+            return now - self.last_refresh >= self.refresh_interval
+        if self.reload_not_before is None:
+            return True
+        if now < self.reload_not_before:
+            return False
+
+        rss = current_rss_bytes()
+        if rss > self.memory_limit_bytes:
+            logger.info(f"Daemon RSS {rss / 1024 ** 2:.0f} MiB still over the limit, staying cold")
+            return False
+        return True
+
+    def refresh(self) -> None:
+        """Re-download the evaluation log and reload serving models"""
+        if self.last_refresh is not None:
+            # Warm state lasted a full refresh interval within the memory cap
+            self.consecutive_memory_resets = 0
+
+        try:
+            self.eval_log_cache.refresh(force=True)
+        except Exception as e:
+            logger.warning(f"Evaluation log refresh failed, keeping previous copy: {e}")
+
+        # Reload resident models against the fresh registry, then load new serving models
+        self.model_cache.reload()
+        self.model_cache.preload(self.serving_model_ids())
+        self.last_refresh = time.monotonic()
+        self.reload_not_before = None
+        self.stats["refreshes"] += 1
+
+    def enforce_memory_limit(self) -> bool:
+        """
+        Drop warm state if the process is over its memory cap
+
+        Returns:
+            True if warm state was dropped
+        """
+        if self.last_refresh is None and self.reload_not_before is not None:
+            # Already cold; dropping again would not free anything
+            return False
+
+        rss = current_rss_bytes()
+        if rss <= self.memory_limit_bytes:
+            return False
+
+        logger.warning(
+            f"Daemon RSS {rss / 1024 ** 2:.0f} MiB exceeds limit "
+            f"{self.memory_limit_bytes / 1024 ** 2:.0f} MiB, dropping warm state"
+        )
+        self.eval_log_cache.clear()
+        cache = self.model_cache
+        self.model_cache = ModelCache(cache.max_size, cache.registry_path, cache.max_bytes, cache.require_sha256)
+        gc.collect()
+
+        self.consecutive_memory_resets += 1
+        backoff = self.refresh_interval * min(
+            2 ** (self.consecutive_memory_resets - 1), MAX_RELOAD_BACKOFF_INTERVALS
+        )
+        self.last_refresh = None
+        self.reload_not_before = time.monotonic() + backoff
+        self.stats["memory_resets"] += 1
+        if self.consecutive_memory_resets > 1:
+            logger.warning(
+                f"Warm state dropped {self.consecutive_memory_resets} times in a row; "
+                f"next reload in {backoff:.0f}s. Consider raising DAEMON_MEMORY_LIMIT_BYTES"
+            )
+        return True
+
+    def tick(self, now: Optional[datetime] = None) -> None:
+        """
+        Run one scheduler iteration: refresh, daily run if due, manual requests
+
+        Args:
+            now: Current UTC time (default: wall clock)
+        """
+        now = now or datetime.now(timezone.utc)
+
+        if self.refresh_due():
+            self.refresh()
+
+        # During a reset backoff the caches must not be refilled by runs
+        eval_log_cache = self.eval_log_cache if self.warm else None
+        model_cache = self.model_cache if self.warm else None
+
+        if now >= self.next_daily_run:
+            logger.info("Starting scheduled daily reinforcement run")
+            self.next_daily_run = next_daily_run(now, self.daily_run_time)
+            self.stats["daily_runs"] += 1
+            if not run_auto_reinforcement(
+                lookback_days=DEFAULT_LOOKBACK_DAYS,
+                source="auto_daily",
+                eval_log_cache=eval_log_cache,
+                model_cache=model_cache,
+            ):
+                self.stats["failed_runs"] += 1
+
+        self.stats["manual_polls"] += 1
+        if not run_request_workers(
+            pool_size=self.workers,
+            eval_log_cache=eval_log_cache,
+            model_cache=model_cache,
+        ):
+            self.stats["failed_runs"] += 1
+
+        self.enforce_memory_limit()
+
+    def run(self) -> None:
+        """Run the scheduler loop until stop() is called or SIGTERM/SIGINT is received"""
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: self.stop())
+
+        get_supabase_client()
+        logger.info(f"Reinforcement daemon started, next daily run at {self.next_daily_run.isoformat()}")
+
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Daemon iteration failed: {e}", exc_info=True)
+            self._stop.wait(self.poll_interval)
+
+        logger.info(f"Reinforcement daemon stopped: {self.stats}")
+
+    def stop(self) -> None:
+        """Ask the scheduler loop to exit after the current iteration"""
+        self._stop.set()
@@ -0,0 +1,260 @@
+"""
+Replay Gate - champion/challenger comparison on held-out evaluation data
+
+After retraining, the held-out part of the evaluation log (rows that were
+not selected as fine-tuning errors) is replayed through both the current
+champion and the new challenger in batched predict calls. Per-row
+correctness is compared pairwise, and a bootstrap confidence interval on the
+accuracy difference decides whether the challenger may be promoted.
+
+The gate fails closed: a challenger that cannot be loaded or replayed, or
+a configuration that cannot be read, is rejected. It is only skipped when
+there is no champion to compare against, or when too few rows remain and
+REPLAY_INSUFFICIENT_ROWS_DECISION says so.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    DEFAULT_LOOKBACK_DAYS,
+    REPLAY_BATCH_SIZE,
+    REPLAY_BOOTSTRAP_SAMPLES,
+    REPLAY_CONFIDENCE_LEVEL,
+    REPLAY_INSUFFICIENT_ROWS_DECISION,
+    REPLAY_MAX_REGRESSION,
+    REPLAY_MAX_ROWS,
+    REPLAY_MIN_ROWS,
+)
+from .data_loader import EvaluationLogCache, filter_errors_for_retraining
+from .model_registry import ModelCache, ModelNotFoundError, load_model_artifact, load_model_config
+
+logger = logging.getLogger(__name__)
+
+GATE_PROMOTE = "promote"
+GATE_REJECT = "reject"
+GATE_SKIPPED = "skipped"
+
+
+def held_out_slice(
+    eval_log: pd.DataFrame,
+    training_index: pd.Index,
+    features: List[str],
+    target: str,
+    max_rows: int = REPLAY_MAX_ROWS,
+) -> pd.DataFrame:
+    """
+    Select the most recent evaluation rows that were not used for training
+
+    Args:
+        eval_log: Full evaluation log
+        training_index: Index of the rows selected for fine-tuning
+        features: Model input columns
+        target: Label column
+        max_rows: Maximum rows replayed
+
+    Returns:
+        Held-out rows with complete features and labels
+    """
+    held_out = eval_log.drop(index=training_index, errors="ignore").dropna(subset=features + [target])
+    if "match_date" in held_out.columns:
+        held_out = held_out.sort_values("match_date", kind="stable")
+    return held_out.tail(max_rows)
+
+
+def batched_predict(model: Any, X: np.ndarray, batch_size: int = REPLAY_BATCH_SIZE) -> np.ndarray:
+    """Predict labels with one predict call per batch"""
+    return np.concatenate([
+        np.asarray(model.predict(X[start:start + batch_size]))
+        for start in range(0, len(X), batch_size)
+    ])
+
+
+def paired_bootstrap(
+    champion_correct: np.ndarray,
+    challenger_correct: np.ndarray,
+    samples: int = REPLAY_BOOTSTRAP_SAMPLES,
+    confidence_level: float = REPLAY_CONFIDENCE_LEVEL,
+    seed: int = 42,
+    chunk_size: int = 200,
+) -> Dict[str, float]:
+    """
+    Paired accuracy comparison with a percentile bootstrap interval
+
+    Both models are resampled on the same row indices, so the interval
+    reflects the per-row difference rather than two independent accuracies.
+    Resamples are drawn as index matrices ``chunk_size`` at a time to bound
+    memory.
+
+    Args:
+        champion_correct: Boolean per-row correctness of the champion
+        challenger_correct: Boolean per-row correctness of the challenger
+        samples: Number of bootstrap resamples
+        confidence_level: Two-sided interval coverage
+        seed: Resampling seed
+        chunk_size: Resamples drawn per vectorized step
+
+    Returns:
+        Dictionary of paired metrics
+    """
+    n = len(champion_correct)
+    diff = challenger_correct.astype(np.int8) - champion_correct.astype(np.int8)
+    rng = np.random.default_rng(seed)
+
+    deltas = np.empty(samples)
+    for start in range(0, samples, chunk_size):
+        count = min(chunk_size, samples - start)
+        indices = rng.integers(0, n, size=(count, n))
+        deltas[start:start + count] = diff[indices].mean(axis=1)
+
+    alpha = (1.0 - confidence_level) / 2.0
+    low, high = np.quantile(deltas, [alpha, 1.0 - alpha])
+    return {
+        "n": int(n),
+        "champion_accuracy": float(champion_correct.mean()),
+        "challenger_accuracy": float(challenger_correct.mean()),
+        "accuracy_delta": float(diff.mean()),
+        "delta_ci_low": float(low),
+        "delta_ci_high": float(high),
+        "confidence_level": confidence_level,
+        "challenger_only_correct": int((diff == 1).sum()),
+        "champion_only_correct": int((diff == -1).sum()),
+    }
+
+
+def skipped(reason: str, metrics: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a gate result for runs where the comparison could not be made"""
+    logger.warning(f"Replay gate skipped: {reason}")
+    return {"decision": GATE_SKIPPED, "reason": reason, "metrics": metrics or {}}
+
+
+def rejected(reason: str, metrics: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a gate result for challengers that could not be verified"""
+    logger.error(f"Replay gate rejected the challenger: {reason}")
+    return {"decision": GATE_REJECT, "reason": reason, "metrics": metrics or {}}
+
+
+def replay_gate(
+    champion: Any,
+    challenger: Any,
+    held_out: pd.DataFrame,
+    features: List[str],
+    target: str,
+    max_regression: float = REPLAY_MAX_REGRESSION,
+    min_rows: int = REPLAY_MIN_ROWS,
+    insufficient_rows_decision: str = REPLAY_INSUFFICIENT_ROWS_DECISION,
+) -> Dict[str, Any]:
+    """
+    Decide whether a challenger may replace the champion
+
+    The challenger is promoted when the lower bound of the accuracy
+    difference is above ``-max_regression``, i.e. it is not credibly worse
+    than the champion by more than the tolerance.
+
+    Args:
+        champion: Current production model
+        challenger: Newly trained model
+        held_out: Replay rows
+        features: Model input columns
+        target: Label column
+        max_regression: Tolerated accuracy drop
+        min_rows: Minimum replay rows for a decision
+        insufficient_rows_decision: GATE_SKIPPED to let the challenger through
+            when fewer than ``min_rows`` rows exist; anything else rejects it
+
+    Returns:
+        Dictionary with decision, reason and paired metrics
+    """
+    if len(held_out) < min_rows:
+        reason = f"Only {len(held_out)} held-out rows (min: {min_rows})"
+        if insufficient_rows_decision == GATE_SKIPPED:
+            return skipped(reason, {"n": len(held_out)})
+        return rejected(reason, {"n": len(held_out)})
+
+    X = held_out[features].to_numpy(dtype=np.float64)
+    y = held_out[target].to_numpy()
+
+    champion_correct = batched_predict(champion, X) == y
+    challenger_correct = batched_predict(challenger, X) == y
+    metrics = paired_bootstrap(champion_correct, challenger_correct)
+
+    if metrics["delta_ci_low"] >= -max_regression:
+        decision, reason = GATE_PROMOTE, "Challenger not worse than champion within tolerance"
+    else:
+        decision, reason = GATE_REJECT, (
+            f"Accuracy delta lower bound {metrics['delta_ci_low']:.4f} "
+            f"below tolerance -{max_regression}"
+        )
+
+    logger.info(
+        f"Replay gate: {decision} (champion {metrics['champion_accuracy']:.4f}, "
+        f"challenger {metrics['challenger_accuracy']:.4f}, "
+        f"delta {metrics['accuracy_delta']:+.4f} "
+        f"[{metrics['delta_ci_low']:+.4f}, {metrics['delta_ci_high']:+.4f}], n={metrics['n']})"
+    )
+    return {"decision": decision, "reason": reason, "metrics": metrics}
+
+
+def champion_model_id(config: Dict[str, Any], registry: List[Dict[str, Any]]) -> str:
+    """Return the configured active model, falling back to the registry's active entry"""
+    active_model_id = (config.get("inference") or {}).get("active_model_id")
+    if active_model_id:
+        return active_model_id
+    return next(entry["id"] for entry in registry if entry.get("status") == "active")
+
+
+def evaluate_challenger(
+    model_path: str,
+    eval_log_path: str,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    model_cache: Optional[ModelCache] = None,
+    eval_log_cache: Optional[EvaluationLogCache] = None,
+) -> Dict[str, Any]:
+    """
+    Run the replay gate for a newly trained model
+
+    Args:
+        model_path: Path of the challenger artifact
+        eval_log_path: Evaluation log the run was trained from
+        lookback_days: Lookback window used to select the training errors
+        model_cache: Cache to take the champion from (default: new cache)
+        eval_log_cache: Optional warm evaluation log
+
+    Returns:
+        Gate result with decision, reason and metrics
+    """
+    try:
+        config = load_model_config()
+        features = list(config.get("input_features") or config["inference"]["input_features"])
+        target = config.get("target_column", "actual_outcome")
+    except Exception as e:
+        return rejected(f"Cannot read the model configuration: {e}")
+
+    try:
+        challenger = load_model_artifact(Path(model_path))
+    except Exception as e:
+        return rejected(f"Cannot load the challenger: {e}")
+
+    if model_cache is None:
+        model_cache = ModelCache()
+    try:
+        champion = model_cache.get(champion_model_id(config, model_cache.registry))
+    except (StopIteration, ModelNotFoundError) as e:
+        # First model of its kind: nothing to compare against
+        return skipped(f"No champion to compare against: {e or 'no active model'}")
+    except Exception as e:
+        return rejected(f"Cannot load the champion: {e}")
+
+    eval_log = eval_log_cache.read(eval_log_path) if eval_log_cache is not None else pd.read_csv(eval_log_path)
+    training_rows = filter_errors_for_retraining(eval_log, lookback_days)
+    held_out = held_out_slice(eval_log, training_rows.index, features, target)
+
+    try:
+        return replay_gate(champion, challenger, held_out, features, target)
+    except Exception as e:
+        # A model that cannot be replayed must not be promoted
+        return rejected(f"Replay failed: {e}")
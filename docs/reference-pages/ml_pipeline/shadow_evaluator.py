@@ -0,0 +1,232 @@
+"""
+Shadow Evaluator - scores shadow models off the request path
+
+Live requests hand their feature vector to a bounded queue and return
+immediately. Background workers drain the queue in batches, run every shadow
+model once per batch and append the predictions to the shadow evaluation log.
+When the queue is full, work is dropped and counted instead of blocking.
+
+Shadow rows use the evaluation-log columns (actual_result is left empty for
+settlement) and carry the shadow model id in ``shadow_model_id``, so they
+can be merged into the evaluation log and still be told apart: pattern
+discovery, retraining and the replay gate drop tagged rows by default.
+"""
+
+import csv
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import SHADOW_BATCH_SIZE, SHADOW_LOG_PATH, SHADOW_QUEUE_SIZE, SHADOW_WORKERS
+from .model_registry import ModelCache, find_registry_entry
+from .shadow_rows import SHADOW_MODEL_COLUMN
+
+logger = logging.getLogger(__name__)
+
+SHADOW_LOG_COLUMNS = [
+    "timestamp",
+    "fixture_id",
+    SHADOW_MODEL_COLUMN,
+    "model_version",
+    "predicted_result",
+    "actual_result",
+    "confidence",
+    "champion_model_id",
+    "champion_result",
+    "agrees_with_champion",
+]
+
+
+def shadow_model_ids(registry: List[Dict[str, Any]]) -> List[str]:
+    """Return the ids of registry models with status 'shadow'"""
+    return [entry["id"] for entry in registry if entry.get("status") == "shadow"]
+
+
+class ShadowEvaluator:
+    """Bounded background worker pool for shadow-model scoring"""
+
+    def __init__(
+        self,
+        model_cache: ModelCache,
+        model_ids: Optional[List[str]] = None,
+        log_path: Path = SHADOW_LOG_PATH,
+        max_queue_size: int = SHADOW_QUEUE_SIZE,
+        batch_size: int = SHADOW_BATCH_SIZE,
+        workers: int = SHADOW_WORKERS,
+        flush_interval: float = 0.5,
+    ):
+        """
+        Initialize the evaluator
+
+        Args:
+            model_cache: Cache the shadow models are resolved from
+            model_ids: Shadow models to score (default: registry shadow entries)
+            log_path: CSV file shadow predictions are appended to
+            max_queue_size: Pending vectors kept before work is dropped
+            batch_size: Maximum vectors scored per predict_proba call
+            workers: Number of background worker threads
+            flush_interval: Seconds a worker waits to fill a batch
+        """
+        self.model_cache = model_cache
+        self.model_ids = model_ids if model_ids is not None else shadow_model_ids(model_cache.registry)
+        self.log_path = Path(log_path)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "dropped": 0, "scored": 0, "batches": 0, "errors": 0}
+
+    def start(self) -> None:
+        """Start the background workers"""
+        if self._threads or not self.model_ids:
+            return
+
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"shadow-evaluator-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Shadow evaluation started for {self.model_ids} with {self.workers} workers")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Drain pending work and stop the workers"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(
+        self,
+        vector: np.ndarray,
+        champion_result: Dict[str, Any],
+        fixture_id: Optional[Any] = None,
+    ) -> bool:
+        """
+        Enqueue a scored request for shadow evaluation without blocking
+
+        Args:
+            vector: Feature vector the champion was scored on
+            champion_result: Prediction returned to the caller
+            fixture_id: Fixture identifier
+
+        Returns:
+            True if queued, False if dropped under backpressure
+        """
+        if not self.model_ids:
+            return False
+
+        try:
+            self._queue.put_nowait((vector, champion_result, fixture_id))
+        except queue.Full:
+            self._count("dropped")
+            return False
+
+        self._count("submitted")
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Return submitted/dropped/scored counters and current queue depth"""
+        with self._stats_lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _next_batch(self) -> list:
+        """Block briefly for one item, then take whatever else is already queued"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                if self._stop.is_set():
+                    return
+                continue
+
+            try:
+                self.score_batch(batch)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"Shadow evaluation batch failed: {e}")
+
+    def score_batch(self, batch: list) -> int:
+        """
+        Score a batch with every shadow model and append the results
+
+        Args:
+            batch: List of (vector, champion_result, fixture_id) tuples
+
+        Returns:
+            Number of log rows written
+        """
+        X = np.vstack([vector for vector, _, _ in batch])
+        timestamp = datetime.now(timezone.utc).isoformat()
+        rows = []
+
+        for model_id in self.model_ids:
+            try:
+                model = self.model_cache.get(model_id)
+                probabilities = np.asarray(model.predict_proba(X))
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"Shadow model {model_id} failed: {e}")
+                continue
+
+            entry = find_registry_entry(self.model_cache.registry, model_id) or {}
+            classes = list(model.classes_)
+            best = probabilities.argmax(axis=1)
+
+            for i, (_, champion, fixture_id) in enumerate(batch):
+                label = classes[best[i]]
+                label = label.item() if hasattr(label, "item") else label
+                rows.append([
+                    timestamp,
+                    fixture_id,
+                    model_id,
+                    entry.get("version", ""),
+                    label,
+                    "",
+                    round(float(probabilities[i, best[i]]), 6),
+                    champion.get("model_id"),
+                    champion.get("prediction"),
+                    str(label) == str(champion.get("prediction")),
+                ])
+
+        self._append(rows)
+        self._count("batches")
+        self._count("scored", len(batch))
+        return len(rows)
+
+    def _append(self, rows: list) -> None:
+        if not rows:
+            return
+
+        with self._write_lock:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            write_header = not self.log_path.exists() or self.log_path.stat().st_size == 0
+            with open(self.log_path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(SHADOW_LOG_COLUMNS)
+                writer.writerows(rows)
@@ -0,0 +1,48 @@
+"""
+Shadow rows - identify predictions written by shadow models
+
+shadow_evaluator.py appends shadow-model predictions to SHADOW_LOG_PATH using
+the rare-pattern log schema (predicted_result/actual_result) plus a
+shadow_model_id column. Those predictions were never served, so the pattern
+readers drop tagged rows unless asked not to. The retraining log
+(predicted_outcome/actual_outcome) never carries shadow rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Column tagging shadow-model predictions
+SHADOW_MODEL_COLUMN = "shadow_model_id"
+
+
+def is_shadow_prediction(df: pd.DataFrame) -> np.ndarray:
+    """
+    Flag rows tagged with a shadow model id
+
+    Args:
+        df: Evaluation log rows
+
+    Returns:
+        Boolean mask, all False if the log has no shadow column
+    """
+    if SHADOW_MODEL_COLUMN not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    tags = df[SHADOW_MODEL_COLUMN]
+    return (tags.notna() & (tags.astype(str).str.strip() != "")).to_numpy()
+
+
+def drop_shadow_predictions(df: pd.DataFrame, include_shadow: bool = False) -> pd.DataFrame:
+    """
+    Remove shadow-model rows from an evaluation log
+
+    Args:
+        df: Evaluation log rows
+        include_shadow: Keep shadow rows (the log is returned unchanged)
+
+    Returns:
+        Rows served by production models
+    """
+    if include_shadow:
+        return df
+    shadow = is_shadow_prediction(df)
+    return df[~shadow] if shadow.any() else df
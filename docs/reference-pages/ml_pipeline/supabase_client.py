@@ -2,34 +2,73 @@
 Supabase client for ML Pipeline
 """
 
+import base64
+import json
 import logging
-from typing import Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from supabase import create_client
+import httpx
+from supabase import ClientOptions, create_client
 
-from .config import SUPABASE_SERVICE_KEY, SUPABASE_URL
+from .config import (
+    LOCAL_BACKEND_DIR,
+    ML_PIPELINE_BACKEND,
+    MODEL_ARTIFACTS_PREFIX,
+    STORAGE_BUCKET,
+    STORAGE_RESUMABLE_THRESHOLD,
+    STORAGE_UPLOAD_CHUNK_SIZE,
+    SUPABASE_SERVICE_KEY,
+    SUPABASE_URL,
+    TABLE_PAGE_SIZE,
+    UPLOAD_STATE_DIR,
+)
+from .http_transport import call_with_retry, get_http_client
+from .local_backend import LocalSupabaseClient
+from .model_registry import cached_file_sha256
 
 logger = logging.getLogger(__name__)
 
 _supabase_client: Optional[object] = None
+_log_shipper: Optional[object] = None
 
 
 def get_supabase_client():
     """
     Get or create Supabase client singleton
     
+    PostgREST, Storage and edge-function requests share the pooled
+    keep-alive client from http_transport. With ML_PIPELINE_BACKEND=local
+    the client is a LocalSupabaseClient backed by SQLite and the filesystem
+    under LOCAL_BACKEND_DIR.
+    
     Returns:
         Supabase client instance
     """
     global _supabase_client
     
     if _supabase_client is None:
+        if ML_PIPELINE_BACKEND == "local":
+            _supabase_client = LocalSupabaseClient(LOCAL_BACKEND_DIR)
+            logger.info(f"Local backend initialized at {LOCAL_BACKEND_DIR}")
+            return _supabase_client
+        
+        if ML_PIPELINE_BACKEND != "supabase":
+            raise ValueError(f"Unknown ML_PIPELINE_BACKEND: {ML_PIPELINE_BACKEND}")
+        
         if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
             raise ValueError(
                 "SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables are required"
             )
         
-        _supabase_client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        _supabase_client = create_client(
+            SUPABASE_URL,
+            SUPABASE_SERVICE_KEY,
+            options=ClientOptions(httpx_client=get_http_client()),
+        )
         logger.info("Supabase client initialized")
     
     return _supabase_client
@@ -50,7 +89,10 @@ def download_file_from_storage(bucket: str, path: str, local_path: str) -> str:
     client = get_supabase_client()
     
     try:
-        data = client.storage.from_(bucket).download(path)
+        data = call_with_retry(
+            lambda: client.storage.from_(bucket).download(path),
+            f"Download of {bucket}/{path}",
+        )
         
         with open(local_path, "wb") as f:
             f.write(data)
@@ -62,34 +104,279 @@ def download_file_from_storage(bucket: str, path: str, local_path: str) -> str:
         raise
 
 
-def upload_file_to_storage(bucket: str, path: str, file_path: str) -> str:
+def storage_object_sha256(bucket: str, path: str) -> Optional[str]:
+    """
+    Return the content hash recorded on a stored object
+    
+    Args:
+        bucket: Storage bucket name
+        path: Path to file in bucket
+        
+    Returns:
+        SHA-256 hex digest from the object's metadata, or None if the object
+        does not exist or carries no hash
+    """
+    storage = get_supabase_client().storage.from_(bucket)
+    
+    try:
+        if not call_with_retry(lambda: storage.exists(path), f"Lookup of {bucket}/{path}"):
+            return None
+        info = call_with_retry(lambda: storage.info(path), f"Lookup of {bucket}/{path}")
+        return (info.get("metadata") or {}).get("sha256")
+    except Exception as e:
+        logger.debug(f"Could not read metadata of {bucket}/{path}: {e}")
+        return None
+
+
+def _encode_upload_metadata(metadata: Dict[str, str]) -> str:
+    """Encode TUS Upload-Metadata: comma-separated 'key base64(value)' pairs"""
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in metadata.items()
+    )
+
+
+def resumable_upload(
+    bucket: str,
+    path: str,
+    file_path: str,
+    sha256: str,
+    chunk_size: int = STORAGE_UPLOAD_CHUNK_SIZE,
+) -> None:
+    """
+    Stream a file to Storage with the resumable (TUS) upload protocol
+    
+    The upload URL is persisted under UPLOAD_STATE_DIR keyed by the content
+    hash, so a call interrupted part-way resumes from the offset the server
+    already holds instead of starting over. Requests go through the shared
+    pooled HTTP client.
+    
+    Args:
+        bucket: Storage bucket name
+        path: Path to store file in bucket
+        file_path: Local file path
+        sha256: Content hash of the file
+        chunk_size: Bytes sent per PATCH request
+    """
+    endpoint = f"{SUPABASE_URL}/storage/v1/upload/resumable"
+    headers = {
+        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+        "apikey": SUPABASE_SERVICE_KEY,
+        "Tus-Resumable": "1.0.0",
+    }
+    size = os.path.getsize(file_path)
+    state_path = UPLOAD_STATE_DIR / f"{sha256}.json"
+    upload_url, offset = None, 0
+    
+    http = get_http_client()
+    if state_path.exists():
+        state = json.loads(state_path.read_text())
+        if state.get("bucket") == bucket and state.get("path") == path:
+            response = http.head(state["upload_url"], headers=headers)
+            if response.status_code == 200:
+                upload_url = state["upload_url"]
+                offset = int(response.headers["Upload-Offset"])
+                logger.info(f"Resuming upload of {file_path} at byte {offset}/{size}")
+    
+    if upload_url is None:
+        response = http.post(endpoint, headers={
+            **headers,
+            "Upload-Length": str(size),
+            "Upload-Metadata": _encode_upload_metadata({
+                "bucketName": bucket,
+                "objectName": path,
+                "contentType": "application/octet-stream",
+                "metadata": json.dumps({"sha256": sha256}),
+            }),
+            "x-upsert": "true",
+        })
+        response.raise_for_status()
+        upload_url = str(httpx.URL(endpoint).join(response.headers["Location"]))
+        UPLOAD_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(json.dumps({"bucket": bucket, "path": path, "upload_url": upload_url}))
+    
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        while offset < size:
+            response = http.patch(upload_url, content=f.read(chunk_size), headers={
+                **headers,
+                "Upload-Offset": str(offset),
+                "Content-Type": "application/offset+octet-stream",
+            })
+            response.raise_for_status()
+            offset = int(response.headers["Upload-Offset"])
+            f.seek(offset)
+    
+    state_path.unlink(missing_ok=True)
+
+
+def upload_file_to_storage(bucket: str, path: str, file_path: str, sha256: Optional[str] = None) -> str:
     """
     Upload file to Supabase Storage
     
+    The file is streamed rather than read into memory. Files larger than
+    STORAGE_RESUMABLE_THRESHOLD use resumable chunked uploads. The object's
+    SHA-256 is stored in its metadata, and the upload is skipped when the
+    target already holds the same content.
+    
     Args:
         bucket: Storage bucket name
         path: Path to store file in bucket
         file_path: Local file path
+        sha256: Precomputed content hash (taken from the digest cache or
+            computed if omitted)
         
     Returns:
         Storage URL
     """
     client = get_supabase_client()
+    url = f"{client.storage.url}/{bucket}/{path}"
     
     try:
-        with open(file_path, "rb") as f:
-            file_data = f.read()
+        sha256 = sha256 or cached_file_sha256(Path(file_path))
+        if storage_object_sha256(bucket, path) == sha256:
+            logger.info(f"Skipped upload of {file_path}: {bucket}/{path} already holds sha256 {sha256[:12]}")
+            return url
         
-        client.storage.from_(bucket).upload(path, file_data)
+        resumable = getattr(client.storage, "resumable", True)
+        if resumable and os.path.getsize(file_path) > STORAGE_RESUMABLE_THRESHOLD:
+            # A retried resumable upload continues from the server's offset
+            call_with_retry(
+                lambda: resumable_upload(bucket, path, file_path, sha256),
+                f"Upload of {bucket}/{path}",
+            )
+        else:
+            def upload():
+                with open(file_path, "rb") as f:
+                    return client.storage.from_(bucket).upload(path, f, {
+                        "content-type": "application/octet-stream",
+                        "upsert": "true",
+                        "metadata": {"sha256": sha256},
+                    })
+            
+            # Upserts of the same content are idempotent
+            call_with_retry(upload, f"Upload of {bucket}/{path}")
         logger.info(f"Uploaded {file_path} to {bucket}/{path}")
         
         # Return public URL
-        return f"{client.storage.url}/{bucket}/{path}"
+        return url
     except Exception as e:
         logger.error(f"Failed to upload {file_path} to {bucket}: {str(e)}")
         raise
 
 
+def upload_model_artifact(model_path: str) -> Dict[str, str]:
+    """
+    Upload a model artifact to content-addressed storage
+    
+    Artifacts are stored as ``models/<sha256><suffix>``, so identical models
+    produced by different runs are uploaded only once. The digest recorded
+    when the training child wrote the file is reused while the file's size
+    and mtime are unchanged, so the artifact is read once, by the upload.
+    
+    Args:
+        model_path: Local path of the saved model
+        
+    Returns:
+        Dictionary with model_url, model_sha256 and storage_path
+    """
+    sha256 = cached_file_sha256(Path(model_path))
+    storage_path = f"{MODEL_ARTIFACTS_PREFIX}/{sha256}{Path(model_path).suffix}"
+    url = upload_file_to_storage(STORAGE_BUCKET, storage_path, model_path, sha256=sha256)
+    return {"model_url": url, "model_sha256": sha256, "storage_path": storage_path}
+
+
+def _fetch_keyset_page(
+    table: str,
+    columns: str,
+    filters: List[Tuple[str, str, Any]],
+    after: Optional[Tuple[str, str]],
+    page_size: int,
+) -> List[dict]:
+    """
+    Fetch the rows following the (created_at, id) key ``after``
+    
+    Rows sharing the last created_at are read with a second, indexed
+    equality query, so ties are never skipped or repeated.
+    """
+    client = get_supabase_client()
+    
+    def query():
+        q = client.table(table).select(columns)
+        for column, op, value in filters:
+            q = getattr(q, op)(column, value)
+        return q
+    
+    def run(q, description):
+        return call_with_retry(lambda: q.execute(), description).data or []
+    
+    if after is None:
+        return run(query().order("created_at").order("id").limit(page_size), f"Read {table}")
+    
+    created_at, last_id = after
+    rows = run(
+        query().eq("created_at", created_at).gt("id", last_id).order("id").limit(page_size),
+        f"Read {table}",
+    )
+    if len(rows) < page_size:
+        rows += run(
+            query().gt("created_at", created_at).order("created_at").order("id").limit(page_size - len(rows)),
+            f"Read {table}",
+        )
+    return rows
+
+
+def iter_table_rows(
+    table: str,
+    columns: str = "*",
+    filters: Optional[List[Tuple[str, str, Any]]] = None,
+    page_size: int = TABLE_PAGE_SIZE,
+) -> Iterator[dict]:
+    """
+    Stream a table in (created_at, id) order with keyset pagination
+    
+    Each page continues after the last key of the previous one instead of
+    using OFFSET, so reads stay index range scans however deep the walk
+    goes. The next page is fetched in the background while the current one
+    is consumed, and at most two pages are held in memory.
+    
+    Args:
+        table: Table name
+        columns: Comma-separated columns to select ("*" for all)
+        filters: (column, operator, value) filters, e.g. ("status", "eq", "error")
+        page_size: Rows per request
+        
+    Yields:
+        Row dictionaries with the selected columns
+    """
+    filters = filters or []
+    selected = [c.strip() for c in columns.split(",")]
+    keys_added = [k for k in ("created_at", "id") if "*" not in selected and k not in selected]
+    select = ",".join(selected + keys_added)
+    
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{table}-prefetch")
+    try:
+        future = executor.submit(_fetch_keyset_page, table, select, filters, None, page_size)
+        while True:
+            rows = future.result()
+            if not rows:
+                return
+            
+            last = rows[-1]
+            if len(rows) == page_size:
+                after = (last["created_at"], last["id"])
+                future = executor.submit(_fetch_keyset_page, table, select, filters, after, page_size)
+            
+            for row in rows:
+                for key in keys_added:
+                    row.pop(key, None)
+                yield row
+            
+            if len(rows) < page_size:
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def insert_retraining_run(run_data: dict) -> dict:
     """
     Insert model retraining run record
@@ -103,7 +390,11 @@ def insert_retraining_run(run_data: dict) -> dict:
     client = get_supabase_client()
     
     try:
-        response = client.table("model_retraining_runs").insert(run_data).execute()
+        response = call_with_retry(
+            lambda: client.table("model_retraining_runs").insert(run_data).execute(),
+            "Insert retraining run",
+            idempotent=False,
+        )
         logger.info(f"Inserted retraining run: {run_data.get('id', 'unknown')}")
         return response.data[0] if response.data else {}
     except Exception as e:
@@ -125,7 +416,10 @@ def update_retraining_run(run_id: str, update_data: dict) -> dict:
     client = get_supabase_client()
     
     try:
-        response = client.table("model_retraining_runs").update(update_data).eq("id", run_id).execute()
+        response = call_with_retry(
+            lambda: client.table("model_retraining_runs").update(update_data).eq("id", run_id).execute(),
+            f"Update retraining run {run_id}",
+        )
         logger.info(f"Updated retraining run: {run_id}")
         return response.data[0] if response.data else {}
     except Exception as e:
@@ -143,12 +437,15 @@ def get_latest_retraining_run() -> Optional[dict]:
     client = get_supabase_client()
     
     try:
-        response = (
-            client.table("model_retraining_runs")
-            .select("*")
-            .order("created_at", desc=True)
-            .limit(1)
-            .execute()
+        response = call_with_retry(
+            lambda: (
+                client.table("model_retraining_runs")
+                .select("*")
+                .order("created_at", desc=True)
+                .limit(1)
+                .execute()
+            ),
+            "Get latest retraining run",
         )
         
         return response.data[0] if response.data else None
@@ -167,13 +464,16 @@ def get_pending_retraining_requests() -> list:
     client = get_supabase_client()
     
     try:
-        response = (
-            client.table("model_retraining_requests")
-            .select("*")
-            .eq("status", "pending")
-            .order("priority", desc=True)
-            .order("created_at", desc=False)
-            .execute()
+        response = call_with_retry(
+            lambda: (
+                client.table("model_retraining_requests")
+                .select("*")
+                .eq("status", "pending")
+                .order("priority", desc=True)
+                .order("created_at", desc=False)
+                .execute()
+            ),
+            "Get pending retraining requests",
         )
         
         return response.data if response.data else []
@@ -196,7 +496,10 @@ def update_retraining_request(request_id: str, update_data: dict) -> dict:
     client = get_supabase_client()
     
     try:
-        response = client.table("model_retraining_requests").update(update_data).eq("id", request_id).execute()
+        response = call_with_retry(
+            lambda: client.table("model_retraining_requests").update(update_data).eq("id", request_id).execute(),
+            f"Update retraining request {request_id}",
+        )
         logger.info(f"Updated retraining request: {request_id}")
         return response.data[0] if response.data else {}
     except Exception as e:
@@ -204,10 +507,164 @@ def update_retraining_request(request_id: str, update_data: dict) -> dict:
         raise
 
 
+def lease_retraining_requests(worker_id: str, limit: int, lease_seconds: int) -> List[dict]:
+    """
+    Atomically lease up to ``limit`` retraining requests for a worker
+    
+    Each claim is a conditional update that only matches while the request
+    is still pending (or its previous lease has expired), so concurrent
+    workers on any host can never claim the same request twice. Requests
+    left in processing without a lease expiry (by older one-shot runs) are
+    treated as expired.
+    
+    Args:
+        worker_id: Identifier of the leasing worker
+        limit: Maximum number of requests to lease
+        lease_seconds: Lease duration
+        
+    Returns:
+        List of leased request records
+    """
+    client = get_supabase_client()
+    now = datetime.now(timezone.utc)
+    lease = {
+        "status": "processing",
+        "leased_by": worker_id,
+        "lease_expires_at": (now + timedelta(seconds=lease_seconds)).isoformat(),
+    }
+    
+    def lapsed(query, lease_expires_at):
+        if lease_expires_at is None:
+            return query.is_("lease_expires_at", "null")
+        return query.lt("lease_expires_at", now.isoformat())
+    
+    try:
+        expired = []
+        for lease_expires_at in (now.isoformat(), None):
+            expired += call_with_retry(
+                lambda: lapsed(
+                    client.table("model_retraining_requests").select("*").eq("status", "processing"),
+                    lease_expires_at,
+                ).limit(limit).execute(),
+                "Get expired retraining leases",
+            ).data or []
+        candidates = expired + get_pending_retraining_requests()
+        
+        leased = []
+        for request in candidates:
+            if len(leased) >= limit:
+                break
+            
+            query = client.table("model_retraining_requests").update(lease).eq("id", request["id"])
+            if request.get("status") == "processing":
+                query = lapsed(query.eq("status", "processing"), request.get("lease_expires_at"))
+            else:
+                query = query.eq("status", "pending")
+            
+            # A retry after a lost response would find the row already
+            # claimed, so the conditional update is attempted once
+            response = call_with_retry(query.execute, f"Lease retraining request {request['id']}", idempotent=False)
+            if response.data:
+                leased.append(response.data[0])
+        
+        logger.info(f"Worker {worker_id} leased {len(leased)} retraining requests")
+        return leased
+    except Exception as e:
+        logger.error(f"Failed to lease retraining requests: {str(e)}")
+        return []
+
+
+def renew_retraining_leases(worker_id: str, request_ids: List[str], lease_seconds: int) -> List[str]:
+    """
+    Extend the leases a worker still holds
+    
+    Args:
+        worker_id: Identifier of the leasing worker
+        request_ids: Requests whose runs are still in progress
+        lease_seconds: New lease duration from now
+        
+    Returns:
+        IDs of the requests whose lease was extended; requests missing from
+        the result were reclaimed by another worker or already finished
+    """
+    client = get_supabase_client()
+    lease_expires_at = (datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)).isoformat()
+    
+    renewed = []
+    for request_id in request_ids:
+        try:
+            response = call_with_retry(
+                lambda: (
+                    client.table("model_retraining_requests")
+                    .update({"lease_expires_at": lease_expires_at})
+                    .eq("id", request_id)
+                    .eq("status", "processing")
+                    .eq("leased_by", worker_id)
+                    .execute()
+                ),
+                f"Renew lease on retraining request {request_id}",
+            )
+        except Exception as e:
+            # Keep the request: the next renewal may succeed before the lease lapses
+            logger.warning(f"Failed to renew lease on retraining request {request_id}: {e}")
+            renewed.append(request_id)
+            continue
+        if response.data:
+            renewed.append(request_id)
+    return renewed
+
+
+def complete_leased_retraining_request(request_id: str, worker_id: str, update_data: dict) -> bool:
+    """
+    Update a retraining request only while ``worker_id`` still holds its lease
+    
+    Args:
+        request_id: ID of the request to update
+        worker_id: Identifier of the leasing worker
+        update_data: Dictionary with fields to update
+        
+    Returns:
+        True if updated, False if the lease was taken over by another worker
+    """
+    client = get_supabase_client()
+    
+    response = call_with_retry(
+        lambda: (
+            client.table("model_retraining_requests")
+            .update(update_data)
+            .eq("id", request_id)
+            .eq("leased_by", worker_id)
+            .execute()
+        ),
+        f"Complete retraining request {request_id}",
+    )
+    if not response.data:
+        logger.warning(f"Retraining request {request_id} is no longer leased by {worker_id}, not updated")
+        return False
+    
+    logger.info(f"Updated retraining request: {request_id}")
+    return True
+
+
+def set_log_shipper(shipper: Optional[object]) -> None:
+    """
+    Route insert_system_log through a background shipper
+    
+    Args:
+        shipper: Object with a non-blocking ``submit(entry)`` method, or None
+            to restore synchronous inserts
+    """
+    global _log_shipper
+    _log_shipper = shipper
+
+
 def insert_system_log(component: str, status: str, message: str, details: Optional[dict] = None) -> bool:
     """
     Insert a system log entry. Handles connectivity failures gracefully.
     
+    When a log shipper is running (see ``log_shipper.start_log_shipper``) the
+    entry is only queued and written later in a bulk insert.
+    
     Args:
         component: Source component (e.g., 'train_model', 'auto_reinforcement')
         status: Log status ('info', 'warning', 'error')
@@ -215,22 +672,57 @@ def insert_system_log(component: str, status: str, message: str, details: Option
         details: Optional additional structured data
         
     Returns:
-        True if logged successfully, False otherwise
+        True if logged (or queued) successfully, False otherwise
     """
+    log_data = {
+        "component": component,
+        "status": status,
+        "message": message,
+        "details": details or {},
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    
+    shipper = _log_shipper
+    if shipper is not None:
+        return shipper.submit(log_data)
+    
     try:
         client = get_supabase_client()
-        
-        log_data = {
-            "component": component,
-            "status": status,
-            "message": message,
-            "details": details or {},
-        }
-        
-        client.table("system_logs").insert(log_data).execute()
+        call_with_retry(
+            lambda: client.table("system_logs").insert(log_data).execute(),
+            "Insert system log",
+            idempotent=False,
+        )
         logger.debug(f"System log inserted: {component} - {status} - {message}")
         return True
     except Exception as e:
         # Gracefully handle logging failures - don't crash the pipeline
         logger.warning(f"Failed to insert system log: {e}")
         return False
+
+
+def insert_system_logs(entries: List[dict]) -> bool:
+    """
+    Bulk insert system log entries in a single request
+    
+    Args:
+        entries: system_logs rows
+        
+    Returns:
+        True if inserted successfully, False otherwise
+    """
+    if not entries:
+        return True
+    
+    try:
+        client = get_supabase_client()
+        call_with_retry(
+            lambda: client.table("system_logs").insert(entries).execute(),
+            "Insert system logs",
+            idempotent=False,
+        )
+        logger.debug(f"Inserted {len(entries)} system log entries")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to insert {len(entries)} system log entries: {e}")
+        return False
@@ -0,0 +1,266 @@
+"""
+Temporal Patterns - time-decayed and sliding-window rare pattern statistics.
+
+``find_rare_patterns`` weighs every evaluated prediction equally and gives each
+pattern a fixed 30-day expiry. The variants here weigh predictions by age:
+
+- Exponential decay: each prediction counts ``exp(-decay_rate * age_days)``,
+  the same freshness score ``calculate_freshness_score`` applies per record
+  in the phase 9 temporal decay migration.
+- Sliding window: only predictions from the last ``window_days`` count.
+
+Expiry is derived from the data: a pattern expires when, without new
+predictions, it would stop qualifying (its decayed sample falls below the
+minimum, or enough of its window rows age out to drop its sample size or
+accuracy below the thresholds).
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .rare_pattern_finder import (
+    build_label,
+    build_pattern_insight,
+    encode_patterns,
+    extract_supporting_matches,
+    load_evaluation_log,
+    sort_patterns,
+)
+
+SECONDS_PER_DAY = 24 * 3600
+EPOCH = pd.Timestamp(0, tz="UTC")
+
+
+def validate_temporal_mode(decay_rate: Optional[float], window_days: Optional[float]) -> None:
+    """
+    Check that exactly one of decay_rate and window_days is set and positive.
+
+    :raises ValueError: If neither or both are given, or one is not positive
+    """
+    if (decay_rate is None) == (window_days is None):
+        raise ValueError("Specify exactly one of decay_rate or window_days")
+    if decay_rate is not None and decay_rate <= 0:
+        raise ValueError(f"decay_rate must be positive, got {decay_rate}")
+    if window_days is not None and window_days <= 0:
+        raise ValueError(f"window_days must be positive, got {window_days}")
+
+
+def epoch_seconds(timestamps: pd.Series) -> np.ndarray:
+    """Convert timestamps (naive values are taken as UTC) to epoch seconds, NaN if unparseable."""
+    parsed = pd.to_datetime(timestamps, utc=True, errors="coerce")
+    return ((parsed - EPOCH) / pd.Timedelta(seconds=1)).to_numpy(dtype=float, na_value=np.nan)
+
+
+def temporal_weights(
+    seconds: np.ndarray,
+    now_seconds: float,
+    decay_rate: Optional[float] = None,
+    window_days: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Weight of each record at ``now``.
+
+    Records without a timestamp weigh zero; records dated after ``now``
+    weigh as if they happened at ``now``.
+
+    :param seconds: Record timestamps in epoch seconds
+    :param now_seconds: Evaluation time in epoch seconds
+    :param decay_rate: Exponential decay per day
+    :param window_days: Sliding window length in days
+    :return: Weights in [0, 1]
+    """
+    with np.errstate(invalid="ignore"):
+        age_days = np.maximum(now_seconds - seconds, 0.0) / SECONDS_PER_DAY
+        if decay_rate is not None:
+            weights = np.exp(-decay_rate * age_days)
+        else:
+            weights = (age_days <= window_days).astype(float)
+    return np.nan_to_num(weights, nan=0.0)
+
+
+def decay_expiry_days(weight: np.ndarray, min_sample_size: int, decay_rate: float) -> np.ndarray:
+    """
+    Days until each decayed sample shrinks below ``min_sample_size``.
+
+    Decay scales correct and total weight alike, so accuracy holds and the
+    sample size is what lapses.
+    """
+    floor = max(min_sample_size, 1)
+    return np.log(np.maximum(weight, floor) / floor) / decay_rate
+
+
+def window_expiry_seconds(
+    groups: np.ndarray,
+    seconds: np.ndarray,
+    totals: np.ndarray,
+    corrects: np.ndarray,
+    min_sample_size: int,
+    accuracy_threshold: float,
+    window_days: float,
+) -> Dict[int, float]:
+    """
+    When each group stops qualifying as its oldest window records age out.
+
+    Records leave the window oldest first; a group expires when the record
+    whose departure drops its remaining sample below ``min_sample_size`` or
+    its remaining accuracy below ``accuracy_threshold`` leaves.
+
+    :param groups: Group of each in-window record
+    :param seconds: Record timestamps in epoch seconds
+    :param totals: Predictions each record stands for
+    :param corrects: Correct predictions each record stands for
+    :return: Expiry in epoch seconds by group
+    """
+    frame = pd.DataFrame({"group": groups, "seconds": seconds, "total": totals, "correct": corrects})
+    frame = frame.sort_values(["group", "seconds"], kind="stable")
+    by_group = frame.groupby("group", sort=False)
+
+    remaining_total = by_group["total"].transform("sum") - by_group["total"].cumsum()
+    remaining_correct = by_group["correct"].transform("sum") - by_group["correct"].cumsum()
+    lapses = (
+        (remaining_total <= 0)
+        | (remaining_total < min_sample_size)
+        | (remaining_correct < accuracy_threshold * remaining_total)
+    )
+
+    first_lapse = frame[lapses].groupby("group", sort=False)["seconds"].first()
+    return (first_lapse + window_days * SECONDS_PER_DAY).to_dict()
+
+
+def temporal_statistics(
+    groups: np.ndarray,
+    n_groups: int,
+    seconds: np.ndarray,
+    totals: np.ndarray,
+    corrects: np.ndarray,
+    now: datetime,
+    frequency_threshold: float,
+    accuracy_threshold: float,
+    min_sample_size: int,
+    decay_rate: Optional[float] = None,
+    window_days: Optional[float] = None,
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Weighted per-group statistics and data-driven expiry.
+
+    Records are either single predictions (totals of 1) or pre-aggregated
+    time buckets.
+
+    :param groups: Group index of each record
+    :param n_groups: Number of groups
+    :param seconds: Record timestamps in epoch seconds
+    :param totals: Predictions each record stands for
+    :param corrects: Correct predictions each record stands for
+    :param now: Evaluation time
+    :return: Statistics of qualifying groups (indexed by group, with
+        frequency, accuracy, sample_size and expires_at) and the
+        per-record mask of records that still count
+    """
+    validate_temporal_mode(decay_rate, window_days)
+    now_seconds = (pd.Timestamp(now) - EPOCH) / pd.Timedelta(seconds=1)
+
+    weights = temporal_weights(seconds, now_seconds, decay_rate, window_days)
+    counted = weights > 0
+    weight = np.bincount(groups, weights=weights * totals, minlength=n_groups)
+    correct_weight = np.bincount(groups, weights=weights * corrects, minlength=n_groups)
+    sample_size = np.bincount(groups, weights=counted * totals, minlength=n_groups).astype(int)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        accuracy = np.where(weight > 0, correct_weight / weight, 0.0)
+    frequency = weight / weight.sum() if weight.sum() > 0 else np.zeros(n_groups)
+
+    qualifying = np.flatnonzero(
+        (sample_size > 0)
+        & (frequency < frequency_threshold)
+        & (accuracy >= accuracy_threshold)
+        & (weight >= min_sample_size)
+    )
+
+    if decay_rate is not None:
+        days = decay_expiry_days(weight[qualifying], min_sample_size, decay_rate)
+        expires_at = [now + timedelta(days=float(d)) for d in days]
+    else:
+        in_play = counted & np.isin(groups, qualifying)
+        expiry = window_expiry_seconds(
+            groups[in_play], seconds[in_play], totals[in_play], corrects[in_play],
+            min_sample_size, accuracy_threshold, window_days,
+        )
+        expires_at = [datetime.fromtimestamp(expiry[g], tz=timezone.utc) for g in qualifying]
+
+    stats = pd.DataFrame({
+        "frequency": frequency[qualifying],
+        "accuracy": accuracy[qualifying],
+        "sample_size": sample_size[qualifying],
+        "expires_at": expires_at,
+    }, index=qualifying)
+    return stats, counted
+
+
+def find_temporal_patterns(
+    evaluation_log_path: str,
+    frequency_threshold: float = 0.05,
+    accuracy_threshold: float = 0.80,
+    min_sample_size: int = 5,
+    decay_rate: Optional[float] = None,
+    window_days: Optional[float] = None,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Identify rare but reliable patterns weighing predictions by age.
+
+    Frequency and accuracy are weighted by decay (or restricted to the
+    window); ``sample_size`` counts the predictions that still carry weight.
+    With decay, ``min_sample_size`` applies to the decayed sample.
+
+    :param evaluation_log_path: Path to evaluation log CSV file
+    :param frequency_threshold: Maximum occurrence frequency (default 5%)
+    :param accuracy_threshold: Minimum accuracy threshold (default 80%)
+    :param min_sample_size: Minimum sample size for statistical reliability
+    :param decay_rate: Exponential decay per day
+    :param window_days: Sliding window length in days
+    :param now: Evaluation time (default: current UTC time)
+    :return: List of high-value pattern dictionaries
+    :raises FileNotFoundError: If evaluation log file doesn't exist
+    :raises ValueError: If the log has no timestamp column or the mode is invalid
+    """
+    validate_temporal_mode(decay_rate, window_days)
+    df = load_evaluation_log(evaluation_log_path)
+
+    if len(df) == 0:
+        return []
+    if "timestamp" not in df.columns:
+        raise ValueError("Temporal pattern statistics need a timestamp column")
+
+    now = now or datetime.now(timezone.utc)
+    is_correct = (df["predicted_result"] == df["actual_result"]).to_numpy()
+    packed, keys, inverse, components_of = encode_patterns(df)
+
+    stats, counted = temporal_statistics(
+        inverse, len(keys), epoch_seconds(df["timestamp"]),
+        np.ones(len(df)), is_correct.astype(float), now,
+        frequency_threshold, accuracy_threshold, min_sample_size, decay_rate, window_days,
+    )
+
+    df["pattern_code"] = packed
+    supporting = extract_supporting_matches(
+        df[counted], keys[stats.index].tolist(), key_column="pattern_code"
+    )
+
+    result = []
+    for i, row in stats.iterrows():
+        components = components_of(int(keys[i]))
+        pattern_key = "_".join(components)
+        result.append(build_pattern_insight(
+            pattern_key,
+            build_label(*components) or pattern_key,
+            frequency=float(row["frequency"]),
+            accuracy=float(row["accuracy"]),
+            sample_size=int(row["sample_size"]),
+            supporting_matches=supporting[int(keys[i])],
+            expires_at=row["expires_at"],
+        ))
+
+    return sort_patterns(result)
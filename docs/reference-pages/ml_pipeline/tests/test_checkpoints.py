@@ -0,0 +1,153 @@
+"""Unit tests for staged run checkpoints and resume"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from ml_pipeline.auto_reinforcement import run_auto_reinforcement
+from ml_pipeline.checkpoints import CheckpointError, RunCheckpoint
+
+
+class TestRunCheckpoint(unittest.TestCase):
+    """Tests for RunCheckpoint"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_completed_stage_is_reused_after_reload(self):
+        """Test that a reloaded checkpoint skips completed stages"""
+        checkpoint = RunCheckpoint("run-1", self.root).create(source="manual", lookback_days=7)
+        artifact = checkpoint.dir / "evaluation_log.csv"
+        artifact.write_text("a,b\n")
+        checkpoint.run_stage("download", lambda: {"eval_log_path": str(artifact)})
+
+        reloaded = RunCheckpoint("run-1", self.root).load()
+        result = reloaded.run_stage("download", lambda: self.fail("stage should not rerun"))
+
+        self.assertEqual(result, {"eval_log_path": str(artifact)})
+        self.assertEqual(reloaded.metadata["lookback_days"], 7)
+
+    def test_missing_artifact_reruns_stage(self):
+        """Test that a stage whose artifact was deleted is not considered complete"""
+        checkpoint = RunCheckpoint("run-1", self.root).create()
+        checkpoint.complete("download", {"eval_log_path": str(checkpoint.dir / "gone.csv")})
+
+        self.assertFalse(checkpoint.is_complete("download"))
+
+    def test_rerunning_a_stage_invalidates_later_stages(self):
+        """Test that later results are dropped when an earlier stage is redone"""
+        checkpoint = RunCheckpoint("run-1", self.root).create()
+        for stage in ("download", "filter", "dataset"):
+            checkpoint.complete(stage, {})
+
+        checkpoint.complete("filter", {"error_count": 3})
+
+        self.assertEqual(checkpoint.completed_stages(), ["download", "filter"])
+
+    def test_load_missing_checkpoint(self):
+        """Test that loading an unknown run raises CheckpointError"""
+        with self.assertRaises(CheckpointError):
+            RunCheckpoint("unknown", self.root).load()
+
+
+class TestResumeRun(unittest.TestCase):
+    """Tests for resuming run_auto_reinforcement"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        patches = [
+            patch("ml_pipeline.auto_reinforcement.RUN_CHECKPOINT_DIR", self.root / "runs"),
+            patch("ml_pipeline.auto_reinforcement.RETRAINED_MODELS_DIR", self.root / "models"),
+            patch("ml_pipeline.auto_reinforcement.insert_system_log"),
+            patch("ml_pipeline.auto_reinforcement.insert_retraining_run"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.update_run = self.start_patch("update_retraining_run")
+        self.update_request = self.start_patch("update_retraining_request")
+        self.upload = self.start_patch("upload_model_artifact")
+
+    def start_patch(self, name):
+        patcher = patch(f"ml_pipeline.auto_reinforcement.{name}")
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_evaluation_log(self, local_path):
+        pd.DataFrame({
+            "predicted_outcome": ["win"] * 12,
+            "actual_outcome": ["loss"] * 12,
+            "confidence": [0.9] * 12,
+        }).to_csv(local_path, index=False)
+        return local_path
+
+    @patch("ml_pipeline.auto_reinforcement.uuid.uuid4", return_value="run-1")
+    @patch("ml_pipeline.auto_reinforcement.run_training")
+    @patch("ml_pipeline.auto_reinforcement.download_evaluation_log")
+    def test_resume_skips_completed_stages(self, mock_download, mock_training, _):
+        """Test that a failed training stage is retried without re-downloading"""
+        mock_download.side_effect = self.write_evaluation_log
+        mock_training.return_value = None
+
+        self.assertFalse(run_auto_reinforcement(lookback_days=7, source="manual", request_id="req-1"))
+        checkpoint = RunCheckpoint("run-1", self.root / "runs").load()
+        self.assertEqual(checkpoint.completed_stages(), ["download", "filter", "dataset"])
+
+        # A child that exits cleanly without reporting an artifact still fails the stage
+        mock_training.return_value = {"metrics": {"accuracy": 0.8}}
+        self.assertFalse(run_auto_reinforcement(resume_run_id="run-1"))
+
+        model_path = self.root / "challenger.pkl"
+        model_path.write_bytes(b"model")
+        mock_training.return_value = {"metrics": {"accuracy": 0.8}, "model_path": str(model_path)}
+        self.assertTrue(run_auto_reinforcement(resume_run_id="run-1"))
+
+        mock_download.assert_called_once()
+        self.assertEqual(mock_training.call_count, 3)
+        datasets = {call[0][0] for call in mock_training.call_args_list}
+        self.assertEqual(len(datasets), 1)
+        self.assertFalse((self.root / "runs" / "run-1").exists())
+
+    @patch("ml_pipeline.auto_reinforcement.evaluate_challenger")
+    @patch("ml_pipeline.auto_reinforcement.run_training")
+    @patch("ml_pipeline.auto_reinforcement.download_evaluation_log")
+    def test_rejected_challenger_is_not_uploaded(self, mock_download, mock_training, mock_gate):
+        """Test that a gate rejection skips the upload and ends the run and request as rejected"""
+        mock_download.side_effect = self.write_evaluation_log
+        model_path = self.root / "challenger.pkl"
+        model_path.write_bytes(b"model")
+        mock_training.return_value = {"metrics": {"accuracy": 0.6}, "model_path": str(model_path)}
+        mock_gate.return_value = {"decision": "reject", "reason": "regression", "metrics": {}}
+
+        self.assertTrue(run_auto_reinforcement(lookback_days=7, source="manual", request_id="req-1"))
+
+        self.upload.assert_not_called()
+        statuses = [call[0][1].get("status") for call in self.update_run.call_args_list]
+        self.assertEqual(statuses[-1], "rejected")
+        self.assertNotIn("completed", statuses)
+        self.update_request.assert_called_once()
+        self.assertEqual(self.update_request.call_args[0][1]["status"], "rejected")
+
+        mock_gate.return_value = {"decision": "promote", "reason": "", "metrics": {}}
+        self.assertTrue(run_auto_reinforcement(lookback_days=7, source="manual", request_id="req-2"))
+        self.upload.assert_called_once_with(str(model_path))
+        self.assertEqual(self.update_request.call_args[0][1]["status"], "completed")
+
+    def test_resume_unknown_run(self):
+        """Test that resuming without a checkpoint fails cleanly"""
+        self.assertFalse(run_auto_reinforcement(resume_run_id="missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
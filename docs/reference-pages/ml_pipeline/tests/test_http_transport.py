@@ -0,0 +1,126 @@
+"""Unit tests for retries and the circuit breaker of the shared HTTP transport"""
+
+import unittest
+from unittest.mock import MagicMock
+
+import httpx
+
+from ml_pipeline.http_transport import CircuitBreaker, CircuitOpenError, call_with_retry, is_transient_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def status_error(status_code):
+    request = httpx.Request("GET", "https://example.supabase.co/rest/v1/system_logs")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+class TestCallWithRetry(unittest.TestCase):
+    """Tests for call_with_retry"""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=FakeClock())
+        self.sleeps = []
+
+    def call(self, operation, **kwargs):
+        return call_with_retry(operation, breaker=self.breaker, sleep=self.sleeps.append, **kwargs)
+
+    def test_transient_errors_are_retried_with_backoff(self):
+        """Test that idempotent calls are retried until they succeed"""
+        operation = MagicMock(side_effect=[httpx.ConnectError("reset"), status_error(503), "ok"])
+
+        self.assertEqual(self.call(operation, max_retries=4), "ok")
+        self.assertEqual(operation.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(all(0 <= delay <= 1.0 for delay in self.sleeps))
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_non_idempotent_calls_are_attempted_once(self):
+        """Test that inserts are not repeated after a transient failure"""
+        operation = MagicMock(side_effect=httpx.ReadTimeout("timeout"))
+
+        with self.assertRaises(httpx.ReadTimeout):
+            self.call(operation, idempotent=False)
+        operation.assert_called_once()
+
+    def test_client_errors_are_not_retried(self):
+        """Test that a 4xx response is raised immediately and does not trip the breaker"""
+        operation = MagicMock(side_effect=status_error(409))
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.call(operation)
+        operation.assert_called_once()
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_open_circuit_fails_fast_until_reset(self):
+        """Test that consecutive failures open the circuit and a later success closes it"""
+        failing = MagicMock(side_effect=httpx.ConnectError("down"))
+        with self.assertRaises(CircuitOpenError):
+            self.call(failing, max_retries=10)
+        self.assertEqual(failing.call_count, 3)
+
+        healthy = MagicMock(return_value="ok")
+        with self.assertRaises(CircuitOpenError):
+            self.call(healthy)
+        healthy.assert_not_called()
+
+        self.breaker.clock.now = 31.0
+        self.assertEqual(self.call(healthy), "ok")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_trial_call_reopens_circuit(self):
+        """Test that a half-open circuit opens again on the first failure"""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.breaker.clock.now = 31.0
+
+        with self.assertRaises(CircuitOpenError):
+            self.call(MagicMock(side_effect=httpx.ConnectError("down")))
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_half_open_admits_one_trial_call(self):
+        """Test that concurrent callers are rejected while the trial call is in flight"""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.breaker.clock.now = 31.0
+
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+        self.breaker.record_success()
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_abandoned_trial_call_is_replaced(self):
+        """Test that a trial call that never reports back frees the slot after reset_timeout"""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.breaker.clock.now = 31.0
+        self.breaker.before_call()
+
+        self.breaker.clock.now = 61.0
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.trial_started_at, 61.0)
+
+
+class TestIsTransientError(unittest.TestCase):
+    """Tests for error classification"""
+
+    def test_classification(self):
+        self.assertTrue(is_transient_error(ConnectionError()))
+        self.assertTrue(is_transient_error(status_error(429)))
+        self.assertFalse(is_transient_error(status_error(404)))
+        self.assertTrue(is_transient_error(MagicMock(spec=Exception, code="502")))
+        self.assertFalse(is_transient_error(ValueError("bad input")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Unit tests for the SQLite/filesystem local backend"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from ml_pipeline.local_backend import LocalSupabaseClient
+from ml_pipeline.supabase_client import (
+    complete_leased_retraining_request,
+    download_file_from_storage,
+    get_pending_retraining_requests,
+    insert_retraining_run,
+    insert_system_logs,
+    lease_retraining_requests,
+    renew_retraining_leases,
+    update_retraining_run,
+    upload_file_to_storage,
+)
+
+
+class TestLocalBackend(unittest.TestCase):
+    """Tests for supabase_client functions running on LocalSupabaseClient"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.client = LocalSupabaseClient(self.root / "backend")
+        patcher = patch("ml_pipeline.supabase_client.get_supabase_client", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.client.close()
+        self.tmp.cleanup()
+
+    def test_runs_insert_and_update(self):
+        """Test that inserted runs get defaults and updates merge fields"""
+        run = insert_retraining_run({"id": "run-1", "source": "manual"})
+        self.assertEqual(run["status"], "pending")
+        self.assertIn("created_at", run)
+
+        updated = update_retraining_run("run-1", {"status": "completed", "metrics": {"accuracy": 0.8}})
+
+        self.assertEqual(updated["source"], "manual")
+        self.assertEqual(updated["metrics"], {"accuracy": 0.8})
+
+    def test_pending_requests_are_ordered(self):
+        """Test that pending requests follow the priority/created_at ordering"""
+        self.client.table("model_retraining_requests").insert([
+            {"id": "a", "priority": "high", "created_at": "2026-01-02T00:00:00+00:00"},
+            {"id": "b", "priority": "normal", "created_at": "2026-01-01T00:00:00+00:00"},
+            {"id": "c", "priority": "normal", "created_at": "2026-01-03T00:00:00+00:00", "status": "completed"},
+            {"id": "d", "priority": "normal", "created_at": "2025-12-31T00:00:00+00:00"},
+        ]).execute()
+
+        self.assertEqual([r["id"] for r in get_pending_retraining_requests()], ["d", "b", "a"])
+
+    def test_concurrent_leases_are_exclusive(self):
+        """Test that workers racing for the same requests never share one"""
+        self.client.table("model_retraining_requests").insert([{"id": f"req-{i}"} for i in range(20)]).execute()
+        leased = {}
+
+        def worker(name):
+            leased[name] = [r["id"] for r in lease_retraining_requests(name, limit=20, lease_seconds=60)]
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        claimed = [request_id for ids in leased.values() for request_id in ids]
+        self.assertEqual(sorted(claimed), sorted(f"req-{i}" for i in range(20)))
+
+    def test_stranded_and_lapsed_leases_are_reclaimed(self):
+        """Test that processing rows without a lease expiry or with a lapsed one can be leased again"""
+        self.client.table("model_retraining_requests").insert([
+            {"id": "stranded", "status": "processing"},
+            {"id": "lapsed", "status": "processing", "leased_by": "w0", "lease_expires_at": "2020-01-01T00:00:00+00:00"},
+            {"id": "held", "status": "processing", "leased_by": "w0", "lease_expires_at": "2999-01-01T00:00:00+00:00"},
+        ]).execute()
+
+        leased = lease_retraining_requests("w1", limit=10, lease_seconds=60)
+
+        self.assertEqual(sorted(r["id"] for r in leased), ["lapsed", "stranded"])
+        self.assertTrue(all(r["leased_by"] == "w1" and r["lease_expires_at"] for r in leased))
+
+    def test_only_the_lease_holder_renews_and_completes(self):
+        """Test that renewal and completion are conditional on holding the lease"""
+        self.client.table("model_retraining_requests").insert([{"id": "a"}, {"id": "b"}]).execute()
+        lease_retraining_requests("w1", limit=1, lease_seconds=60)
+        lease_retraining_requests("w2", limit=1, lease_seconds=60)
+
+        self.assertEqual(renew_retraining_leases("w1", ["a", "b"], lease_seconds=600), ["a"])
+        self.assertFalse(complete_leased_retraining_request("b", "w1", {"status": "completed"}))
+        self.assertTrue(complete_leased_retraining_request("a", "w1", {"status": "completed"}))
+
+        rows = {r["id"]: r for r in self.client.table("model_retraining_requests").select("*").execute().data}
+        self.assertEqual((rows["a"]["status"], rows["b"]["status"]), ("completed", "processing"))
+
+    def test_storage_roundtrip_with_dedup(self):
+        """Test that uploads are stored with their hash and skipped when unchanged"""
+        source = self.root / "model.pkl"
+        source.write_bytes(b"weights" * 10)
+
+        url = upload_file_to_storage("model-artifacts", "models/a.pkl", str(source))
+        first_info = self.client.storage.from_("model-artifacts").info("models/a.pkl")
+        upload_file_to_storage("model-artifacts", "models/a.pkl", str(source))
+
+        self.assertTrue(url.startswith("file://"))
+        self.assertEqual(self.client.storage.from_("model-artifacts").info("models/a.pkl"), first_info)
+        target = download_file_from_storage("model-artifacts", "models/a.pkl", str(self.root / "copy.pkl"))
+        self.assertEqual(Path(target).read_bytes(), source.read_bytes())
+
+    def test_storage_rejects_paths_outside_bucket(self):
+        """Test that object paths cannot escape the bucket directory"""
+        with self.assertRaises(ValueError):
+            self.client.storage.from_("model-artifacts").download("../backend.sqlite3")
+
+    def test_bulk_system_logs(self):
+        """Test that bulk log inserts land in system_logs"""
+        self.assertTrue(insert_system_logs([
+            {"component": "test", "status": "info", "message": "one"},
+            {"component": "test", "status": "error", "message": "two"},
+        ]))
+
+        errors = self.client.table("system_logs").select("message").eq("status", "error").execute().data
+        self.assertEqual(errors, [{"message": "two"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Unit tests for the background system log shipper"""
+
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from ml_pipeline import supabase_client
+from ml_pipeline.log_shipper import SystemLogShipper
+from ml_pipeline.supabase_client import insert_system_log
+
+
+class TestSystemLogShipper(unittest.TestCase):
+    """Tests for SystemLogShipper"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.spool_path = Path(self.tmp.name) / "spool.jsonl"
+
+    def tearDown(self):
+        supabase_client.set_log_shipper(None)
+        self.tmp.cleanup()
+
+    def read_spool(self):
+        with open(self.spool_path) as f:
+            return [json.loads(line) for line in f]
+
+    @patch("ml_pipeline.supabase_client.get_supabase_client")
+    def test_insert_is_queued_and_shipped_in_bulk(self, mock_get_client):
+        """Test that entries are batched into bulk inserts and flushed on stop"""
+        mock_table = MagicMock()
+        mock_get_client.return_value.table.return_value = mock_table
+
+        shipper = SystemLogShipper(spool_path=self.spool_path, batch_size=4, flush_interval=0.05).start()
+        for i in range(10):
+            self.assertTrue(insert_system_log("test_component", "info", f"message {i}"))
+        shipper.stop()
+
+        inserted = [row for call in mock_table.insert.call_args_list for row in call[0][0]]
+        self.assertEqual([row["message"] for row in inserted], [f"message {i}" for i in range(10)])
+        self.assertTrue(all(len(call[0][0]) <= 4 for call in mock_table.insert.call_args_list))
+        self.assertEqual(shipper.stats()["shipped"], 10)
+        self.assertIn("created_at", inserted[0])
+
+    @patch("ml_pipeline.supabase_client.get_supabase_client")
+    def test_offline_entries_are_spooled_and_replayed(self, mock_get_client):
+        """Test that failed batches go to the spool and are replayed once back online"""
+        mock_table = MagicMock()
+        mock_get_client.return_value.table.return_value = mock_table
+        mock_table.insert.return_value.execute.side_effect = Exception("offline")
+
+        shipper = SystemLogShipper(spool_path=self.spool_path, batch_size=10)
+        shipper.submit({"message": "first"})
+        shipper.submit({"message": "second"})
+        self.assertEqual(shipper.flush(), 0)
+        self.assertEqual([e["message"] for e in self.read_spool()], ["first", "second"])
+
+        mock_table.insert.return_value.execute.side_effect = None
+        shipper.submit({"message": "third"})
+        self.assertEqual(shipper.flush(), 1)
+
+        self.assertFalse(self.spool_path.exists())
+        batches = [[row["message"] for row in call[0][0]] for call in mock_table.insert.call_args_list[-2:]]
+        self.assertEqual(batches, [["first", "second"], ["third"]])
+        self.assertEqual(shipper.stats()["replayed"], 2)
+
+    def test_full_queue_spools_instead_of_blocking(self):
+        """Test that a full queue never blocks the caller"""
+        shipper = SystemLogShipper(spool_path=self.spool_path, max_queue_size=1)
+
+        self.assertTrue(shipper.submit({"message": "queued"}))
+        self.assertFalse(shipper.submit({"message": "overflow"}))
+        self.assertEqual([e["message"] for e in self.read_spool()], ["overflow"])
+
+    def test_submit_is_cheap(self):
+        """Test that queuing an entry stays in the microsecond range"""
+        shipper = SystemLogShipper(spool_path=self.spool_path, max_queue_size=20000)
+        supabase_client.set_log_shipper(shipper)
+
+        start = time.perf_counter()
+        for i in range(10000):
+            insert_system_log("test_component", "info", "message", {"i": i})
+        per_call_us = (time.perf_counter() - start) / 10000 * 1e6
+
+        self.assertLess(per_call_us, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Unit tests for streamed multi-source evaluation-log input"""
+
+import gzip
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from ml_pipeline.log_sources import find_rare_patterns_in_sources, pa, resolve_log_sources
+from ml_pipeline.rare_pattern_finder import find_rare_patterns
+from ml_pipeline.tests.test_rare_pattern_finder import evaluation_log
+
+
+def comparable(patterns):
+    """Drop wall-clock fields so two discovery runs can be compared"""
+    return [
+        {k: v for k, v in p.items() if k not in ("discovered_at", "expires_at")}
+        for p in patterns
+    ]
+
+
+class TestFindRarePatternsInSources(unittest.TestCase):
+    """Tests for find_rare_patterns_in_sources"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.df = evaluation_log()
+        self.df.loc[5, "actual_result"] = None
+        self.df.to_csv(self.dir / "full.csv", index=False)
+        self.expected = comparable(find_rare_patterns(str(self.dir / "full.csv")))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_glob_over_plain_and_gzip_shards(self):
+        """Test that shards read in small chunks match the concatenated log"""
+        shards = self.dir / "shards"
+        shards.mkdir()
+        self.df.iloc[:100].to_csv(shards / "day1.csv", index=False)
+        self.df.iloc[100:250].to_csv(shards / "day2.csv.gz", index=False)
+        self.df.iloc[250:].to_csv(shards / "day3.csv", index=False)
+
+        patterns = find_rare_patterns_in_sources([str(shards / "day*")], chunk_rows=40)
+
+        self.assertEqual(comparable(patterns), self.expected)
+
+    @unittest.skipUnless(pa, "pyarrow not installed")
+    def test_parquet_and_arrow_sources(self):
+        """Test that Parquet and Feather shards stream like CSV"""
+        self.df.iloc[:150].to_parquet(self.dir / "a.parquet", index=False)
+        self.df.iloc[150:].reset_index(drop=True).to_feather(self.dir / "b.feather")
+
+        patterns = find_rare_patterns_in_sources(
+            [str(self.dir / "a.parquet"), str(self.dir / "b.feather")], chunk_rows=64
+        )
+
+        self.assertEqual(comparable(patterns), self.expected)
+
+    def test_gzip_stdin(self):
+        """Test that gzip-compressed CSV on stdin is detected and decompressed"""
+        data = gzip.compress(self.df.to_csv(index=False).encode())
+        stdin = type("Stdin", (), {"buffer": io.BufferedReader(io.BytesIO(data))})()
+
+        with patch("sys.stdin", stdin):
+            patterns = find_rare_patterns_in_sources(["-"])
+
+        self.assertEqual(comparable(patterns), self.expected)
+
+    def test_missing_sources_and_columns(self):
+        """Test that empty globs and shards without required columns are rejected"""
+        with self.assertRaises(FileNotFoundError):
+            resolve_log_sources([str(self.dir / "missing-*.csv")])
+
+        self.df.drop(columns=["confidence"]).to_csv(self.dir / "bad.csv", index=False)
+        with self.assertRaises(ValueError):
+            find_rare_patterns_in_sources([str(self.dir / "full.csv"), str(self.dir / "bad.csv")])
+
+
+if __name__ == "__main__":
+    unittest.main()
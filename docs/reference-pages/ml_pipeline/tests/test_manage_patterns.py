@@ -0,0 +1,237 @@
+"""Unit tests for chunked and differential pattern sync"""
+
+import asyncio
+import gzip
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ml_pipeline.http_transport import CircuitBreaker, async_call_with_retry
+from ml_pipeline.manage_patterns import PatternManager, load_sync_manifest
+
+SUPABASE_URL = "https://example.supabase.co"
+
+# Retry backoff is patched out in tests; in-flight requests still yield
+real_sleep = asyncio.sleep
+
+
+class FakeResponse:
+    """aiohttp-style response that stays in flight briefly"""
+
+    def __init__(self, session, status, payload):
+        self.session = session
+        self.status = status
+        self.payload = payload
+
+    async def __aenter__(self):
+        self.session.in_flight += 1
+        self.session.max_in_flight = max(self.session.max_in_flight, self.session.in_flight)
+        await real_sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.session.in_flight -= 1
+        return False
+
+    async def json(self):
+        return self.payload
+
+    async def text(self):
+        return "rejected"
+
+
+class FakeSession:
+    """Records posted chunks; statuses[first key in chunk] are returned in turn before 200"""
+
+    def __init__(self, statuses=None):
+        self.statuses = statuses or {}
+        self.requests = []
+        self.expired = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def post(self, url, data, headers):
+        if headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        payload = json.loads(data)
+        patterns = payload["patterns"]
+        expired = payload.get("expired_keys", [])
+        self.requests.append((headers, patterns))
+        self.expired.extend(expired)
+        first_key = patterns[0]["pattern_key"] if patterns else expired[0]
+        pending = self.statuses.get(first_key, [])
+        status = pending.pop(0) if pending else 200
+        return FakeResponse(self, status, {"synced": len(patterns)})
+
+
+def patterns(count, expires_at="2099-01-01T00:00:00+00:00Z"):
+    return [
+        {"pattern_key": f"p{i}", "accuracy_pct": 90.0, "frequency_pct": 1.0, "sample_size": 10, "expires_at": expires_at}
+        for i in range(count)
+    ]
+
+
+def run_sync(session, method, *args, **kwargs):
+    """Run a PatternManager sync method against a fake session"""
+    manager = PatternManager(SUPABASE_URL, "key")
+    manager._get_session = MagicMock(return_value=session)
+
+    async def retry(operation, description):
+        return await async_call_with_retry(operation, description, breaker=CircuitBreaker())
+
+    with patch("ml_pipeline.manage_patterns.aiohttp", MagicMock()), \
+            patch("ml_pipeline.manage_patterns.async_call_with_retry", retry), \
+            patch("ml_pipeline.http_transport.asyncio.sleep", AsyncMock()):
+        return asyncio.run(getattr(manager, method)(*args, **kwargs))
+
+
+class TestSyncPatterns(unittest.TestCase):
+    """Tests for PatternManager.sync_patterns"""
+
+    def sync(self, session, items, **kwargs):
+        return run_sync(session, "sync_patterns", items, **kwargs)
+
+    def test_chunks_are_compressed_and_bounded(self):
+        """Test that patterns go out in gzip chunks with limited concurrency"""
+        session = FakeSession()
+
+        result = self.sync(session, patterns(450), batch_size=100, max_concurrency=2)
+
+        self.assertEqual(result, {
+            "synced": 450, "expired": 0, "chunks": 5, "failed_chunks": 0, "failed_patterns": 0,
+            "failed_keys": [], "errors": [],
+        })
+        self.assertEqual(
+            sorted(p["pattern_key"] for _, chunk in session.requests for p in chunk),
+            sorted(f"p{i}" for i in range(450)),
+        )
+        self.assertTrue(all(h == {"Content-Encoding": "gzip"} for h, _ in session.requests))
+        self.assertEqual(session.max_in_flight, 2)
+
+    def test_failed_chunk_does_not_fail_the_rest(self):
+        """Test that transient failures are retried per chunk and rejections are reported"""
+        session = FakeSession({"p0": [503], "p100": [400]})
+
+        result = self.sync(session, patterns(250), batch_size=100, compress=False)
+
+        self.assertEqual(result["synced"], 150)
+        self.assertEqual((result["failed_chunks"], result["failed_patterns"]), (1, 100))
+        self.assertEqual(result["errors"], ["Patterns 100-199: Sync failed: 400 - rejected"])
+        self.assertEqual(len(session.requests), 4)
+        self.assertEqual(session.requests[0][0], {})
+
+    def test_no_patterns_sends_nothing(self):
+        """Test that an empty list makes no requests"""
+        session = FakeSession()
+
+        result = self.sync(session, [])
+
+        self.assertEqual((result["synced"], result["chunks"]), (0, 0))
+        self.assertEqual(session.requests, [])
+
+    def test_expirations_are_chunked_separately(self):
+        """Test that expired keys go out in their own chunks"""
+        session = FakeSession({"old3": [400]})
+
+        result = self.sync(
+            session, patterns(2), batch_size=3, expired_keys=[f"old{i}" for i in range(5)]
+        )
+
+        self.assertEqual((result["synced"], result["expired"], result["chunks"]), (2, 3, 3))
+        self.assertEqual(result["failed_keys"], ["old3", "old4"])
+        self.assertEqual(result["errors"], ["Expirations 3-4: Sync failed: 400 - rejected"])
+
+
+class TestSyncChangedPatterns(unittest.TestCase):
+    """Tests for PatternManager.sync_changed_patterns"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manifest = str(Path(self.tmp.name) / "manifest.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self, session, items, **kwargs):
+        return run_sync(session, "sync_changed_patterns", items, manifest_path=self.manifest, **kwargs)
+
+    def sent_keys(self, session):
+        return sorted(p["pattern_key"] for _, chunk in session.requests for p in chunk)
+
+    def test_only_changes_are_sent(self):
+        """Test that unchanged patterns are skipped and changed, new and removed ones are sent"""
+        self.sync(FakeSession(), patterns(5))
+        current = patterns(5, expires_at="2099-02-01T00:00:00+00:00Z")[1:]
+        current[0]["accuracy_pct"] = 85.0
+        current.append({"pattern_key": "p9", "sample_size": 10, "expires_at": current[1]["expires_at"]})
+        session = FakeSession()
+
+        result = self.sync(session, current)
+
+        self.assertEqual(self.sent_keys(session), ["p1", "p9"])
+        self.assertEqual(session.expired, ["p0"])
+        self.assertEqual(
+            (result["inserted"], result["updated"], result["refreshed"], result["unchanged"], result["expired"]),
+            (1, 1, 0, 3, 1),
+        )
+        manifest = load_sync_manifest(self.manifest, f"{SUPABASE_URL}/functions/v1/rare-pattern-sync")
+        self.assertEqual(sorted(manifest), ["p1", "p2", "p3", "p4", "p9"])
+
+    def test_full_sync_and_expiry_refresh(self):
+        """Test that --full resends everything and near-expiry patterns are refreshed"""
+        self.sync(FakeSession(), patterns(3))
+        session = FakeSession()
+        result = self.sync(session, patterns(3), full=True)
+        self.assertEqual((self.sent_keys(session), result["updated"]), (["p0", "p1", "p2"], 3))
+
+        soon = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat() + "Z"
+        self.sync(FakeSession(), patterns(3, expires_at=soon))
+        session = FakeSession()
+        result = self.sync(session, patterns(3, expires_at=soon))
+        self.assertEqual((self.sent_keys(session), result["refreshed"]), (["p0", "p1", "p2"], 3))
+
+    def test_metric_drift_within_rounding_is_not_resent(self):
+        """Test that new log rows nudging metrics and examples do not resend a pattern"""
+        self.sync(FakeSession(), patterns(3))
+        current = patterns(3)
+        for pattern in current:
+            pattern.update(accuracy_pct=90.3, frequency_pct=1.04, sample_size=11, supporting_matches=[{"match_id": 1}])
+        session = FakeSession()
+
+        result = self.sync(session, current)
+
+        self.assertEqual((session.requests, result["unchanged"]), ([], 3))
+
+    def test_scopes_do_not_expire_each_other(self):
+        """Test that syncing one discovery configuration leaves other scopes' patterns live"""
+        self.sync(FakeSession(), patterns(3), scope="triple")
+        session = FakeSession()
+
+        result = self.sync(session, [{"pattern_key": "league=EPL|p0", "expires_at": "2099-01-01T00:00:00Z"}], scope="league")
+
+        self.assertEqual((session.expired, result["expired"]), ([], 0))
+        target = f"{SUPABASE_URL}/functions/v1/rare-pattern-sync"
+        self.assertEqual(sorted(load_sync_manifest(self.manifest, target, "triple")), ["p0", "p1", "p2"])
+
+        session = FakeSession()
+        self.sync(session, patterns(1), scope="triple", expire=False)
+        self.assertEqual(session.expired, [])
+        self.sync(session, patterns(1), scope="triple")
+        self.assertEqual(session.expired, ["p1", "p2"])
+
+    def test_failed_chunk_is_retried_next_run(self):
+        """Test that keys from a failed chunk stay out of the manifest"""
+        self.sync(FakeSession({"p2": [400]}), patterns(4), batch_size=2)
+        session = FakeSession()
+
+        result = self.sync(session, patterns(4), batch_size=2)
+
+        self.assertEqual(self.sent_keys(session), ["p2", "p3"])
+        self.assertEqual((result["inserted"], result["unchanged"]), (2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
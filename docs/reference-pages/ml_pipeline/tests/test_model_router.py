@@ -0,0 +1,139 @@
+"""Unit tests for the traffic-split router"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from ml_pipeline.model_registry import ModelCache
+from ml_pipeline.model_router import RoutingError, TrafficRouter, build_routing_table
+
+
+class TestBuildRoutingTable(unittest.TestCase):
+    """Tests for routing table construction"""
+
+    def setUp(self):
+        self.registry = [
+            {"id": "champion", "status": "active", "traffic_allocation": 90},
+            {"id": "candidate", "status": "candidate", "traffic_allocation": 10},
+            {"id": "shadow", "status": "shadow", "traffic_allocation": 0},
+            {"id": "retired", "status": "retired", "traffic_allocation": 0},
+        ]
+
+    def test_allocation_split(self):
+        """Test that slots follow the registry percentages"""
+        table = build_routing_table(self.registry, slots=1000)
+
+        self.assertEqual(len(table), 1000)
+        self.assertEqual(table.count("champion"), 900)
+        self.assertEqual(table.count("candidate"), 100)
+
+    def test_uneven_allocations_fill_every_slot(self):
+        """Test that allocations not summing to 100 are normalized"""
+        registry = [
+            {"id": "a", "status": "active", "traffic_allocation": 1},
+            {"id": "b", "status": "candidate", "traffic_allocation": 1},
+            {"id": "c", "status": "candidate", "traffic_allocation": 1},
+        ]
+        table = build_routing_table(registry, slots=100)
+
+        self.assertEqual(len(table), 100)
+        self.assertEqual(sorted(table.count(m) for m in "abc"), [33, 33, 34])
+
+    def test_zero_allocation_routes_to_champion(self):
+        """Test that the active model takes all traffic when no allocation is set"""
+        registry = [{**entry, "traffic_allocation": 0} for entry in self.registry]
+
+        self.assertEqual(set(build_routing_table(registry, slots=10)), {"champion"})
+
+    def test_no_serving_models(self):
+        """Test that a registry without serving models is rejected"""
+        with self.assertRaises(RoutingError):
+            build_routing_table(self.registry[2:])
+
+
+class TestTrafficRouter(unittest.TestCase):
+    """Tests for TrafficRouter"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        model = LogisticRegression().fit(np.random.rand(20, 2), np.array([0, 1] * 10))
+
+        models = []
+        for name, status, allocation in (("champion", "active", 90), ("candidate", "candidate", 10)):
+            joblib.dump(model, root / f"{name}.pkl")
+            models.append({
+                "id": name,
+                "status": status,
+                "traffic_allocation": allocation,
+                "path": str(root / f"{name}.pkl"),
+            })
+
+        registry_path = root / "model_registry.json"
+        registry_path.write_text(json.dumps({"models": models}))
+        self.router = TrafficRouter(ModelCache(registry_path=registry_path), features=["f1", "f2"])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_assignment_is_deterministic(self):
+        """Test that a fixture always routes to the same model"""
+        self.assertEqual(
+            [self.router.assign(f"fixture-{i}") for i in range(100)],
+            [self.router.assign(f"fixture-{i}") for i in range(100)],
+        )
+
+    def test_assignment_follows_allocation(self):
+        """Test that hashed fixtures follow the 90/10 split"""
+        assignments = [self.router.assign(i) for i in range(20000)]
+        candidate_share = assignments.count("candidate") / len(assignments)
+
+        self.assertAlmostEqual(candidate_share, 0.10, delta=0.02)
+
+    def test_predict_records_stats(self):
+        """Test that in-process predictions update per-model counters"""
+        self.router.load_models()
+        for i in range(50):
+            result = self.router.predict(i, {"f1": 0.5, "f2": 0.5})
+            self.assertEqual(result["model_id"], self.router.assign(i))
+
+        stats = self.router.stats()
+        self.assertEqual(sum(s["requests"] for s in stats.values()), 50)
+        self.assertEqual(sum(s["errors"] for s in stats.values()), 0)
+
+    def test_predict_missing_feature(self):
+        """Test that a missing feature raises ValueError and counts as an error"""
+        self.router.load_models()
+
+        with self.assertRaises(ValueError):
+            self.router.predict("fixture", {"f1": 0.5})
+
+        model_id = self.router.assign("fixture")
+        self.assertEqual(self.router.stats()[model_id]["errors"], 1)
+
+    def test_refresh_replaces_model_references(self):
+        """Test that a refresh after a cache reload serves the reloaded models"""
+        self.router.load_models()
+        cache = self.router.model_cache
+        registry = json.loads(cache.registry_path.read_text())
+        registry["models"] = registry["models"][:1]
+        cache.registry_path.write_text(json.dumps(registry))
+        previous = cache.get("champion")
+
+        cache.reload(["champion"])
+        self.router.refresh()
+
+        self.assertEqual(self.router.allocation(), {"champion": 100.0})
+        result = self.router.predict("fixture", {"f1": 0.5, "f2": 0.5})
+        self.assertEqual(result["model_id"], "champion")
+        self.assertIsNot(self.router._models["champion"], previous)
+        self.assertEqual(list(self.router._models), ["champion"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Unit tests for multi-dimensional rare-pattern mining"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ml_pipeline.pattern_mining import mine_itemsets, mine_rare_patterns
+from ml_pipeline.rare_pattern_finder import find_rare_patterns
+
+
+def evaluation_log(rows: int = 4000, seed: int = 7) -> pd.DataFrame:
+    """Log where league L3 on model v2 is rare and almost always right"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "predicted_result": rng.choice(["home_win", "draw", "away_win"], rows),
+        "confidence": rng.random(rows).round(3),
+        "btts_prediction": rng.random(rows) < 0.5,
+        "template_name": rng.choice(["baseline", "late_goals"], rows),
+        "league": rng.choice([f"L{i}" for i in range(8)], rows),
+        "model_version": rng.choice(["v1", "v2", "v3"], rows),
+    })
+    boosted = (df["league"] == "L3") & (df["model_version"] == "v2")
+    correct = rng.random(rows) < np.where(boosted, 0.97, 0.5)
+    df["actual_result"] = np.where(correct, df["predicted_result"], "other")
+    return df
+
+
+class TestMineRarePatterns(unittest.TestCase):
+    """Tests for mine_rare_patterns"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "evaluation_log.csv"
+        evaluation_log().to_csv(self.log_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_finds_cross_attribute_pattern(self):
+        """Test that a pattern spanning league and model version is surfaced"""
+        patterns = mine_rare_patterns(
+            str(self.log_path), attributes=["league", "model_version"], min_sample_size=20, workers=1
+        )
+
+        self.assertEqual(patterns[0]["pattern_key"], "league=L3|model_version=v2")
+        self.assertEqual(patterns[0]["label"], "League: L3 Model Version: v2")
+        self.assertLess(patterns[0]["frequency_pct"], 5.0)
+        self.assertEqual(len(patterns[0]["supporting_matches"]), 10)
+        self.assertEqual(
+            set(patterns[0]),
+            set(find_rare_patterns(str(self.log_path), accuracy_threshold=0.0, frequency_threshold=1.0)[0]),
+        )
+
+    def test_fixed_triple_matches_find_rare_patterns(self):
+        """Test that mining the classic triple reproduces find_rare_patterns' statistics"""
+        kwargs = {"frequency_threshold": 0.2, "accuracy_threshold": 0.5, "min_sample_size": 5}
+        mined = mine_rare_patterns(
+            str(self.log_path),
+            attributes=["predicted_result", "btts_prediction", "template_name"],
+            workers=1,
+            **kwargs,
+        )
+        triples = [p for p in mined if p["pattern_key"].count("|") == 2]
+        expected = find_rare_patterns(str(self.log_path), **kwargs)
+
+        stats = lambda patterns: sorted((p["sample_size"], p["accuracy_pct"]) for p in patterns)  # noqa: E731
+        self.assertEqual(stats(triples), stats(expected))
+
+    def test_parallel_counting_matches_in_process(self):
+        """Test that worker processes count the same itemsets"""
+        kwargs = {"min_sample_size": 20, "time_budget_seconds": 120}
+        serial = mine_rare_patterns(str(self.log_path), workers=1, **kwargs)
+        parallel = mine_rare_patterns(str(self.log_path), workers=2, **kwargs)
+
+        strip = lambda patterns: [(p["pattern_key"], p["sample_size"]) for p in patterns]  # noqa: E731
+        self.assertEqual(strip(serial), strip(parallel))
+
+
+class TestMineItemsets(unittest.TestCase):
+    """Tests for the level-wise counting engine"""
+
+    def test_infrequent_items_prune_supersets(self):
+        """Test that supersets of an infrequent item are never counted"""
+        codes = np.array([[0, 0]] * 10 + [[1, 0]] * 2 + [[0, 1]] * 10)
+        frequent, truncated = mine_itemsets(
+            codes, np.ones(len(codes), dtype=bool), [2, 2], min_support=5, workers=1
+        )
+
+        self.assertFalse(truncated)
+        self.assertEqual(frequent[(0,)][0].tolist(), [0])
+        self.assertEqual(frequent[(0, 1)][0].tolist(), [0, 1])
+        self.assertEqual(frequent[(0, 1)][1].tolist(), [10, 10])
+
+    def test_time_budget_returns_partial_result(self):
+        """Test that an exhausted budget stops mining and flags truncation"""
+        codes = np.zeros((100, 3), dtype=np.int64)
+        frequent, truncated = mine_itemsets(
+            codes, np.ones(100, dtype=bool), [1, 1, 1], min_support=1, workers=1, time_budget_seconds=0
+        )
+
+        self.assertTrue(truncated)
+        self.assertEqual(frequent, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Unit tests for the incremental pattern counter store"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from ml_pipeline.pattern_store import PatternCounterStore
+from ml_pipeline.rare_pattern_finder import find_rare_patterns
+from ml_pipeline.tests.test_rare_pattern_finder import evaluation_log
+
+
+def comparable(patterns):
+    """Drop wall-clock fields so two discovery runs can be compared"""
+    return [
+        {k: v for k, v in p.items() if k not in ("discovered_at", "expires_at")}
+        for p in patterns
+    ]
+
+
+class TestPatternCounterStore(unittest.TestCase):
+    """Tests for PatternCounterStore"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "evaluation_log.csv"
+        self.store = PatternCounterStore(str(Path(self.tmp.name) / "counters.sqlite3"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def append(self, df: pd.DataFrame) -> None:
+        df.to_csv(self.log_path, mode="a", index=False, header=not self.log_path.exists())
+
+    def test_appends_match_full_scan(self):
+        """Test that counters built over several appends match a full re-scan"""
+        df = evaluation_log()
+        self.append(df.iloc[:100])
+        self.store.update(str(self.log_path))
+        self.append(df.iloc[100:])
+
+        stats = self.store.update(str(self.log_path), chunk_rows=50)
+
+        self.assertEqual(stats["rows_applied"], 212)
+        self.assertFalse(stats["rebuilt"])
+        self.assertEqual(self.store.update(str(self.log_path))["rows_applied"], 0)
+        self.assertEqual(
+            comparable(self.store.find_rare_patterns()),
+            comparable(find_rare_patterns(str(self.log_path))),
+        )
+
+    def test_partial_trailing_line_is_deferred(self):
+        """Test that a half-written last row is applied once it is complete"""
+        df = evaluation_log()
+        self.append(df.iloc[:10])
+        line = df.iloc[10:11].to_csv(index=False, header=False)
+        with open(self.log_path, "a") as f:
+            f.write(line[:15])
+
+        self.assertEqual(self.store.update(str(self.log_path))["rows_applied"], 10)
+
+        with open(self.log_path, "a") as f:
+            f.write(line[15:])
+        self.assertEqual(self.store.update(str(self.log_path))["rows_applied"], 1)
+        self.assertEqual(self.store.counters()["total"].sum(), 11)
+
+    def test_reappended_prediction_replaces_earlier_result(self):
+        """Test that a corrected actual_result supersedes the original row"""
+        df = evaluation_log()
+        df.insert(0, "prediction_id", [f"p{i}" for i in range(len(df))])
+        df.loc[5, "actual_result"] = "draw"  # rare pattern row recorded wrongly
+        df.loc[31, "actual_result"] = None  # not yet settled
+        self.append(df)
+        self.store.update(str(self.log_path))
+        self.assertEqual(self.store.find_rare_patterns()[0]["accuracy_pct"], 90.91)
+
+        corrections = df.loc[[5, 31]].assign(actual_result="away_win")
+        self.append(corrections)
+        stats = self.store.update(str(self.log_path))
+
+        self.assertEqual(stats["corrections"], 2)
+        pattern = self.store.find_rare_patterns()[0]
+        self.assertEqual(pattern["sample_size"], 12)
+        self.assertEqual(pattern["accuracy_pct"], 100.0)
+        self.assertEqual(pattern["supporting_matches"][0]["match_id"], 5)
+        self.assertEqual(self.store.counters()["total"].sum(), 312)
+
+    def test_rewritten_log_triggers_rebuild(self):
+        """Test that editing already-applied rows rebuilds the counters"""
+        df = evaluation_log()
+        self.append(df)
+        self.store.update(str(self.log_path))
+
+        df.loc[0, "actual_result"] = "away_win"
+        df.to_csv(self.log_path, index=False)
+        stats = self.store.update(str(self.log_path))
+
+        self.assertTrue(stats["rebuilt"])
+        self.assertEqual(stats["rows_applied"], 312)
+        self.assertEqual(
+            comparable(self.store.find_rare_patterns()),
+            comparable(find_rare_patterns(str(self.log_path))),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
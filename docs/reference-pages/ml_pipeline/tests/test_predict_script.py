@@ -0,0 +1,59 @@
+"""Unit tests for the single-row fast path in scripts/predict.py"""
+
+import importlib.util
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "scripts" / "predict.py"
+spec = importlib.util.spec_from_file_location("predict_script", SCRIPT_PATH)
+predict_script = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(predict_script)
+
+FEATURES = ["team_a_rolling_xG", "team_b_rolling_xG", "head_to_head_score", "venue_advantage"]
+
+
+class TestFastPredictor(unittest.TestCase):
+    """Tests for FastPredictor"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.X = pd.DataFrame(rng.normal(size=(300, len(FEATURES))), columns=FEATURES)
+        self.y = (self.X["team_a_rolling_xG"] - self.X["team_b_rolling_xG"] + rng.normal(0, 0.5, 300) > 0).astype(int)
+        self.rows = [dict(zip(FEATURES, values)) for values in rng.normal(size=(50, len(FEATURES))).tolist()]
+
+    def assert_matches_predict_match(self, model):
+        predictor = predict_script.FastPredictor(model, FEATURES)
+        for row in self.rows:
+            expected = predict_script.predict_match(model, FEATURES, row)
+            result = predictor.predict(row)
+
+            self.assertEqual(result["prediction"], expected["prediction"])
+            self.assertEqual(result["confidence"], expected["confidence"])
+            self.assertAlmostEqual(result["probability"], expected["probability"], places=12)
+
+    def test_logistic_regression_matches_predict_match(self):
+        """Test that the coefficient path agrees with scikit-learn's predict_proba"""
+        self.assert_matches_predict_match(LogisticRegression().fit(self.X, self.y))
+
+    def test_decision_tree_matches_predict_match(self):
+        """Test that the tree walk agrees with scikit-learn's predict_proba"""
+        self.assert_matches_predict_match(DecisionTreeClassifier(max_depth=6, random_state=0).fit(self.X, self.y))
+
+    def test_output_buffer_is_reused(self):
+        """Test that predict_proba writes into the same preallocated array on every call"""
+        for model in (LogisticRegression().fit(self.X, self.y), DecisionTreeClassifier(random_state=0).fit(self.X, self.y)):
+            predictor = predict_script.FastPredictor(model, FEATURES)
+            first = predictor.predict_proba(self.rows[0])
+            second = predictor.predict_proba(self.rows[1])
+
+            self.assertIs(first, second)
+            np.testing.assert_allclose(second, model.predict_proba(pd.DataFrame([self.rows[1]]))[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+"""Unit tests for the model cache and prediction server"""
+
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import joblib
+import numpy as np
+import yaml
+from sklearn.linear_model import LogisticRegression
+
+from ml_pipeline.model_registry import (
+    ModelCache,
+    ModelIntegrityError,
+    ModelNotFoundError,
+    file_sha256,
+    prefork_workers,
+    register_model_artifact,
+)
+from ml_pipeline.prediction_server import PredictionServer
+
+
+class CountingModel:
+    """Model stub that records how many predict_proba calls it receives"""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(len(X))
+        positive = np.clip(np.asarray(X)[:, 0], 0.0, 1.0)
+        return np.column_stack([1.0 - positive, positive])
+
+
+class PredictionServerTestCase(unittest.TestCase):
+    """Base fixture writing a config, registry and model artifacts to a temp dir"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+
+        model = LogisticRegression().fit(np.random.rand(20, 2), np.array([0, 1] * 10))
+        self.registry = {"models": []}
+        for name in ("champion", "candidate", "spare"):
+            joblib.dump(model, root / f"{name}.pkl")
+            self.registry["models"].append({
+                "id": name,
+                "name": name,
+                "status": "active" if name == "champion" else "candidate",
+                "path": str(root / f"{name}.pkl"),
+            })
+
+        self.registry_path = root / "model_registry.json"
+        self.registry_path.write_text(json.dumps(self.registry))
+
+        self.config_path = root / "model_config.yaml"
+        self.config_path.write_text(yaml.safe_dump({
+            "inference": {"active_model_id": "champion", "input_features": ["f1", "f2"]},
+        }))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class TestModelCache(PredictionServerTestCase):
+    """Tests for ModelCache"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used model is evicted"""
+        cache = ModelCache(max_size=2, registry_path=self.registry_path)
+        cache.get("champion")
+        cache.get("candidate")
+        cache.get("champion")
+        cache.get("spare")
+
+        self.assertEqual(cache.cached_ids(), ["champion", "spare"])
+
+    def test_missing_artifact(self):
+        """Test that unknown models raise ModelNotFoundError"""
+        cache = ModelCache(registry_path=self.registry_path)
+
+        with self.assertRaises(ModelNotFoundError):
+            cache.get("does_not_exist")
+
+    def test_reload_keeps_resident_model_on_failure(self):
+        """Test that a failed warm reload keeps serving the old model"""
+        cache = ModelCache(registry_path=self.registry_path)
+        original = cache.get("champion")
+        Path(self.registry["models"][0]["path"]).unlink()
+
+        self.assertEqual(cache.reload(), [])
+        self.assertIs(cache.get("champion"), original)
+
+
+    def test_memory_budget_evicts_unpinned_models(self):
+        """Test that the byte budget evicts LRU models but keeps pinned ones"""
+        cache = ModelCache(max_size=10, registry_path=self.registry_path, max_bytes=250)
+        cache.pin("champion")
+        cache.put("champion", object(), size=100)
+        cache.put("candidate", object(), size=100)
+        cache.put("spare", object(), size=100)
+
+        self.assertEqual(cache.cached_ids(), ["champion", "spare"])
+        metrics = cache.metrics()
+        self.assertEqual(metrics["evictions"], 1)
+        self.assertEqual(metrics["resident_bytes"], 200)
+
+    def test_hit_and_load_metrics(self):
+        """Test that hits, misses and loads are counted"""
+        cache = ModelCache(registry_path=self.registry_path)
+        cache.get("champion")
+        cache.get("champion")
+
+        metrics = cache.metrics()
+        self.assertEqual((metrics["hits"], metrics["misses"], metrics["loads"]), (1, 1, 1))
+
+    def test_registry_hash_is_verified(self):
+        """Test that artifacts not matching the registry sha256 are rejected"""
+        entries = self.registry["models"]
+        entries[0]["sha256"] = file_sha256(Path(entries[0]["path"]))
+        entries[1]["sha256"] = "0" * 64
+        self.registry_path.write_text(json.dumps(self.registry))
+        cache = ModelCache(registry_path=self.registry_path)
+
+        cache.get("champion")
+        with self.assertRaises(ModelIntegrityError):
+            cache.get("candidate")
+        self.assertEqual(cache.metrics()["integrity_failures"], 1)
+
+    def test_tampered_artifact_is_rejected(self):
+        """Test that an artifact changed after registration is refused on load"""
+        path = Path(self.registry["models"][0]["path"])
+        entry = register_model_artifact("champion", path, self.registry_path)
+        self.assertEqual(entry["sha256"], file_sha256(path))
+        ModelCache(registry_path=self.registry_path).get("champion")
+
+        with open(path, "ab") as f:
+            f.write(b"tampered")
+
+        with self.assertRaises(ModelIntegrityError):
+            ModelCache(registry_path=self.registry_path).get("champion")
+
+    def test_missing_hash_warns_or_fails_strict(self):
+        """Test that entries without a sha256 load with a warning unless hashes are required"""
+        with self.assertLogs("ml_pipeline.model_registry", "WARNING") as logs:
+            ModelCache(registry_path=self.registry_path).get("champion")
+        self.assertIn("No sha256", logs.output[0])
+
+        with self.assertRaises(ModelIntegrityError):
+            ModelCache(registry_path=self.registry_path, require_sha256=True).get("champion")
+
+    def test_prefork_workers_share_loaded_models(self):
+        """Test that forked workers see models loaded by the parent without reloading"""
+        cache = ModelCache(registry_path=self.registry_path)
+        output = Path(self.tmp.name) / "worker.json"
+
+        processes = prefork_workers(cache, ["champion", "candidate"], 1, _report_cache, cache, output)
+        for process in processes:
+            process.join(10)
+
+        report = json.loads(output.read_text())
+        self.assertEqual(sorted(report["models"]), ["candidate", "champion"])
+        self.assertEqual(report["loads"], 2)
+
+
+def _report_cache(cache, output):
+    """Worker entry point recording what a forked process sees"""
+    cache.get("champion")
+    output.write_text(json.dumps({"models": cache.cached_ids(), "loads": cache.metrics()["loads"]}))
+
+
+class TestPredictionServer(PredictionServerTestCase):
+    """Tests for PredictionServer"""
+
+    def test_preload_serving_models(self):
+        """Test that the active and candidate models are preloaded"""
+        server = PredictionServer(config_path=self.config_path, registry_path=self.registry_path)
+
+        self.assertEqual(server.preload(), ["champion", "candidate", "spare"])
+
+    def test_concurrent_requests_are_micro_batched(self):
+        """Test that concurrent requests share one predict_proba call"""
+        server = PredictionServer(
+            config_path=self.config_path,
+            registry_path=self.registry_path,
+            max_wait_ms=50,
+        )
+        model = CountingModel()
+        server.model_cache.put("champion", model)
+
+        async def run():
+            requests = [server.predict({"f1": i / 10, "f2": 0.0}) for i in range(8)]
+            return await asyncio.gather(*requests)
+
+        results = asyncio.run(run())
+
+        self.assertEqual(model.calls, [8])
+        self.assertEqual(results[7]["prediction"], 1)
+        self.assertAlmostEqual(results[3]["probabilities"]["1"], 0.3)
+
+    def test_fixture_requests_use_traffic_split(self):
+        """Test that fixture requests are routed and counted per model"""
+        server = PredictionServer(config_path=self.config_path, registry_path=self.registry_path)
+
+        async def run():
+            result = await server.predict({"f1": 0.2, "f2": 0.4}, fixture_id="fixture-1")
+            return result, await server.handle_request("GET", "/stats", b"")
+
+        result, (status, payload) = asyncio.run(run())
+
+        self.assertEqual(result["model_id"], server.router.assign("fixture-1"))
+        self.assertEqual(result["fixture_id"], "fixture-1")
+        self.assertEqual(payload["models"][result["model_id"]]["requests"], 1)
+
+    def test_missing_feature_returns_bad_request(self):
+        """Test that a missing feature is reported as a client error"""
+        server = PredictionServer(config_path=self.config_path, registry_path=self.registry_path)
+        body = json.dumps({"features": {"f1": 1.0}}).encode()
+
+        status, payload = asyncio.run(server.handle_request("POST", "/predict", body))
+
+        self.assertEqual(status, 400)
+        self.assertIn("f2", payload["error"])
+
+    def test_malformed_requests_return_bad_request(self):
+        """Test that non-object bodies and bad Content-Length headers get a 400 response"""
+        server = PredictionServer(config_path=self.config_path, registry_path=self.registry_path)
+
+        status, _ = asyncio.run(server.handle_request("POST", "/predict", b"[]"))
+        self.assertEqual(status, 400)
+
+        async def send(raw):
+            tcp = await asyncio.start_server(server._handle_connection, "127.0.0.1", 0)
+            async with tcp:
+                reader, writer = await asyncio.open_connection(*tcp.sockets[0].getsockname()[:2])
+                writer.write(raw)
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+                return response
+
+        response = asyncio.run(send(b"POST /predict HTTP/1.1\r\nContent-Length: abc\r\n\r\n{}"))
+        self.assertTrue(response.startswith(b"HTTP/1.1 400 Bad Request"))
+        self.assertIn(b"Connection: close", response)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""Unit tests for rare pattern discovery"""
+
+import argparse
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from ml_pipeline.rare_pattern_finder import (
+    extract_supporting_matches,
+    find_rare_patterns,
+    load_evaluation_log,
+    unsupported_option_combination,
+)
+
+
+def evaluation_log() -> pd.DataFrame:
+    """300 common draw predictions and 12 rare, always-correct away wins"""
+    rows = []
+    for i in range(312):
+        rare = i % 26 == 5
+        rows.append({
+            "predicted_result": "away_win" if rare else "draw",
+            "actual_result": "away_win" if rare else ("draw" if i % 2 else "home_win"),
+            "confidence": 0.9 if rare else 0.6,
+            "btts_prediction": True,
+            "template_name": "late_goals" if rare else "baseline",
+            "timestamp": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}",
+            "team_a": f"Home {i}",
+            "team_b": f"Away {i}",
+        })
+    return pd.DataFrame(rows)
+
+
+class TestFindRarePatterns(unittest.TestCase):
+    """Tests for find_rare_patterns"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "evaluation_log.csv"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rare_reliable_pattern_with_first_ten_matches(self):
+        """Test that the rare pattern is found with its first ten matches in log order"""
+        df = evaluation_log()
+        df.loc[5, "actual_result"] = None  # dropped before analysis
+        df.to_csv(self.log_path, index=False)
+
+        patterns = find_rare_patterns(str(self.log_path))
+
+        self.assertEqual(len(patterns), 1)
+        pattern = patterns[0]
+        self.assertEqual(pattern["pattern_key"], "away_win_True_late_goals")
+        self.assertEqual(pattern["sample_size"], 11)
+        self.assertEqual(pattern["accuracy_pct"], 100.0)
+
+        expected_ids = [i for i in range(312) if i % 26 == 5 and i != 5][:10]
+        matches = pattern["supporting_matches"]
+        self.assertEqual([m["match_id"] for m in matches], expected_ids)
+        self.assertEqual(matches[0]["teams"], "Home 31 vs Away 31")
+        self.assertEqual(matches[0]["date"], "2026-01-01T00:00:31")
+
+    def test_outcomes_with_underscores_are_labelled_correctly(self):
+        """Test that home_win keeps its BTTS flag and template in the label"""
+        df = evaluation_log()
+        df["predicted_result"] = df["predicted_result"].replace("away_win", "home_win")
+        df["actual_result"] = df["actual_result"].replace("away_win", "home_win")
+        df.to_csv(self.log_path, index=False)
+
+        pattern = find_rare_patterns(str(self.log_path))[0]
+
+        self.assertEqual(pattern["pattern_key"], "home_win_True_late_goals")
+        self.assertEqual(pattern["label"], "Home Win + BTTS Late Goals")
+
+    def test_optional_columns_absent_after_dropped_rows(self):
+        """Test that default dimensions stay aligned with rows left after dropna"""
+        df = evaluation_log().drop(columns=["btts_prediction", "template_name"])
+        df.loc[:40, "actual_result"] = None
+        df.to_csv(self.log_path, index=False)
+
+        patterns = find_rare_patterns(str(self.log_path))
+
+        self.assertEqual([p["pattern_key"] for p in patterns], ["away_win_NA_NONE"])
+        self.assertEqual(patterns[0]["sample_size"], 10)
+        self.assertEqual(patterns[0]["label"], "Away Win")
+
+    def test_shadow_predictions_are_excluded(self):
+        """Test that rows tagged with a shadow model id are left out unless included"""
+        df = evaluation_log()
+        df["shadow_model_id"] = None
+        shadow = df[df["predicted_result"] == "away_win"].assign(
+            predicted_result="home_win", shadow_model_id="logit_shadow"
+        )
+        pd.concat([df, shadow], ignore_index=True).to_csv(self.log_path, index=False)
+
+        patterns = find_rare_patterns(str(self.log_path))
+
+        self.assertEqual([p["pattern_key"] for p in patterns], ["away_win_True_late_goals"])
+        self.assertEqual(len(load_evaluation_log(str(self.log_path), include_shadow=True)), 324)
+
+    def test_partitioned_patterns_use_global_frequency(self):
+        """Test that per-league patterns are keyed by league and normalized by the whole log"""
+        df = evaluation_log()
+        df["league"] = ["EPL" if i < 156 else "Serie A" for i in range(len(df))]
+        df.to_csv(self.log_path, index=False)
+
+        serial = find_rare_patterns(str(self.log_path), min_sample_size=3, partition_column="league", workers=1)
+        parallel = find_rare_patterns(str(self.log_path), min_sample_size=3, partition_column="league", workers=2)
+
+        self.assertEqual(
+            [p["pattern_key"] for p in serial],
+            ["league=EPL|away_win_True_late_goals", "league=Serie A|away_win_True_late_goals"],
+        )
+        self.assertEqual([p["sample_size"] for p in serial], [6, 6])
+        self.assertEqual(serial[0]["frequency_pct"], round(6 / 312 * 100, 2))
+        self.assertEqual(serial[0]["label"], "Away Win + BTTS Late Goals League: EPL")
+        self.assertEqual(serial[1]["supporting_matches"][0]["match_id"], 161)
+        self.assertEqual(
+            [(p["pattern_key"], p["supporting_matches"]) for p in serial],
+            [(p["pattern_key"], p["supporting_matches"]) for p in parallel],
+        )
+
+    def test_missing_partition_column(self):
+        """Test that partitioning by an absent column is rejected"""
+        evaluation_log().to_csv(self.log_path, index=False)
+
+        with self.assertRaises(ValueError):
+            find_rare_patterns(str(self.log_path), partition_column="season", workers=1)
+
+
+class TestExtractSupportingMatches(unittest.TestCase):
+    """Tests for extract_supporting_matches"""
+
+    def test_missing_context_columns(self):
+        """Test that logs without timestamp or team columns yield N/A fields"""
+        df = pd.DataFrame({"pattern_key": ["b", "a", "b", "a", "c"]}, index=[10, 11, 12, 13, 14])
+
+        matches = extract_supporting_matches(df, ["a", "b"], limit=1)
+
+        self.assertEqual(matches["a"], [{"match_id": 11, "date": "N/A", "teams": "N/A"}])
+        self.assertEqual(matches["b"], [{"match_id": 10, "date": "N/A", "teams": "N/A"}])
+        self.assertNotIn("c", matches)
+
+
+class TestUnsupportedOptionCombination(unittest.TestCase):
+    """Tests for unsupported_option_combination"""
+
+    def check(self, **given):
+        options = dict(
+            attributes=None, state=None, partition_by=None, decay_rate=None, window_days=None,
+            max_length=None, time_budget=None, sweep=False,
+        )
+        return unsupported_option_combination(vars(argparse.Namespace(**{**options, **given})))
+
+    def test_mining_limits_require_attributes(self):
+        """Test that --max-length and --time-budget are rejected without --attributes"""
+        self.assertEqual(self.check(max_length=2), "--max-length requires --attributes")
+        self.assertEqual(self.check(time_budget=60.0), "--time-budget requires --attributes")
+        self.assertIsNone(self.check(attributes="league", max_length=2, time_budget=60.0))
+
+    def test_mining_excludes_incremental_state(self):
+        """Test that --attributes cannot be combined with --state"""
+        self.assertEqual(self.check(attributes="league", state="s.db"), "--attributes cannot be combined with --state")
+        self.assertIsNone(self.check(attributes="league"))
+        self.assertIsNone(self.check(state="s.db"))
+
+    def test_mining_excludes_temporal_weighting(self):
+        """Test that --attributes cannot be combined with --decay-rate or --window-days"""
+        self.assertEqual(self.check(attributes="league", decay_rate=0.0), "--attributes cannot be combined with --decay-rate")
+        self.assertEqual(self.check(attributes="league", window_days=30), "--attributes cannot be combined with --window-days")
+        self.assertIsNone(self.check(state="s.db", decay_rate=0.1, window_days=30))
+
+    def test_partitioning_stands_alone(self):
+        """Test that --partition-by is rejected with the other discovery modes"""
+        for option, value in (("attributes", "league"), ("state", "s.db"), ("decay_rate", 0.1), ("window_days", 30)):
+            self.assertEqual(
+                self.check(partition_by="league", **{option: value}),
+                f"--{option.replace('_', '-')} cannot be combined with --partition-by",
+            )
+        self.assertIsNone(self.check(partition_by="league"))
+
+    def test_sweep_excludes_discovery_modes(self):
+        """Test that --sweep is rejected with options it would ignore"""
+        for option, value in (
+            ("attributes", "league"), ("state", "s.db"), ("partition_by", "league"),
+            ("decay_rate", 0.1), ("window_days", 30),
+        ):
+            self.assertEqual(
+                self.check(sweep=True, **{option: value}),
+                f"--sweep cannot be combined with --{option.replace('_', '-')}",
+            )
+        self.assertIsNone(self.check(sweep=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
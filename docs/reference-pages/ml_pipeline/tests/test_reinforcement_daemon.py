@@ -0,0 +1,165 @@
+"""Unit tests for the reinforcement daemon and warm evaluation log"""
+
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from ml_pipeline.data_loader import EvaluationLogCache
+from ml_pipeline.model_registry import ModelCache
+from ml_pipeline.reinforcement_daemon import ReinforcementDaemon, next_daily_run
+
+
+class TestEvaluationLogCache(unittest.TestCase):
+    """Tests for EvaluationLogCache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_log(self, local_path):
+        pd.DataFrame({"confidence": [0.9, 0.8]}).to_csv(local_path, index=False)
+        return local_path
+
+    @patch("ml_pipeline.data_loader.download_evaluation_log")
+    def test_log_is_downloaded_once_while_fresh(self, mock_download):
+        """Test that copies of a fresh cache reuse the parsed frame"""
+        mock_download.side_effect = self.write_log
+        cache = EvaluationLogCache(self.root / "cache.csv", max_age_seconds=3600)
+
+        for i in range(3):
+            local_path = str(self.root / f"run_{i}.csv")
+            cache.copy_to(local_path)
+            with patch("ml_pipeline.data_loader.pd.read_csv") as mock_read:
+                frame = cache.read(local_path)
+            mock_read.assert_not_called()
+            self.assertEqual(len(frame), 2)
+
+        mock_download.assert_called_once()
+
+    @patch("ml_pipeline.data_loader.download_evaluation_log")
+    def test_modified_copy_is_parsed_from_disk(self, mock_download):
+        """Test that a file that differs from the cache is read from disk"""
+        mock_download.side_effect = self.write_log
+        cache = EvaluationLogCache(self.root / "cache.csv")
+        cache.refresh()
+
+        other = self.root / "other.csv"
+        pd.DataFrame({"confidence": [0.1, 0.2, 0.3]}).to_csv(other, index=False)
+
+        self.assertEqual(len(cache.read(str(other))), 3)
+
+
+class TestReinforcementDaemon(unittest.TestCase):
+    """Tests for ReinforcementDaemon scheduling"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        registry_path = Path(self.tmp.name) / "model_registry.json"
+        registry_path.write_text(json.dumps({"models": []}))
+        self.daemon = ReinforcementDaemon(
+            daily_run_time="03:00",
+            refresh_interval=3600,
+            memory_limit_bytes=1024 ** 4,
+            model_cache=ModelCache(registry_path=registry_path),
+        )
+        refresh = patch.object(self.daemon.eval_log_cache, "refresh")
+        refresh.start()
+        self.addCleanup(refresh.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_next_daily_run(self):
+        """Test that the next run is today if still ahead, otherwise tomorrow"""
+        before = datetime(2025, 1, 15, 2, 0, tzinfo=timezone.utc)
+        after = datetime(2025, 1, 15, 3, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(next_daily_run(before, "03:00"), datetime(2025, 1, 15, 3, 0, tzinfo=timezone.utc))
+        self.assertEqual(next_daily_run(after, "03:00"), datetime(2025, 1, 16, 3, 0, tzinfo=timezone.utc))
+
+    @patch("ml_pipeline.reinforcement_daemon.run_request_workers", return_value=True)
+    @patch("ml_pipeline.reinforcement_daemon.run_auto_reinforcement", return_value=True)
+    def test_daily_run_happens_once_when_due(self, mock_run, mock_workers):
+        """Test that the daily run fires once and manual requests are polled every tick"""
+        self.daemon.next_daily_run = datetime(2025, 1, 15, 3, 0, tzinfo=timezone.utc)
+
+        self.daemon.tick(datetime(2025, 1, 15, 2, 59, tzinfo=timezone.utc))
+        self.daemon.tick(datetime(2025, 1, 15, 3, 0, tzinfo=timezone.utc))
+        self.daemon.tick(datetime(2025, 1, 15, 3, 1, tzinfo=timezone.utc))
+
+        mock_run.assert_called_once()
+        self.assertIs(mock_run.call_args.kwargs["eval_log_cache"], self.daemon.eval_log_cache)
+        self.assertEqual(mock_workers.call_count, 3)
+        self.assertEqual(self.daemon.next_daily_run, datetime(2025, 1, 16, 3, 0, tzinfo=timezone.utc))
+        self.assertEqual(self.daemon.stats["refreshes"], 1)
+
+    @patch("ml_pipeline.reinforcement_daemon.current_rss_bytes", return_value=2 * 1024 ** 3)
+    def test_memory_limit_drops_warm_state(self, _):
+        """Test that exceeding the memory cap clears caches and forces a refresh"""
+        self.daemon.memory_limit_bytes = 1024 ** 3
+        self.daemon.eval_log_cache.frame = pd.DataFrame({"a": [1]})
+        old_cache = self.daemon.model_cache
+
+        self.assertTrue(self.daemon.enforce_memory_limit())
+        self.assertIsNone(self.daemon.eval_log_cache.frame)
+        self.assertIsNot(self.daemon.model_cache, old_cache)
+        self.assertIsNone(self.daemon.last_refresh)
+
+    @patch("ml_pipeline.reinforcement_daemon.run_request_workers", return_value=True)
+    @patch("ml_pipeline.reinforcement_daemon.current_rss_bytes")
+    def test_reload_waits_for_backoff_and_memory(self, mock_rss, _):
+        """Test that warm state is reloaded only after the backoff and once RSS is under the cap"""
+        self.daemon.memory_limit_bytes = 1024 ** 3
+        mock_rss.return_value = 2 * 1024 ** 3
+        clock = [1000.0]
+
+        with patch("ml_pipeline.reinforcement_daemon.time.monotonic", side_effect=lambda: clock[0]):
+            self.daemon.tick()
+            self.assertEqual((self.daemon.stats["refreshes"], self.daemon.stats["memory_resets"]), (1, 1))
+
+            # Still over the cap and within the backoff: no reload, no second reset
+            self.daemon.tick()
+            clock[0] += 3600
+            self.daemon.tick()
+            self.assertEqual((self.daemon.stats["refreshes"], self.daemon.stats["memory_resets"]), (1, 1))
+
+            # Memory released: reload, then a second reset doubles the backoff
+            mock_rss.return_value = 512 * 1024 ** 2
+            self.daemon.tick()
+            self.assertEqual(self.daemon.stats["refreshes"], 2)
+            mock_rss.return_value = 2 * 1024 ** 3
+            with self.assertLogs("ml_pipeline.reinforcement_daemon", "WARNING") as logs:
+                self.daemon.tick()
+            self.assertEqual(self.daemon.consecutive_memory_resets, 2)
+            self.assertEqual(self.daemon.reload_not_before, clock[0] + 2 * 3600)
+            self.assertIn("2 times in a row", logs.output[-1])
+
+    @patch("ml_pipeline.reinforcement_daemon.run_request_workers", return_value=True)
+    @patch("ml_pipeline.reinforcement_daemon.run_auto_reinforcement", return_value=True)
+    @patch("ml_pipeline.reinforcement_daemon.current_rss_bytes", return_value=2 * 1024 ** 3)
+    def test_runs_during_backoff_do_not_rewarm(self, _, mock_run, mock_workers):
+        """Test that runs after a memory reset get no caches until the warm state is reloaded"""
+        self.daemon.memory_limit_bytes = 1024 ** 3
+        self.daemon.tick()
+        self.assertIs(mock_workers.call_args.kwargs["eval_log_cache"], self.daemon.eval_log_cache)
+
+        self.daemon.next_daily_run = datetime(2025, 1, 15, 3, 0, tzinfo=timezone.utc)
+        self.daemon.tick(datetime(2025, 1, 15, 3, 0, tzinfo=timezone.utc))
+
+        for mock in (mock_run, mock_workers):
+            self.assertIsNone(mock.call_args.kwargs["eval_log_cache"])
+            self.assertIsNone(mock.call_args.kwargs["model_cache"])
+        self.assertIsNone(self.daemon.eval_log_cache.frame)
+        self.assertEqual(len(self.daemon.model_cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
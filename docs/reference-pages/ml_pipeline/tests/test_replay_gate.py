@@ -0,0 +1,179 @@
+"""Unit tests for the champion/challenger replay gate"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ml_pipeline.model_registry import ModelCache
+from ml_pipeline.replay_gate import (
+    GATE_PROMOTE,
+    GATE_REJECT,
+    GATE_SKIPPED,
+    batched_predict,
+    evaluate_challenger,
+    held_out_slice,
+    paired_bootstrap,
+    replay_gate,
+)
+
+
+class ThresholdModel:
+    """Predicts 1 when the feature exceeds a threshold"""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def predict(self, X):
+        return (X[:, 0] > self.threshold).astype(int)
+
+
+class TestReplayGate(unittest.TestCase):
+    """Tests for replay gate metrics and decisions"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.held_out = pd.DataFrame({"f1": rng.random(2000)})
+        self.held_out["label"] = (self.held_out["f1"] > 0.5).astype(int)
+
+    def test_batched_predict_uses_one_call_per_batch(self):
+        """Test that rows are scored in batches"""
+        model = MagicMock()
+        model.predict.side_effect = lambda X: np.zeros(len(X))
+
+        result = batched_predict(model, np.zeros((25, 2)), batch_size=10)
+
+        self.assertEqual(len(result), 25)
+        self.assertEqual(model.predict.call_count, 3)
+
+    def test_paired_bootstrap_identical_models(self):
+        """Test that identical predictions give a zero-width interval at zero"""
+        correct = np.array([True, False] * 50)
+        metrics = paired_bootstrap(correct, correct)
+
+        self.assertEqual(metrics["accuracy_delta"], 0.0)
+        self.assertEqual((metrics["delta_ci_low"], metrics["delta_ci_high"]), (0.0, 0.0))
+
+    def test_paired_bootstrap_interval_covers_delta(self):
+        """Test that the interval brackets the observed difference"""
+        rng = np.random.default_rng(1)
+        champion = rng.random(1000) < 0.7
+        challenger = rng.random(1000) < 0.75
+        metrics = paired_bootstrap(champion, challenger)
+
+        self.assertLess(metrics["delta_ci_low"], metrics["accuracy_delta"])
+        self.assertGreater(metrics["delta_ci_high"], metrics["accuracy_delta"])
+        self.assertEqual(
+            metrics["challenger_only_correct"] - metrics["champion_only_correct"],
+            int(challenger.sum()) - int(champion.sum()),
+        )
+
+    def test_regressed_challenger_is_rejected(self):
+        """Test that a clearly worse challenger is rejected"""
+        gate = replay_gate(ThresholdModel(0.5), ThresholdModel(0.8), self.held_out, ["f1"], "label")
+
+        self.assertEqual(gate["decision"], GATE_REJECT)
+        self.assertLess(gate["metrics"]["delta_ci_high"], 0)
+
+    def test_equivalent_challenger_is_promoted(self):
+        """Test that a challenger as good as the champion passes"""
+        gate = replay_gate(ThresholdModel(0.8), ThresholdModel(0.5), self.held_out, ["f1"], "label")
+
+        self.assertEqual(gate["decision"], GATE_PROMOTE)
+
+    def test_too_few_rows_does_not_promote(self):
+        """Test that a tiny replay slice rejects by default and skips only when configured"""
+        tiny = self.held_out.head(10)
+
+        gate = replay_gate(ThresholdModel(0.5), ThresholdModel(0.5), tiny, ["f1"], "label")
+        self.assertEqual(gate["decision"], GATE_REJECT)
+        self.assertEqual(gate["metrics"], {"n": 10})
+
+        gate = replay_gate(
+            ThresholdModel(0.5), ThresholdModel(0.5), tiny, ["f1"], "label", insufficient_rows_decision=GATE_SKIPPED
+        )
+        self.assertEqual(gate["decision"], GATE_SKIPPED)
+
+    def test_held_out_slice_excludes_training_rows(self):
+        """Test that fine-tuning rows and incomplete rows are not replayed"""
+        eval_log = pd.DataFrame({"f1": [0.1, 0.2, None, 0.4], "label": [0, 1, 0, 1]})
+
+        held_out = held_out_slice(eval_log, pd.Index([1]), ["f1"], "label")
+
+        self.assertEqual(list(held_out.index), [0, 3])
+
+
+class TestEvaluateChallenger(unittest.TestCase):
+    """Tests for evaluate_challenger"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        joblib.dump(ThresholdModel(0.5), root / "champion.pkl")
+        joblib.dump(ThresholdModel(0.9), root / "challenger.pkl")
+        self.challenger_path = str(root / "challenger.pkl")
+
+        registry_path = root / "model_registry.json"
+        registry_path.write_text(json.dumps({"models": [
+            {"id": "champion", "status": "active", "path": str(root / "champion.pkl")},
+        ]}))
+        self.model_cache = ModelCache(registry_path=registry_path)
+
+        rng = np.random.default_rng(0)
+        eval_log = pd.DataFrame({"f1": rng.random(500)})
+        eval_log["actual_outcome"] = (eval_log["f1"] > 0.5).astype(int)
+        eval_log["predicted_outcome"] = eval_log["actual_outcome"]
+        eval_log["confidence"] = 0.5
+        self.eval_log_path = str(root / "evaluation_log.csv")
+        eval_log.to_csv(self.eval_log_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("ml_pipeline.replay_gate.load_model_config")
+    def test_regression_against_registry_champion(self, mock_config):
+        """Test that the challenger is compared with the registry's active model"""
+        mock_config.return_value = {"input_features": ["f1"], "target_column": "actual_outcome"}
+
+        gate = evaluate_challenger(self.challenger_path, self.eval_log_path, model_cache=self.model_cache)
+
+        self.assertEqual(gate["decision"], GATE_REJECT)
+        self.assertEqual(gate["metrics"]["n"], 500)
+        self.assertEqual(gate["metrics"]["champion_accuracy"], 1.0)
+
+    @patch("ml_pipeline.replay_gate.load_model_config", side_effect=FileNotFoundError("model_config.yaml"))
+    def test_missing_config_rejects(self, _):
+        """Test that the challenger is rejected when the comparison cannot be configured"""
+        gate = evaluate_challenger(self.challenger_path, self.eval_log_path, model_cache=self.model_cache)
+
+        self.assertEqual(gate["decision"], GATE_REJECT)
+
+    @patch("ml_pipeline.replay_gate.load_model_config")
+    def test_unloadable_challenger_is_rejected(self, mock_config):
+        """Test that a challenger artifact that cannot be deserialized is rejected"""
+        mock_config.return_value = {"input_features": ["f1"], "target_column": "actual_outcome"}
+        Path(self.challenger_path).write_bytes(b"not a pickle")
+
+        gate = evaluate_challenger(self.challenger_path, self.eval_log_path, model_cache=self.model_cache)
+
+        self.assertEqual(gate["decision"], GATE_REJECT)
+        self.assertIn("challenger", gate["reason"])
+
+    @patch("ml_pipeline.replay_gate.load_model_config")
+    def test_missing_champion_skips(self, mock_config):
+        """Test that the gate is skipped only when there is no champion"""
+        mock_config.return_value = {"input_features": ["f1"], "target_column": "actual_outcome"}
+        (Path(self.tmp.name) / "champion.pkl").unlink()
+
+        gate = evaluate_challenger(self.challenger_path, self.eval_log_path, model_cache=self.model_cache)
+
+        self.assertEqual(gate["decision"], GATE_SKIPPED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Unit tests for concurrent retraining request workers"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ml_pipeline.auto_reinforcement import LeaseRenewer, group_requests_by_data, run_request_workers
+from ml_pipeline.supabase_client import lease_retraining_requests
+
+
+class TestLeaseRetrainingRequests(unittest.TestCase):
+    """Tests for atomic request leasing"""
+
+    @patch("ml_pipeline.supabase_client.get_pending_retraining_requests")
+    @patch("ml_pipeline.supabase_client.get_supabase_client")
+    def test_only_won_claims_are_returned(self, mock_get_client, mock_pending):
+        """Test that requests claimed by another worker are skipped"""
+        mock_pending.return_value = [{"id": "a", "status": "pending"}, {"id": "b", "status": "pending"}]
+
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_get_client.return_value = mock_client
+
+        # No expired or stranded leases to reclaim
+        processing = mock_table.select.return_value.eq.return_value
+        for lapsed in (processing.lt, processing.is_):
+            lapsed.return_value.limit.return_value.execute.return_value = MagicMock(data=[])
+
+        # The conditional update matches "a" but "b" was already taken
+        claim_a = MagicMock(data=[{"id": "a", "status": "processing"}])
+        claim_b = MagicMock(data=[])
+        conditional = mock_table.update.return_value.eq.return_value.eq.return_value
+        conditional.execute.side_effect = [claim_a, claim_b]
+
+        leased = lease_retraining_requests("worker-1", limit=5, lease_seconds=60)
+
+        self.assertEqual([r["id"] for r in leased], ["a"])
+        lease = mock_table.update.call_args[0][0]
+        self.assertEqual(lease["status"], "processing")
+        self.assertEqual(lease["leased_by"], "worker-1")
+        conditional_filter = mock_table.update.return_value.eq.return_value.eq
+        conditional_filter.assert_called_with("status", "pending")
+
+    @patch("ml_pipeline.supabase_client.get_supabase_client")
+    def test_lease_failure_returns_empty(self, mock_get_client):
+        """Test that backend errors do not crash the worker"""
+        mock_get_client.return_value.table.side_effect = Exception("connection error")
+
+        self.assertEqual(lease_retraining_requests("worker-1", limit=5, lease_seconds=60), [])
+
+
+class TestRequestWorkers(unittest.TestCase):
+    """Tests for the request worker pool"""
+
+    def test_group_requests_by_data(self):
+        """Test that requests with the same lookback window are merged"""
+        groups = group_requests_by_data([
+            {"id": "a"},
+            {"id": "b", "lookback_days": 7},
+            {"id": "c", "lookback_days": 30},
+        ])
+
+        self.assertEqual({k: [r["id"] for r in v] for k, v in groups.items()}, {7: ["a", "b"], 30: ["c"]})
+
+    @patch("ml_pipeline.auto_reinforcement.run_auto_reinforcement")
+    @patch("ml_pipeline.auto_reinforcement.lease_retraining_requests")
+    def test_workers_run_one_job_per_dataset(self, mock_lease, mock_run):
+        """Test that leased requests are merged and run until the queue is empty"""
+        mock_lease.side_effect = [
+            [{"id": "a"}, {"id": "b"}, {"id": "c", "lookback_days": 30}],
+            [],
+        ]
+        mock_run.return_value = True
+
+        self.assertTrue(run_request_workers(pool_size=2, worker_id="worker-1"))
+
+        self.assertEqual(mock_run.call_count, 2)
+        merged = {call.kwargs["lookback_days"]: call.kwargs["request_ids"] for call in mock_run.call_args_list}
+        self.assertEqual(merged, {7: ["a", "b"], 30: ["c"]})
+        self.assertTrue(all(call.kwargs["worker_id"] == "worker-1" for call in mock_run.call_args_list))
+
+    @patch("ml_pipeline.auto_reinforcement.renew_retraining_leases")
+    def test_lease_renewer_drops_lost_leases(self, mock_renew):
+        """Test that leases are renewed until lost or released"""
+        mock_renew.side_effect = [["a", "b"], ["a"]]
+        renewer = LeaseRenewer("worker-1", lease_seconds=60)
+        renewer.add(["a", "b"])
+
+        self.assertEqual(renewer.renew(), ["a", "b"])
+        self.assertEqual(renewer.renew(), ["a"])
+        renewer.discard(["a"])
+
+        self.assertEqual(renewer.renew(), [])
+        self.assertEqual(mock_renew.call_args_list[1].args, ("worker-1", ["a", "b"], 60))
+        self.assertEqual(mock_renew.call_count, 2)
+
+    @patch("ml_pipeline.auto_reinforcement.run_auto_reinforcement")
+    @patch("ml_pipeline.auto_reinforcement.lease_retraining_requests")
+    def test_workers_report_failed_runs(self, mock_lease, mock_run):
+        """Test that a failed run is reflected in the overall result"""
+        mock_lease.side_effect = [[{"id": "a"}], []]
+        mock_run.return_value = False
+
+        self.assertFalse(run_request_workers(pool_size=1, worker_id="worker-1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
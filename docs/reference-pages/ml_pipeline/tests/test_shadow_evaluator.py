@@ -0,0 +1,87 @@
+"""Unit tests for shadow-model evaluation"""
+
+import csv
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from ml_pipeline.model_registry import ModelCache
+from ml_pipeline.shadow_evaluator import ShadowEvaluator, shadow_model_ids
+
+
+class TestShadowEvaluator(unittest.TestCase):
+    """Tests for ShadowEvaluator"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        model = LogisticRegression().fit(np.random.rand(20, 2), np.array([0, 1] * 10))
+        joblib.dump(model, root / "shadow.pkl")
+
+        registry_path = root / "model_registry.json"
+        registry_path.write_text(json.dumps({"models": [
+            {"id": "champion", "status": "active", "path": str(root / "champion.pkl")},
+            {"id": "shadow", "status": "shadow", "version": "2024.12.0", "path": str(root / "shadow.pkl")},
+        ]}))
+
+        self.cache = ModelCache(registry_path=registry_path)
+        self.log_path = root / "shadow_log.csv"
+        self.champion = {"model_id": "champion", "prediction": 1}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_log(self):
+        with open(self.log_path) as f:
+            return list(csv.DictReader(f))
+
+    def test_shadow_model_ids(self):
+        """Test that only shadow entries are selected"""
+        self.assertEqual(shadow_model_ids(self.cache.registry), ["shadow"])
+
+    def test_submit_drops_under_backpressure(self):
+        """Test that a full queue drops work instead of blocking"""
+        evaluator = ShadowEvaluator(self.cache, log_path=self.log_path, max_queue_size=2)
+
+        accepted = [evaluator.submit(np.zeros(2), self.champion) for _ in range(5)]
+
+        self.assertEqual(accepted, [True, True, False, False, False])
+        stats = evaluator.stats()
+        self.assertEqual(stats["dropped"], 3)
+        self.assertEqual(stats["queued"], 2)
+
+    def test_score_batch_appends_to_log(self):
+        """Test that one batch writes one row per request and shadow model"""
+        evaluator = ShadowEvaluator(self.cache, log_path=self.log_path)
+        batch = [(np.array([0.1 * i, 0.5]), self.champion, f"fixture-{i}") for i in range(3)]
+
+        self.assertEqual(evaluator.score_batch(batch), 3)
+        evaluator.score_batch(batch[:1])
+
+        rows = self.read_log()
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["shadow_model_id"], "shadow")
+        self.assertEqual(rows[0]["actual_result"], "")
+        self.assertEqual(rows[0]["model_version"], "2024.12.0")
+        self.assertEqual(rows[0]["champion_model_id"], "champion")
+        self.assertEqual(rows[2]["fixture_id"], "fixture-2")
+
+    def test_workers_drain_queue_on_stop(self):
+        """Test that background workers score everything queued before stopping"""
+        evaluator = ShadowEvaluator(self.cache, log_path=self.log_path, batch_size=4, flush_interval=0.05)
+        evaluator.start()
+        for i in range(10):
+            evaluator.submit(np.array([0.1 * i, 0.2]), self.champion, i)
+        evaluator.stop()
+
+        self.assertEqual(evaluator.stats()["scored"], 10)
+        self.assertEqual(len(self.read_log()), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Unit tests for streaming, resumable and deduplicated Storage uploads"""
+
+import hashlib
+import json
+import tempfile
+import unittest
+from io import BufferedReader
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from ml_pipeline.model_registry import remember_file_sha256
+from ml_pipeline.supabase_client import resumable_upload, upload_file_to_storage, upload_model_artifact
+
+
+class TestStorageUpload(unittest.TestCase):
+    """Tests for upload_file_to_storage"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.file_path = self.root / "model.pkl"
+        self.file_path.write_bytes(b"model-bytes" * 100)
+        self.sha256 = hashlib.sha256(self.file_path.read_bytes()).hexdigest()
+
+        self.mock_client = MagicMock()
+        self.mock_client.storage.url = "https://example.supabase.co/storage/v1"
+        self.bucket = self.mock_client.storage.from_.return_value
+        patcher = patch("ml_pipeline.supabase_client.get_supabase_client", return_value=self.mock_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_upload_streams_file_with_hash_metadata(self):
+        """Test that small files are streamed from an open handle, not read into memory"""
+        self.bucket.exists.return_value = False
+
+        url = upload_file_to_storage("model-artifacts", "models/a.pkl", str(self.file_path))
+
+        path, body, options = self.bucket.upload.call_args[0]
+        self.assertEqual(path, "models/a.pkl")
+        self.assertIsInstance(body, BufferedReader)
+        self.assertEqual(options["metadata"], {"sha256": self.sha256})
+        self.assertEqual(url, "https://example.supabase.co/storage/v1/model-artifacts/models/a.pkl")
+
+    def test_upload_skipped_when_storage_holds_hash(self):
+        """Test that identical content is not uploaded again"""
+        self.bucket.exists.return_value = True
+        self.bucket.info.return_value = {"metadata": {"sha256": self.sha256}}
+
+        upload_file_to_storage("model-artifacts", "models/a.pkl", str(self.file_path))
+
+        self.bucket.upload.assert_not_called()
+
+    def test_changed_content_is_uploaded(self):
+        """Test that a different hash at the same path triggers an upload"""
+        self.bucket.exists.return_value = True
+        self.bucket.info.return_value = {"metadata": {"sha256": "0" * 64}}
+
+        upload_file_to_storage("model-artifacts", "models/a.pkl", str(self.file_path))
+
+        self.bucket.upload.assert_called_once()
+
+    @patch("ml_pipeline.supabase_client.STORAGE_RESUMABLE_THRESHOLD", 10)
+    @patch("ml_pipeline.supabase_client.resumable_upload")
+    def test_large_files_use_resumable_upload(self, mock_resumable):
+        """Test that files above the threshold go through the resumable path"""
+        self.bucket.exists.return_value = False
+
+        upload_file_to_storage("model-artifacts", "models/a.pkl", str(self.file_path))
+
+        mock_resumable.assert_called_once_with("model-artifacts", "models/a.pkl", str(self.file_path), self.sha256)
+        self.bucket.upload.assert_not_called()
+
+    @patch("ml_pipeline.supabase_client.upload_file_to_storage", return_value="url")
+    def test_remembered_digest_skips_rehash_until_file_changes(self, mock_upload):
+        """Test that a digest recorded at write time is reused only while size and mtime match"""
+        remember_file_sha256(self.file_path, self.sha256)
+
+        with patch("ml_pipeline.model_registry.file_sha256") as mock_hash:
+            artifact = upload_model_artifact(str(self.file_path))
+        mock_hash.assert_not_called()
+        self.assertEqual(artifact["model_sha256"], self.sha256)
+
+        self.file_path.write_bytes(b"retrained-model-bytes")
+        artifact = upload_model_artifact(str(self.file_path))
+        self.assertEqual(artifact["model_sha256"], hashlib.sha256(b"retrained-model-bytes").hexdigest())
+
+    @patch("ml_pipeline.supabase_client.upload_file_to_storage", return_value="url")
+    def test_model_artifacts_are_content_addressed(self, mock_upload):
+        """Test that model artifacts are stored under their content hash"""
+        artifact = upload_model_artifact(str(self.file_path))
+
+        self.assertEqual(artifact["storage_path"], f"models/{self.sha256}.pkl")
+        self.assertEqual(artifact["model_sha256"], self.sha256)
+        mock_upload.assert_called_once_with(
+            "model-artifacts", f"models/{self.sha256}.pkl", str(self.file_path), sha256=self.sha256
+        )
+
+
+class TestResumableUpload(unittest.TestCase):
+    """Tests for the TUS resumable upload"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.file_path = self.root / "model.pkl"
+        self.file_path.write_bytes(bytes(range(250)))
+        patcher = patch("ml_pipeline.supabase_client.UPLOAD_STATE_DIR", self.root / "state")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def patch_response(self, offset):
+        return MagicMock(status_code=204, headers={"Upload-Offset": str(offset)})
+
+    @patch("ml_pipeline.supabase_client.get_http_client")
+    def test_interrupted_upload_resumes_from_server_offset(self, mock_get_http_client):
+        """Test that a retried upload continues from the offset the server reports"""
+        http = mock_get_http_client.return_value
+        http.post.return_value = MagicMock(headers={"Location": "https://example/upload/resumable/abc"})
+        http.patch.side_effect = [self.patch_response(100), ConnectionError("connection reset")]
+
+        with self.assertRaises(ConnectionError):
+            resumable_upload("model-artifacts", "models/a.pkl", str(self.file_path), "hash", chunk_size=100)
+
+        state = json.loads((self.root / "state" / "hash.json").read_text())
+        self.assertEqual(state["upload_url"], "https://example/upload/resumable/abc")
+
+        http.reset_mock()
+        http.head.return_value = MagicMock(status_code=200, headers={"Upload-Offset": "100"})
+        http.patch.side_effect = [self.patch_response(200), self.patch_response(250)]
+
+        resumable_upload("model-artifacts", "models/a.pkl", str(self.file_path), "hash", chunk_size=100)
+
+        http.post.assert_not_called()
+        sent = [call.kwargs["content"] for call in http.patch.call_args_list]
+        self.assertEqual(sent, [bytes(range(100, 200)), bytes(range(200, 250))])
+        self.assertFalse((self.root / "state" / "hash.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
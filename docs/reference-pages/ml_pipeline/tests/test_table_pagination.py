@@ -0,0 +1,63 @@
+"""Unit tests for keyset-paginated table reads"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from ml_pipeline.local_backend import LocalSupabaseClient
+from ml_pipeline.supabase_client import iter_table_rows
+
+
+class TestIterTableRows(unittest.TestCase):
+    """Tests for iter_table_rows against the local backend"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = LocalSupabaseClient(Path(self.tmp.name))
+        patcher = patch("ml_pipeline.supabase_client.get_supabase_client", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Batches share one created_at, so pages split runs of equal timestamps
+        for batch in range(5):
+            self.client.table("system_logs").insert([
+                {
+                    "id": f"{batch}-{i:03d}",
+                    "created_at": f"2026-01-0{batch + 1}T00:00:00+00:00",
+                    "component": "test",
+                    "status": "error" if i % 3 == 0 else "info",
+                    "message": str(i),
+                }
+                for i in range(45)
+            ]).execute()
+
+    def tearDown(self):
+        self.client.close()
+        self.tmp.cleanup()
+
+    def test_walks_every_row_once_in_key_order(self):
+        """Test that page boundaries inside equal timestamps neither skip nor repeat rows"""
+        rows = list(iter_table_rows("system_logs", page_size=20))
+
+        keys = [(row["created_at"], row["id"]) for row in rows]
+        self.assertEqual(len(keys), 225)
+        self.assertEqual(keys, sorted(set(keys)))
+
+    def test_column_selection_and_filters(self):
+        """Test that only requested columns are returned and filters apply to every page"""
+        rows = list(iter_table_rows("system_logs", columns="message", filters=[("status", "eq", "error")], page_size=7))
+
+        self.assertEqual(len(rows), 75)
+        self.assertEqual(set(rows[0]), {"message"})
+
+    def test_exact_multiple_of_page_size(self):
+        """Test that a final full page ends the walk after one empty read"""
+        self.assertEqual(len(list(iter_table_rows("system_logs", page_size=45))), 225)
+
+    def test_empty_table(self):
+        self.assertEqual(list(iter_table_rows("model_retraining_runs")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
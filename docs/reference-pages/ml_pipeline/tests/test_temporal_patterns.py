@@ -0,0 +1,116 @@
+"""Unit tests for time-decayed and sliding-window pattern statistics"""
+
+import math
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from ml_pipeline.pattern_store import PatternCounterStore
+from ml_pipeline.rare_pattern_finder import find_rare_patterns
+from ml_pipeline.temporal_patterns import find_temporal_patterns
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+# The recent away wins dominate the decayed/windowed log, so allow 50%
+RARE = {"frequency_threshold": 0.5}
+
+
+def evaluation_log() -> pd.DataFrame:
+    """
+    Common draws spread over a year plus a rare away-win pattern.
+
+    The away wins were wrong a year ago and right in the last ten days.
+    """
+    rows = []
+    for i in range(400):
+        rows.append({
+            "predicted_result": "draw",
+            "actual_result": "draw" if i % 2 else "home_win",
+            "confidence": 0.6,
+            "timestamp": (NOW - timedelta(hours=22 * i)).strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+    for day in range(10):
+        rows.append({
+            "predicted_result": "away_win",
+            "actual_result": "away_win",
+            "confidence": 0.9,
+            "timestamp": (NOW - timedelta(days=day)).strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+    for day in range(10):
+        rows.append({
+            "predicted_result": "away_win",
+            "actual_result": "draw",
+            "confidence": 0.9,
+            "timestamp": (NOW - timedelta(days=300 + day)).strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+    return pd.DataFrame(rows).sort_values("timestamp")
+
+
+class TestFindTemporalPatterns(unittest.TestCase):
+    """Tests for find_temporal_patterns"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "evaluation_log.csv"
+        evaluation_log().to_csv(self.log_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_decay_discounts_old_failures(self):
+        """Test that old misses stop hiding a pattern that is reliable now"""
+        self.assertEqual(find_rare_patterns(str(self.log_path), **RARE), [])
+
+        patterns = find_temporal_patterns(str(self.log_path), decay_rate=0.05, now=NOW, **RARE)
+
+        self.assertEqual([p["pattern_key"] for p in patterns], ["away_win_NA_NONE"])
+        self.assertGreater(patterns[0]["accuracy_pct"], 99.0)
+        self.assertEqual(patterns[0]["sample_size"], 20)
+
+    def test_decay_expiry_follows_sample_decay(self):
+        """Test that expiry is when the decayed sample falls below the minimum"""
+        pattern = find_temporal_patterns(str(self.log_path), decay_rate=0.05, now=NOW, **RARE)[0]
+
+        weight = sum(math.exp(-0.05 * d) for d in range(10)) + sum(math.exp(-0.05 * (300 + d)) for d in range(10))
+        expected = NOW + timedelta(days=math.log(weight / 5) / 0.05)
+        self.assertEqual(pattern["expires_at"], expected.isoformat() + "Z")
+
+    def test_window_excludes_old_rows_and_expires_from_data(self):
+        """Test that a 30-day window drops last year's rows and expires as its rows age out"""
+        pattern = find_temporal_patterns(str(self.log_path), window_days=30, now=NOW, **RARE)[0]
+
+        self.assertEqual(pattern["sample_size"], 10)
+        self.assertEqual(pattern["accuracy_pct"], 100.0)
+        self.assertEqual(pattern["supporting_matches"][0]["date"], "2026-05-23T00:00:00")
+        # The sample drops to four when the sixth-oldest row (2026-05-28) leaves the window
+        self.assertEqual(pattern["expires_at"], "2026-06-27T00:00:00+00:00Z")
+
+    def test_requires_exactly_one_mode(self):
+        """Test that decay and window cannot be combined or both omitted"""
+        with self.assertRaises(ValueError):
+            find_temporal_patterns(str(self.log_path), now=NOW)
+        with self.assertRaises(ValueError):
+            find_temporal_patterns(str(self.log_path), decay_rate=0.1, window_days=30, now=NOW)
+
+    def test_counter_store_buckets_match_full_scan(self):
+        """Test that hourly buckets from incremental updates give the same statistics"""
+        df = evaluation_log()
+        df.iloc[:200].to_csv(self.log_path, index=False)
+        with PatternCounterStore(str(Path(self.tmp.name) / "counters.sqlite3")) as store:
+            store.update(str(self.log_path))
+            df.iloc[200:].to_csv(self.log_path, mode="a", index=False, header=False)
+            store.update(str(self.log_path))
+
+            for mode in ({"decay_rate": 0.05}, {"window_days": 30}):
+                self.assertEqual(
+                    [{k: v for k, v in p.items() if k != "discovered_at"}
+                     for p in store.find_rare_patterns(now=NOW, **mode, **RARE)],
+                    [{k: v for k, v in p.items() if k != "discovered_at"}
+                     for p in find_temporal_patterns(str(self.log_path), now=NOW, **mode, **RARE)],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
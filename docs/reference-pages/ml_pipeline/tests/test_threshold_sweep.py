@@ -0,0 +1,66 @@
+"""Unit tests for threshold sweeps"""
+
+import itertools
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ml_pipeline.rare_pattern_finder import find_rare_patterns
+from ml_pipeline.tests.test_pattern_mining import evaluation_log
+from ml_pipeline.threshold_sweep import parse_grid, sweep_evaluation_log, sweep_thresholds
+
+
+class TestSweepThresholds(unittest.TestCase):
+    """Tests for sweep_thresholds"""
+
+    def test_grid_matches_individual_runs(self):
+        """Test that every grid point agrees with a find_rare_patterns run"""
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "evaluation_log.csv"
+            df = evaluation_log(rows=3000)
+            df["template_name"] = np.random.default_rng(3).choice([f"t{i}" for i in range(40)], len(df))
+            df.to_csv(log_path, index=False)
+
+            frequencies, accuracies, samples = [0.005, 0.01, 0.05], [0.5, 0.6, 0.75], [5, 20]
+            grid = sweep_evaluation_log(str(log_path), frequencies, accuracies, samples)
+
+            self.assertEqual(len(grid), 18)
+            for point, (f, a, s) in zip(grid, itertools.product(frequencies, accuracies, samples)):
+                patterns = find_rare_patterns(str(log_path), f, a, s)
+                self.assertEqual(
+                    (point["frequency_threshold"], point["accuracy_threshold"], point["min_sample_size"]),
+                    (f, a, s),
+                )
+                self.assertEqual(point["pattern_count"], len(patterns))
+                self.assertAlmostEqual(
+                    point["coverage_pct"], round(sum(p["sample_size"] for p in patterns) / 3000 * 100, 2)
+                )
+
+    def test_stability_compares_adjacent_grid_points(self):
+        """Test that stability is the mean overlap with neighbouring grid points"""
+        totals = np.array([10, 10, 10, 70])
+        corrects = np.array([10, 9, 5, 35])
+
+        grid = sweep_thresholds(totals, corrects, [0.5], [0.5, 0.85, 0.95], [5])
+
+        self.assertEqual(grid["pattern_count"].tolist(), [3, 2, 1])
+        self.assertEqual(grid["coverage_pct"].tolist(), [30.0, 20.0, 10.0])
+        self.assertEqual(grid["covered_accuracy_pct"].tolist(), [80.0, 95.0, 100.0])
+        self.assertEqual(grid["stability"].tolist(), [round(2 / 3, 4), round((2 / 3 + 1 / 2) / 2, 4), 0.5])
+
+
+class TestParseGrid(unittest.TestCase):
+    """Tests for parse_grid"""
+
+    def test_range_and_list_forms(self):
+        """Test that ranges include their stop value and lists are sorted"""
+        self.assertEqual(parse_grid("0.01:0.05:0.01"), [0.01, 0.02, 0.03, 0.04, 0.05])
+        self.assertEqual(parse_grid("20,5,10,5", cast=int), [5, 10, 20])
+        with self.assertRaises(ValueError):
+            parse_grid("0.1:0.01:0.01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -100,6 +100,23 @@ class TestModelTrainer(unittest.TestCase):
         for value in metrics.values():
             self.assertTrue(0 <= value <= 1)
 
+    def test_save_model_hashes_while_writing(self):
+        """Test that the saved artifact's digest matches a separate hash and the model reloads"""
+        import tempfile
+        import joblib
+        from ml_pipeline.model_registry import file_sha256
+
+        trainer = ModelTrainer()
+        trainer.config = self.sample_config
+        trainer.create_model()
+        trainer.train_and_evaluate(self.sample_data[["feature1", "feature2"]], self.sample_data["target"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = Path(trainer.save_model(tmp))
+
+            self.assertEqual(trainer.model_sha256, file_sha256(model_path))
+            self.assertEqual(type(joblib.load(model_path)), type(trainer.model))
+
     def test_parse_arguments_dataset_required(self):
         """Test that dataset argument is required"""
         from ml_pipeline.train_model import parse_arguments
@@ -0,0 +1,115 @@
+"""Unit tests for the streaming training supervisor"""
+
+import sys
+import time
+import unittest
+
+from ml_pipeline.training_supervisor import TrainingSupervisor, child_log_level, parse_event
+
+
+def python(code):
+    return [sys.executable, "-u", "-c", code]
+
+
+class TestTrainingSupervisor(unittest.TestCase):
+    """Tests for TrainingSupervisor"""
+
+    def test_result_and_progress_are_parsed(self):
+        """Test that progress events and the final result line are recognized"""
+        supervisor = TrainingSupervisor(python(
+            "import json, sys\n"
+            "print(json.dumps({'event': 'progress', 'stage': 'fit'}))\n"
+            "print('2025-01-15 - train_model - WARNING - slow fit', file=sys.stderr)\n"
+            "print(json.dumps({'status': 'success', 'metrics': {'accuracy': 0.9}}))\n"
+        ))
+
+        result = supervisor.run()
+
+        self.assertEqual(result["metrics"], {"accuracy": 0.9})
+        self.assertEqual(supervisor.last_progress, {"event": "progress", "stage": "fit"})
+        self.assertIn("[stderr] 2025-01-15 - train_model - WARNING - slow fit", supervisor.tail)
+
+    def test_missing_result_line_is_a_failure(self):
+        """Test that a child exiting 0 without a result line is not reported as success"""
+        supervisor = TrainingSupervisor(python("print('done')"))
+
+        self.assertIsNone(supervisor.run())
+        self.assertEqual(supervisor.returncode, 0)
+
+    def test_progress_extends_deadline(self):
+        """Test that a child reporting progress outlives the progress timeout"""
+        supervisor = TrainingSupervisor(python(
+            "import json, time\n"
+            "for i in range(6):\n"
+            "    time.sleep(0.2)\n"
+            "    print(json.dumps({'event': 'progress', 'stage': 'fit', 'step': i}))\n"
+            "print(json.dumps({'metrics': {}}))\n"
+        ), progress_timeout=0.6)
+
+        self.assertIsNotNone(supervisor.run())
+        self.assertFalse(supervisor.timed_out)
+        self.assertEqual(supervisor.last_progress["step"], 5)
+
+    def test_heartbeats_do_not_extend_deadline(self):
+        """Test that liveness heartbeats leave the progress and phase deadlines in place"""
+        heartbeats = (
+            "while True:\n"
+            "    print(json.dumps({'event': 'heartbeat', 'stage': 'fit'}))\n"
+            "    time.sleep(0.1)\n"
+        )
+        idle = TrainingSupervisor(python("import json, time\n" + heartbeats), progress_timeout=0.5)
+        fitting = TrainingSupervisor(python(
+            "import json, time\n"
+            "print(json.dumps({'event': 'progress', 'stage': 'fit'}))\n" + heartbeats
+        ), progress_timeout=30, phase_timeouts={"fit": 0.5})
+
+        for supervisor in (idle, fitting):
+            start = time.monotonic()
+            self.assertIsNone(supervisor.run())
+            self.assertTrue(supervisor.timed_out)
+            self.assertLess(time.monotonic() - start, 10)
+            self.assertEqual(supervisor.last_heartbeat["stage"], "fit")
+
+    def test_silent_child_is_killed(self):
+        """Test that a child without progress is stopped at the progress timeout"""
+        supervisor = TrainingSupervisor(python("import time; time.sleep(30)"), progress_timeout=0.5)
+
+        start = time.monotonic()
+        self.assertIsNone(supervisor.run())
+        self.assertTrue(supervisor.timed_out)
+        self.assertLess(time.monotonic() - start, 10)
+
+    def test_wall_clock_limit_caps_progress(self):
+        """Test that progress events cannot extend a run beyond max_seconds"""
+        supervisor = TrainingSupervisor(python(
+            "import json, time\n"
+            "while True:\n"
+            "    print(json.dumps({'event': 'progress', 'stage': 'fit'}))\n"
+            "    time.sleep(0.1)\n"
+        ), progress_timeout=0.5, max_seconds=1.0)
+
+        self.assertIsNone(supervisor.run())
+        self.assertTrue(supervisor.timed_out)
+
+    def test_memory_limit_applies_to_child(self):
+        """Test that the child's address space is bounded"""
+        supervisor = TrainingSupervisor(
+            python("x = bytearray(2 * 1024 ** 3)"),
+            memory_limit_bytes=1024 ** 3,
+        )
+
+        self.assertIsNone(supervisor.run())
+        self.assertFalse(supervisor.timed_out)
+        self.assertTrue(any("MemoryError" in line for line in supervisor.tail))
+
+    def test_helpers(self):
+        """Test event parsing and child log level detection"""
+        self.assertEqual(parse_event('{"event": "progress"}'), {"event": "progress"})
+        self.assertIsNone(parse_event("{"))
+        self.assertIsNone(parse_event("plain text"))
+        self.assertEqual(child_log_level("t - train_model - ERROR - boom"), 40)
+        self.assertEqual(child_log_level("no level here"), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Threshold Sweep - evaluate a grid of rare-pattern thresholds in one pass.
+
+Choosing ``frequency_threshold``, ``accuracy_threshold`` and
+``min_sample_size`` used to take one ``find_rare_patterns`` run per
+combination. Here the log is aggregated once into per-pattern totals, and
+every grid point is read off a cumulative histogram over those totals. A
+pattern qualifies for all frequency thresholds above its frequency and all
+accuracy/sample thresholds at or below its own, so the cost is
+O(patterns + grid points), not O(patterns x grid points).
+
+For each grid point the sweep reports:
+
+- ``pattern_count``: qualifying patterns
+- ``coverage_pct``: share of predictions that fall in a qualifying pattern
+- ``covered_accuracy_pct``: accuracy over those predictions
+- ``stability``: mean Jaccard similarity between the qualifying set and the
+  sets at the adjacent grid points. Along each axis the sets are nested,
+  so this is the ratio of the smaller count to the larger one. Values near
+  1 mark a plateau where small threshold changes do not change the result.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .rare_pattern_finder import encode_patterns, load_evaluation_log
+
+DEFAULT_FREQUENCY_GRID = tuple(np.round(np.arange(0.01, 0.105, 0.01), 2))
+DEFAULT_ACCURACY_GRID = tuple(np.round(np.arange(0.60, 0.96, 0.05), 2))
+DEFAULT_MIN_SAMPLES_GRID = (3, 5, 10, 20, 50)
+
+
+def parse_grid(spec: str, cast=float) -> List[Any]:
+    """
+    Parse a grid given as ``start:stop:step`` (stop inclusive) or a comma list.
+
+    :param spec: Grid specification, e.g. ``0.01:0.10:0.01`` or ``5,10,20``
+    :param cast: Type of the grid values
+    :return: Sorted distinct grid values
+    :raises ValueError: If the specification is malformed
+    """
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        if step <= 0 or stop < start:
+            raise ValueError(f"Invalid grid range: {spec}")
+        values = np.round(np.arange(start, stop + step / 2, step), 10)
+    else:
+        values = [float(part) for part in spec.split(",") if part.strip()]
+    if len(values) == 0:
+        raise ValueError(f"Empty grid: {spec}")
+    return sorted({cast(value) for value in values})
+
+
+def aggregate_patterns(evaluation_log_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count predictions and correct predictions per pattern.
+
+    :param evaluation_log_path: Path to evaluation log CSV file
+    :return: Per-pattern totals and correct counts
+    """
+    df = load_evaluation_log(evaluation_log_path)
+    if len(df) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    is_correct = (df["predicted_result"] == df["actual_result"]).to_numpy()
+    _, keys, inverse, _ = encode_patterns(df)
+    totals = np.bincount(inverse, minlength=len(keys))
+    corrects = np.bincount(inverse, weights=is_correct, minlength=len(keys)).astype(np.int64)
+    return totals, corrects
+
+
+def sweep_thresholds(
+    totals: np.ndarray,
+    corrects: np.ndarray,
+    frequency_grid: Sequence[float] = DEFAULT_FREQUENCY_GRID,
+    accuracy_grid: Sequence[float] = DEFAULT_ACCURACY_GRID,
+    min_samples_grid: Sequence[int] = DEFAULT_MIN_SAMPLES_GRID,
+) -> pd.DataFrame:
+    """
+    Evaluate every combination of thresholds against per-pattern totals.
+
+    Qualification matches ``find_rare_patterns``: frequency below the
+    frequency threshold, accuracy at or above the accuracy threshold and at
+    least the minimum number of samples.
+
+    :param totals: Predictions per pattern
+    :param corrects: Correct predictions per pattern
+    :param frequency_grid: Maximum frequency thresholds
+    :param accuracy_grid: Minimum accuracy thresholds
+    :param min_samples_grid: Minimum sample sizes
+    :return: One row per grid point with pattern_count, coverage_pct,
+        covered_accuracy_pct and stability
+    """
+    f_grid = np.sort(np.asarray(frequency_grid, dtype=float))
+    a_grid = np.sort(np.asarray(accuracy_grid, dtype=float))
+    s_grid = np.sort(np.asarray(min_samples_grid, dtype=np.int64))
+    shape = (len(f_grid), len(a_grid), len(s_grid))
+
+    totals = np.asarray(totals, dtype=np.int64)
+    corrects = np.asarray(corrects, dtype=np.int64)
+    total_predictions = totals.sum()
+    valid = totals > 0
+    frequency = totals[valid] / max(total_predictions, 1)
+    accuracy = corrects[valid] / totals[valid]
+
+    # Grid cell from which each pattern starts qualifying along each axis:
+    # frequency thresholds from f_start up, accuracy/sample thresholds up to a_end/s_end
+    f_start = np.searchsorted(f_grid, frequency, side="right")
+    a_end = np.searchsorted(a_grid, accuracy, side="right") - 1
+    s_end = np.searchsorted(s_grid, totals[valid], side="right") - 1
+    placed = (f_start < shape[0]) & (a_end >= 0) & (s_end >= 0)
+    cells = np.ravel_multi_index((f_start[placed], a_end[placed], s_end[placed]), shape)
+
+    def cumulative(weights: np.ndarray) -> np.ndarray:
+        grid = np.bincount(cells, weights=weights, minlength=int(np.prod(shape))).reshape(shape)
+        grid = np.cumsum(grid, axis=0)
+        grid = np.flip(np.cumsum(np.flip(grid, axis=1), axis=1), axis=1)
+        return np.flip(np.cumsum(np.flip(grid, axis=2), axis=2), axis=2)
+
+    count = cumulative(np.ones(len(cells)))
+    covered = cumulative(totals[valid][placed].astype(float))
+    covered_correct = cumulative(corrects[valid][placed].astype(float))
+
+    stability_sum = np.zeros(shape)
+    neighbours = np.zeros(shape)
+    for axis in range(3):
+        if shape[axis] < 2:
+            continue
+        lower = np.take(count, range(shape[axis] - 1), axis=axis)
+        upper = np.take(count, range(1, shape[axis]), axis=axis)
+        larger = np.maximum(lower, upper)
+        similarity = np.where(larger > 0, np.minimum(lower, upper) / np.where(larger > 0, larger, 1), 1.0)
+        for offset in (0, 1):
+            index = [slice(None)] * 3
+            index[axis] = slice(offset, shape[axis] - 1 + offset)
+            stability_sum[tuple(index)] += similarity
+            neighbours[tuple(index)] += 1
+    stability = np.where(neighbours > 0, stability_sum / np.maximum(neighbours, 1), 1.0)
+
+    f_values, a_values, s_values = np.meshgrid(f_grid, a_grid, s_grid, indexing="ij")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covered_accuracy = np.where(covered > 0, covered_correct / covered * 100, 0.0)
+
+    return pd.DataFrame({
+        "frequency_threshold": f_values.ravel(),
+        "accuracy_threshold": a_values.ravel(),
+        "min_sample_size": s_values.ravel(),
+        "pattern_count": count.ravel().astype(int),
+        "coverage_pct": np.round(covered.ravel() / max(total_predictions, 1) * 100, 2),
+        "covered_accuracy_pct": np.round(covered_accuracy.ravel(), 2),
+        "stability": np.round(stability.ravel(), 4),
+    })
+
+
+def sweep_evaluation_log(
+    evaluation_log_path: str,
+    frequency_grid: Sequence[float] = DEFAULT_FREQUENCY_GRID,
+    accuracy_grid: Sequence[float] = DEFAULT_ACCURACY_GRID,
+    min_samples_grid: Sequence[int] = DEFAULT_MIN_SAMPLES_GRID,
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate an evaluation log once and sweep a threshold grid over it.
+
+    :param evaluation_log_path: Path to evaluation log CSV file
+    :param frequency_grid: Maximum frequency thresholds
+    :param accuracy_grid: Minimum accuracy thresholds
+    :param min_samples_grid: Minimum sample sizes
+    :return: One dictionary per grid point
+    :raises FileNotFoundError: If evaluation log file doesn't exist
+    :raises ValueError: If data is invalid or missing required columns
+    """
+    totals, corrects = aggregate_patterns(evaluation_log_path)
+    return sweep_thresholds(
+        totals, corrects, frequency_grid, accuracy_grid, min_samples_grid
+    ).to_dict(orient="records")
@@ -7,6 +7,8 @@ import argparse
 import json
 import logging
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -21,7 +23,9 @@ from sklearn.model_selection import train_test_split
 from sklearn.tree import DecisionTreeClassifier
 import joblib
 
-from .config import DEBUG, LOG_LEVEL, MODELS_DIR, RETRAINED_MODELS_DIR
+from .config import DEBUG, LOG_LEVEL, MODELS_DIR, RETRAINED_MODELS_DIR, TRAINING_HEARTBEAT_INTERVAL
+from .log_shipper import start_log_shipper
+from .model_registry import HashingWriter
 from .supabase_client import insert_system_log
 
 # Configure logging
@@ -32,6 +36,57 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def emit_progress(stage: str, **details: Any) -> None:
+    """
+    Print a single-line JSON progress event for the training supervisor.
+
+    Only call this when real work has completed; each event extends the
+    supervisor's deadline.
+
+    Args:
+        stage: Current training stage
+        **details: Extra fields to report (sample counts, metrics, ...)
+    """
+    print(json.dumps({"event": "progress", "stage": stage, **details}, default=str), flush=True)
+
+
+def emit_heartbeat(stage: str, **details: Any) -> None:
+    """
+    Print a single-line JSON liveness heartbeat for the training supervisor.
+
+    Heartbeats do not extend the deadline.
+
+    Args:
+        stage: Stage the process is blocked in
+        **details: Extra fields to report (elapsed time, ...)
+    """
+    print(json.dumps({"event": "heartbeat", "stage": stage, **details}, default=str), flush=True)
+
+
+class Heartbeat:
+    """Context manager that emits periodic liveness heartbeats during a long step."""
+
+    def __init__(self, stage: str, interval: float = TRAINING_HEARTBEAT_INTERVAL):
+        self.stage = stage
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        started = time.monotonic()
+        while not self._stop.wait(self.interval):
+            emit_heartbeat(self.stage, elapsed_seconds=round(time.monotonic() - started, 1))
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{self.stage}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
 class MissingFeatureError(Exception):
     """Raised when required features are missing from the dataset."""
     pass
@@ -53,6 +108,7 @@ class ModelTrainer:
         self.config = None
         self.model = None
         self.metrics = {}
+        self.model_sha256: Optional[str] = None
 
     def load_config(self) -> Dict[str, Any]:
         """Load and parse the model configuration from YAML."""
@@ -173,7 +229,9 @@ class ModelTrainer:
 
         # Train the model
         logger.info("Training model...")
-        self.model.fit(X_train, y_train)
+        emit_progress("fit", samples=len(X_train))
+        with Heartbeat("fit"):
+            self.model.fit(X_train, y_train)
         logger.info("Training complete")
 
         # Make predictions
@@ -200,6 +258,10 @@ class ModelTrainer:
         """
         Save the trained model.
 
+        The artifact is only written locally; auto_reinforcement uploads it
+        once the replay gate has accepted it. Its SHA-256 is computed while
+        writing and kept in ``model_sha256``.
+
         Args:
             output_dir: Directory to save the model (default: models dir)
 
@@ -219,7 +281,10 @@ class ModelTrainer:
         filepath = output_path / filename
 
         logger.info(f"Saving model to {filepath}...")
-        joblib.dump(self.model, filepath)
+        with open(filepath, "wb") as f:
+            writer = HashingWriter(f)
+            joblib.dump(self.model, writer)
+        self.model_sha256 = writer.digest.hexdigest()
         logger.info("Model saved successfully")
 
         return str(filepath)
@@ -310,6 +375,7 @@ def parse_arguments() -> argparse.Namespace:
 def main():
     """Main execution function."""
     args = parse_arguments()
+    start_log_shipper()
 
     logger.info("="*60)
     logger.info("ML Pipeline Model Training")
@@ -345,6 +411,7 @@ def main():
 
         # Load and validate data
         X, y = trainer.load_data(args.dataset)
+        emit_progress("data_loaded", samples=len(X))
         
         # Log dataset prepared
         insert_system_log(
@@ -361,11 +428,14 @@ def main():
             trainer.create_model(learning_rate=args.learning_rate if args.fine_tune else None)
 
         # Train and evaluate
+        emit_progress("training")
         metrics = trainer.train_and_evaluate(X, y)
+        emit_progress("evaluated", **metrics)
 
         # Save model
         output_dir = args.output_dir or (str(RETRAINED_MODELS_DIR) if args.fine_tune else str(MODELS_DIR))
         model_path = trainer.save_model(output_dir)
+        emit_progress("saved", model_path=model_path)
 
         # Log training success
         insert_system_log(
@@ -383,12 +453,14 @@ def main():
         metrics_output = {
             "status": "success",
             "model_path": model_path,
+            "model_sha256": trainer.model_sha256,
             "metrics": metrics,
             "dataset_size": len(X),
             "timestamp": datetime.now().isoformat(),
         }
 
-        print(json.dumps(metrics_output, indent=2))
+        # Single line, so the supervisor can tell it apart from other output
+        print(json.dumps(metrics_output), flush=True)
         logger.info("Training completed successfully")
 
         return 0
@@ -0,0 +1,239 @@
+"""
+Training Supervisor - runs the training subprocess with streaming output
+
+The child's stdout and stderr are read line by line and forwarded to the
+logger instead of being buffered in memory. Single-line JSON progress events
+printed by train_model.py at real work boundaries extend the deadline.
+Heartbeat events from the child's timer thread only prove the process is
+alive and never extend it; a stage that cannot report progress from inside
+(the model fit) gets its own limit from ``phase_timeouts`` instead. Silent
+children are terminated after the progress timeout, and optional CPU/memory
+rlimits bound the child.
+"""
+
+import json
+import logging
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import (
+    TRAINING_CPU_LIMIT_SECONDS,
+    TRAINING_FIT_MAX_SECONDS,
+    TRAINING_MAX_SECONDS,
+    TRAINING_MEMORY_LIMIT_BYTES,
+    TRAINING_OUTPUT_TAIL_LINES,
+    TRAINING_PROGRESS_TIMEOUT,
+)
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Log level names as formatted by logging.basicConfig in the child
+CHILD_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def resource_limiter(memory_limit_bytes: int, cpu_limit_seconds: int) -> Optional[Callable[[], None]]:
+    """
+    Build a preexec_fn applying address-space and CPU-time rlimits in the child
+
+    Args:
+        memory_limit_bytes: RLIMIT_AS in bytes (0 = unlimited)
+        cpu_limit_seconds: RLIMIT_CPU in seconds (0 = unlimited)
+
+    Returns:
+        Callable for subprocess.Popen, or None when no limit applies
+    """
+    if resource is None or (not memory_limit_bytes and not cpu_limit_seconds):
+        return None
+
+    def apply_limits() -> None:
+        if memory_limit_bytes:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+        if cpu_limit_seconds:
+            # SIGXCPU at the soft limit, SIGKILL shortly after
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit_seconds, cpu_limit_seconds + 30))
+
+    return apply_limits
+
+
+def parse_event(line: str) -> Optional[Dict[str, Any]]:
+    """Parse a single-line JSON object printed by the child, if the line is one"""
+    stripped = line.strip()
+    if not stripped.startswith("{"):
+        return None
+    try:
+        data = json.loads(stripped)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def child_log_level(line: str) -> int:
+    """Map a '... - name - LEVEL - message' line from the child to a log level"""
+    for name in CHILD_LOG_LEVELS:
+        if f" - {name} - " in line:
+            return getattr(logging, name)
+    return logging.INFO
+
+
+class TrainingSupervisor:
+    """Runs one training subprocess under progress-based deadlines"""
+
+    def __init__(
+        self,
+        cmd: List[str],
+        cwd: Optional[str] = None,
+        progress_timeout: float = TRAINING_PROGRESS_TIMEOUT,
+        max_seconds: float = TRAINING_MAX_SECONDS,
+        memory_limit_bytes: int = TRAINING_MEMORY_LIMIT_BYTES,
+        cpu_limit_seconds: int = TRAINING_CPU_LIMIT_SECONDS,
+        tail_lines: int = TRAINING_OUTPUT_TAIL_LINES,
+        phase_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize the supervisor
+
+        Args:
+            cmd: Command line of the training process
+            cwd: Working directory of the child
+            progress_timeout: Seconds without progress before the child is killed
+            max_seconds: Absolute wall-clock limit
+            memory_limit_bytes: Child address-space limit (0 = unlimited)
+            cpu_limit_seconds: Child CPU-time limit (0 = unlimited)
+            tail_lines: Output lines kept for failure reports
+            phase_timeouts: Seconds allowed after a progress event of the given
+                stage, for stages that cannot report progress while running
+                (defaults to TRAINING_FIT_MAX_SECONDS for "fit")
+        """
+        self.cmd = cmd
+        self.cwd = cwd
+        self.progress_timeout = progress_timeout
+        self.max_seconds = max_seconds
+        self.memory_limit_bytes = memory_limit_bytes
+        self.cpu_limit_seconds = cpu_limit_seconds
+        self.tail: "deque[str]" = deque(maxlen=tail_lines)
+        self.phase_timeouts = {"fit": TRAINING_FIT_MAX_SECONDS} if phase_timeouts is None else phase_timeouts
+        self.last_progress: Optional[Dict[str, Any]] = None
+        self.last_heartbeat: Optional[Dict[str, Any]] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.returncode: Optional[int] = None
+        self.timed_out = False
+
+    def _pump(self, stream, name: str, lines: "queue.Queue") -> None:
+        for line in iter(stream.readline, ""):
+            lines.put((name, line.rstrip("\n")))
+        stream.close()
+        lines.put((name, None))
+
+    def handle_line(self, stream: str, line: str) -> bool:
+        """
+        Log one output line and record progress/heartbeat/result events
+
+        Returns:
+            True if the line was a progress event
+        """
+        self.tail.append(f"[{stream}] {line}")
+        event = parse_event(line) if stream == "stdout" else None
+
+        if event is not None and event.get("event") == "progress":
+            self.last_progress = event
+            logger.info(f"Training progress: {event}", extra={"training_event": event})
+            return True
+        if event is not None and event.get("event") == "heartbeat":
+            self.last_heartbeat = event
+            logger.debug(f"Training heartbeat: {event}", extra={"training_event": event})
+            return False
+        if event is not None and "metrics" in event:
+            self.result = event
+            return False
+
+        level = child_log_level(line) if stream == "stderr" else logging.INFO
+        logger.log(level, f"[train_model:{stream}] {line}", extra={"training_stream": stream})
+        return False
+
+    def progress_deadline(self, now: float) -> float:
+        """Deadline implied by the last progress event, before the wall-clock cap"""
+        stage = (self.last_progress or {}).get("stage")
+        return now + self.phase_timeouts.get(stage, self.progress_timeout)
+
+    def _stop_child(self, process: subprocess.Popen) -> None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def run(self) -> Optional[Dict[str, Any]]:
+        """
+        Run the child to completion or until a deadline expires
+
+        Returns:
+            The child's result event, or None if it failed, timed out or
+            exited without emitting one
+        """
+        process = subprocess.Popen(
+            self.cmd,
+            cwd=self.cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            preexec_fn=resource_limiter(self.memory_limit_bytes, self.cpu_limit_seconds),
+        )
+
+        lines: "queue.Queue" = queue.Queue()
+        readers = [
+            threading.Thread(target=self._pump, args=(process.stdout, "stdout", lines), daemon=True),
+            threading.Thread(target=self._pump, args=(process.stderr, "stderr", lines), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        started = time.monotonic()
+        hard_deadline = started + self.max_seconds
+        deadline = min(started + self.progress_timeout, hard_deadline)
+        open_streams = len(readers)
+
+        while open_streams:
+            try:
+                stream, line = lines.get(timeout=max(0.0, min(deadline - time.monotonic(), 1.0)))
+            except queue.Empty:
+                if time.monotonic() >= deadline:
+                    reason = "wall-clock limit" if deadline >= hard_deadline else "no progress"
+                    logger.error(
+                        f"Training killed after {time.monotonic() - started:.0f}s ({reason}); "
+                        f"last progress: {self.last_progress}; last heartbeat: {self.last_heartbeat}"
+                    )
+                    self.timed_out = True
+                    self._stop_child(process)
+                    break
+                continue
+
+            if line is None:
+                open_streams -= 1
+            elif self.handle_line(stream, line):
+                deadline = min(self.progress_deadline(time.monotonic()), hard_deadline)
+
+        for reader in readers:
+            reader.join(timeout=5)
+        self.returncode = process.wait()
+
+        if self.timed_out or self.returncode != 0:
+            logger.error(f"Training failed with return code {self.returncode}")
+            logger.error("Last output:\n" + "\n".join(self.tail))
+            return None
+
+        if self.result is None:
+            # Exit code 0 alone does not prove a model was written
+            logger.error("Training finished without a result line")
+            return None
+        return self.result
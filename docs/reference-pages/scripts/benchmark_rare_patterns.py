@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark rare pattern discovery on a synthetic multi-million-row evaluation log.
+
+Generates a log with many rare template patterns, times find_rare_patterns
+end to end, and optionally compares the grouped supporting-match extraction
+against the previous per-pattern filter + iterrows loop.
+
+Usage:
+    python scripts/benchmark_rare_patterns.py --rows 2000000 --compare
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ml_pipeline.rare_pattern_finder import extract_supporting_matches, find_rare_patterns  # noqa: E402
+
+
+def synthetic_log(rows: int, templates: int, seed: int = 42) -> pd.DataFrame:
+    """Build an evaluation log whose per-template accuracy ranges from 40% to 95%."""
+    rng = np.random.default_rng(seed)
+    template_ids = rng.integers(0, templates, rows)
+    template_accuracy = np.linspace(0.40, 0.95, templates)
+    predicted = rng.choice(np.array(["home_win", "draw", "away_win"]), rows)
+    correct = rng.random(rows) < template_accuracy[template_ids]
+
+    return pd.DataFrame({
+        "predicted_result": predicted,
+        "actual_result": np.where(correct, predicted, "other"),
+        "confidence": rng.random(rows).round(3),
+        "btts_prediction": rng.random(rows) < 0.5,
+        "template_name": np.char.add("template_", template_ids.astype(str)),
+        "timestamp": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(rows), unit="min"),
+        "team_a": np.char.add("Team ", rng.integers(0, 400, rows).astype(str)),
+        "team_b": np.char.add("Team ", rng.integers(0, 400, rows).astype(str)),
+    })
+
+
+def legacy_supporting_matches(df: pd.DataFrame, pattern_keys, limit: int = 10):
+    """Previous implementation: one full-frame filter and iterrows walk per pattern."""
+    matches = {}
+    for pattern_key in pattern_keys:
+        entries = []
+        for _, row in df[df["pattern_key"] == pattern_key].iterrows():
+            entries.append({
+                "match_id": int(row.name),
+                "date": str(row.get("timestamp", "N/A")),
+                "teams": f"{row.get('team_a')} vs {row.get('team_b')}",
+            })
+        matches[pattern_key] = entries[:limit]
+    return matches
+
+
+def timed(label: str, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{label:<40} {time.perf_counter() - start:8.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark find_rare_patterns")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic log rows (default: 2000000)")
+    parser.add_argument("--templates", type=int, default=400, help="Distinct templates (default: 400)")
+    parser.add_argument("--compare", action="store_true", help="Also time the legacy per-pattern extraction")
+    args = parser.parse_args()
+
+    df = timed(f"generate {args.rows:,} rows", synthetic_log, args.rows, args.templates)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "evaluation_log.csv"
+        timed("write CSV", df.to_csv, log_path, index=False)
+        patterns = timed("find_rare_patterns (end to end)", find_rare_patterns, str(log_path))
+        print(f"{len(patterns)} rare patterns found")
+
+    df = df.astype({"timestamp": str})
+    df["pattern_key"] = (
+        df["predicted_result"] + "_" + df["btts_prediction"].astype(str) + "_" + df["template_name"]
+    )
+    keys = [p["pattern_key"] for p in patterns]
+
+    grouped = timed("supporting matches (grouped)", extract_supporting_matches, df, keys)
+    if args.compare:
+        legacy = timed("supporting matches (legacy loop)", legacy_supporting_matches, df, keys)
+        print(f"identical output: {grouped == legacy}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,14 @@ Example inference script that demonstrates usage of model_config.yaml for predic
 This script shows how the centralized configuration drives runtime predictions.
 """
 
+import math
 import sys
+import time
 import yaml
 import pandas as pd
 from pathlib import Path
 from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
 import joblib
 import numpy as np
 
@@ -52,30 +55,144 @@ def prepare_prediction_input(features: list, feature_values: dict) -> pd.DataFra
     return pd.DataFrame(input_data)
 
 
+def format_prediction(prediction, prediction_proba) -> dict:
+    """Build the prediction result dictionary from a label and class probabilities."""
+    max_proba = max(prediction_proba)
+    return {
+        "prediction": int(prediction),
+        "probability": float(prediction_proba[1]),  # Probability of class 1
+        "prediction_interpretation": "Home Win" if prediction == 1 else "Away/Draw",
+        "confidence": "High" if max_proba > 0.7 else "Medium" if max_proba > 0.6 else "Low"
+    }
+
+
 def predict_match(model, features: list, feature_values: dict) -> dict:
     """Make a prediction for a football match."""
     try:
         # Prepare input with correct feature order
         input_df = prepare_prediction_input(features, feature_values)
         
-        # Make prediction
-        prediction_proba = model.predict_proba(input_df)[0]
-        prediction = model.predict(input_df)[0]
-        
-        # Format results
-        result = {
-            "prediction": int(prediction),
-            "probability": float(prediction_proba[1]),  # Probability of class 1
-            "prediction_interpretation": "Home Win" if prediction == 1 else "Away/Draw",
-            "confidence": "High" if max(prediction_proba) > 0.7 else "Medium" if max(prediction_proba) > 0.6 else "Low"
-        }
+        # Run inference once and derive the label from the probabilities
+        prediction_proba = np.asarray(model.predict_proba(input_df)[0])
+        prediction = model.classes_[int(prediction_proba.argmax())]
         
-        return result
+        return format_prediction(prediction, prediction_proba)
         
     except Exception as e:
         raise ValueError(f"Prediction failed: {e}")
 
 
+class FastPredictor:
+    """
+    Low-latency single-row predictor.
+    
+    The feature order from model_config.yaml is resolved once and every request
+    fills the same preallocated (1, n_features) NumPy buffer, so no DataFrame is
+    built per call and the model is evaluated a single time. Binary
+    LogisticRegression models are scored directly from their coefficients and
+    single-output DecisionTreeClassifier models by walking the fitted tree,
+    skipping scikit-learn's per-call input validation. Both write into a
+    preallocated probability buffer; other models go through predict_proba,
+    whose result scikit-learn allocates, and are copied into that buffer.
+    
+    The array returned by predict_proba is overwritten by the next call;
+    copy it to keep it.
+    """
+
+    def __init__(self, model, features: list):
+        self.model = model
+        self.features = list(features)
+        self.feature_index = {feature: idx for idx, feature in enumerate(self.features)}
+        self.classes = list(model.classes_)
+        self._buffer = np.zeros((1, len(self.features)), dtype=np.float64)
+        self._row = self._buffer[0]
+        self._proba = np.zeros(len(self.classes), dtype=np.float64)
+
+        # Binary logistic regression: P(class 1) = sigmoid(coef . x + intercept)
+        self._coef = None
+        self._intercept = 0.0
+        if isinstance(model, LogisticRegression) and np.shape(model.coef_)[0] == 1:
+            self._coef = np.ascontiguousarray(model.coef_[0], dtype=np.float64)
+            self._intercept = float(model.intercept_[0])
+
+        # Decision tree: scikit-learn compares float32 features against the node thresholds
+        self._tree = None
+        if isinstance(model, DecisionTreeClassifier) and model.n_outputs_ == 1:
+            tree = model.tree_
+            self._tree = (
+                tree.children_left.tolist(),
+                tree.children_right.tolist(),
+                tree.feature.tolist(),
+                tree.threshold.tolist(),
+                tree.value[:, 0, :],
+            )
+            self._row32 = np.zeros(len(self.features), dtype=np.float32)
+            self._tree_row = np.zeros(len(self.features), dtype=np.float64)
+
+    def fill(self, feature_values: dict) -> np.ndarray:
+        """Copy feature values into the reused input buffer in model order."""
+        row = self._row
+        for feature, idx in self.feature_index.items():
+            try:
+                row[idx] = feature_values[feature]
+            except KeyError:
+                raise ValueError(f"Missing value for feature: {feature}")
+        return self._buffer
+
+    def predict_proba(self, feature_values: dict) -> np.ndarray:
+        """Return class probabilities for a single fixture in the reused output buffer."""
+        buffer = self.fill(feature_values)
+        proba = self._proba
+
+        if self._coef is not None:
+            decision = float(self._coef.dot(self._row)) + self._intercept
+            if decision >= 0:
+                positive = 1.0 / (1.0 + math.exp(-decision))
+            else:
+                exp_decision = math.exp(decision)
+                positive = exp_decision / (1.0 + exp_decision)
+            proba[0] = 1.0 - positive
+            proba[1] = positive
+        elif self._tree is not None:
+            left, right, feature, threshold, value = self._tree
+            # Round through float32, then compare in float64 like scikit-learn does
+            self._row32[:] = self._row
+            row = self._tree_row
+            row[:] = self._row32
+            node = 0
+            while left[node] != -1:
+                node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+            leaf = value[node]
+            np.divide(leaf, leaf.sum(), out=proba)
+        else:
+            proba[:] = self.model.predict_proba(buffer)[0]
+        return proba
+
+    def predict(self, feature_values: dict) -> dict:
+        """Make a prediction for a football match with a single model evaluation."""
+        try:
+            prediction_proba = self.predict_proba(feature_values)
+            prediction = self.classes[int(prediction_proba.argmax())]
+            return format_prediction(prediction, prediction_proba)
+        except Exception as e:
+            raise ValueError(f"Prediction failed: {e}")
+
+
+def benchmark_predictor(predictor: FastPredictor, feature_values: dict, iterations: int = 10000) -> dict:
+    """Measure single-request latency of a predictor in microseconds."""
+    timings = np.empty(iterations, dtype=np.float64)
+    for i in range(iterations):
+        start = time.perf_counter()
+        predictor.predict(feature_values)
+        timings[i] = time.perf_counter() - start
+
+    timings *= 1e6
+    return {
+        "p50_us": float(np.percentile(timings, 50)),
+        "p99_us": float(np.percentile(timings, 99)),
+    }
+
+
 def main():
     """Main inference function using configuration."""
     try:
@@ -96,6 +213,7 @@ def main():
         # Load model
         print(f"\nLoading model: {active_model_id}")
         model = load_model(active_model_id)
+        predictor = FastPredictor(model, input_features)
         
         # Example prediction scenarios
         print("\n" + "="*50)
@@ -110,7 +228,7 @@ def main():
             "venue_advantage": 1.0
         }
         
-        result1 = predict_match(model, input_features, scenario1)
+        result1 = predictor.predict(scenario1)
         print(f"\nScenario 1: Strong home team")
         print(f"Input: {scenario1}")
         print(f"Prediction: {result1['prediction_interpretation']}")
@@ -125,7 +243,7 @@ def main():
             "venue_advantage": 0.0
         }
         
-        result2 = predict_match(model, input_features, scenario2)
+        result2 = predictor.predict(scenario2)
         print(f"\nScenario 2: Balanced teams")
         print(f"Input: {scenario2}")
         print(f"Prediction: {result2['prediction_interpretation']}")
@@ -140,13 +258,16 @@ def main():
             "venue_advantage": -1.0
         }
         
-        result3 = predict_match(model, input_features, scenario3)
+        result3 = predictor.predict(scenario3)
         print(f"\nScenario 3: Strong away team")
         print(f"Input: {scenario3}")
         print(f"Prediction: {result3['prediction_interpretation']}")
         print(f"Probability: {result3['probability']:.3f}")
         print(f"Confidence: {result3['confidence']}")
         
+        latency = benchmark_predictor(predictor, scenario1)
+        print(f"\nSingle-fixture latency: p50={latency['p50_us']:.1f}µs, p99={latency['p99_us']:.1f}µs")
+        
         print("\n✅ Inference completed successfully!")
         print("\nNote: This is a demonstration with mock model predictions.")
         print("In production, ensure trained models are properly saved and loaded.")
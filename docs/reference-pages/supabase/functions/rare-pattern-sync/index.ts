@@ -29,8 +29,13 @@ const RarePatternSchema = z.object({
 
 const RequestSchema = z.object({
   patterns: z.array(RarePatternSchema),
+  // Keys no longer discovered since the client's last sync (differential sync)
+  expired_keys: z.array(z.string().min(1)).optional(),
 });
 
+// Pattern keys per PATCH, keeping the in.(...) filter well under URL limits
+const DEACTIVATE_BATCH_SIZE = 100;
+
 type RarePattern = z.infer<typeof RarePatternSchema>;
 type UpsertRequest = z.infer<typeof RequestSchema>;
 
@@ -73,6 +78,54 @@ async function upsertPatterns(patterns: RarePattern[]): Promise<number> {
   return patterns.length;
 }
 
+/**
+ * Parse the JSON request body, decompressing it first when the client
+ * sent it with Content-Encoding: gzip (chunked sync from manage_patterns)
+ */
+async function readJsonBody(req: Request): Promise<unknown> {
+  const encoding = req.headers.get("Content-Encoding")?.toLowerCase();
+  if (encoding === "gzip" && req.body) {
+    const decompressed = req.body.pipeThrough(new DecompressionStream("gzip"));
+    return JSON.parse(await new Response(decompressed).text());
+  }
+  return await req.json();
+}
+
+/**
+ * Mark patterns the client no longer discovers as inactive
+ */
+async function deactivatePatterns(patternKeys: string[]): Promise<number> {
+  for (let start = 0; start < patternKeys.length; start += DEACTIVATE_BATCH_SIZE) {
+    const keys = patternKeys
+      .slice(start, start + DEACTIVATE_BATCH_SIZE)
+      .map((key) => `"${key.replace(/\\/g, "\\\\").replace(/"/g, '\\"')}"`);
+    const filter = encodeURIComponent(`in.(${keys.join(",")})`);
+    const response = await fetch(
+      `${supabaseUrl}/rest/v1/high_value_patterns?pattern_key=${filter}`,
+      {
+        method: "PATCH",
+        headers: {
+          Authorization: `Bearer ${supabaseKey}`,
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({
+          is_active: false,
+          updated_at: new Date().toISOString(),
+        }),
+      }
+    );
+
+    if (!response.ok) {
+      const error = await response.text();
+      throw new Error(
+        `Failed to deactivate patterns: ${response.status} - ${error}`
+      );
+    }
+  }
+
+  return patternKeys.length;
+}
+
 /**
  * Mark expired patterns as inactive
  * Patterns older than their expires_at timestamp are deactivated
@@ -110,7 +163,7 @@ serve(async (req: Request) => {
       headers: {
         "Access-Control-Allow-Origin": "*",
         "Access-Control-Allow-Methods": "POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type, Authorization",
+        "Access-Control-Allow-Headers": "Content-Type, Content-Encoding, Authorization",
       },
     });
   }
@@ -128,7 +181,7 @@ serve(async (req: Request) => {
 
   try {
     // Parse request body
-    const body = await req.json();
+    const body = await readJsonBody(req);
 
     // Validate request schema
     const validationResult = RequestSchema.safeParse(body);
@@ -147,7 +200,9 @@ serve(async (req: Request) => {
 
     const request: UpsertRequest = validationResult.data;
 
-    if (request.patterns.length === 0) {
+    const expiredKeys = request.expired_keys ?? [];
+
+    if (request.patterns.length === 0 && expiredKeys.length === 0) {
       return new Response(
         JSON.stringify({
           message: "No patterns to sync",
@@ -161,8 +216,13 @@ serve(async (req: Request) => {
       );
     }
 
-    // Upsert new patterns
-    const syncedCount = await upsertPatterns(request.patterns);
+    // Upsert new and changed patterns
+    const syncedCount = request.patterns.length > 0
+      ? await upsertPatterns(request.patterns)
+      : 0;
+
+    // Deactivate patterns the client no longer discovers
+    const expiredCount = await deactivatePatterns(expiredKeys);
 
     // Deactivate expired patterns
     await deactivateExpiredPatterns();
@@ -171,6 +231,7 @@ serve(async (req: Request) => {
       JSON.stringify({
         message: "Pattern sync completed successfully",
         synced: syncedCount,
+        expired: expiredCount,
         timestamp: new Date().toISOString(),
       }),
       {
@@ -0,0 +1,12 @@
+-- Leases for concurrent retraining request workers
+
+ALTER TABLE public.model_retraining_requests
+  ADD COLUMN IF NOT EXISTS leased_by TEXT,
+  ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN public.model_retraining_requests.leased_by IS 'Worker (host-pid) currently processing the request.';
+COMMENT ON COLUMN public.model_retraining_requests.lease_expires_at IS 'When the worker lease lapses; expired processing requests can be reclaimed by another worker.';
+
+CREATE INDEX IF NOT EXISTS idx_requests_lease_expires_at
+  ON public.model_retraining_requests(lease_expires_at)
+  WHERE status = 'processing';
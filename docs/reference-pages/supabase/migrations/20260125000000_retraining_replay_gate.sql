@@ -0,0 +1,20 @@
+-- Champion/challenger replay gate outcome for retraining runs
+
+ALTER TABLE public.model_retraining_runs
+  ADD COLUMN IF NOT EXISTS gate_decision TEXT CHECK (gate_decision IN ('promote', 'reject', 'skipped')),
+  ADD COLUMN IF NOT EXISTS gate_metrics JSONB DEFAULT '{}';
+
+-- Runs whose challenger the gate rejects end as 'rejected' (model not
+-- uploaded); the manual requests they served are closed the same way
+ALTER TABLE public.model_retraining_runs
+  DROP CONSTRAINT IF EXISTS model_retraining_runs_status_check,
+  ADD CONSTRAINT model_retraining_runs_status_check
+    CHECK (status IN ('pending', 'running', 'completed', 'failed', 'rejected'));
+
+ALTER TABLE public.model_retraining_requests
+  DROP CONSTRAINT IF EXISTS model_retraining_requests_status_check,
+  ADD CONSTRAINT model_retraining_requests_status_check
+    CHECK (status IN ('pending', 'processing', 'completed', 'cancelled', 'rejected'));
+
+COMMENT ON COLUMN public.model_retraining_runs.gate_decision IS 'Replay gate outcome: promote (challenger not worse than champion within tolerance), reject (regression, unloadable challenger, or too few replay rows by default), skipped (no champion to compare against).';
+COMMENT ON COLUMN public.model_retraining_runs.gate_metrics IS 'Paired replay metrics: sample size, champion/challenger accuracy, accuracy delta with bootstrap confidence interval, discordant pair counts.';